@@ -0,0 +1,396 @@
+# app/catalog.py
+# Job catalog lifecycle: JSON or memory-mapped binary loading, and atomic hot reload.
+#
+# Binary layout (little-endian):
+#   b"JNCAT001" | u64 header length | JSON header | 8-byte aligned arrays
+# The header lists every array (offset, dtype, shape) plus the small categorical
+# vocabularies. Strings live in one table (offsets + UTF-8 blob). The file is opened
+# with mmap read-only, so every worker process shares the same physical pages.
+#
+# Build one with:  python -m app.catalog build data/mock_jobs.json data/jobs.jcat
+# (the source may be a JSON array or NDJSON; both are streamed, never fully loaded).
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import metrics
+from .ingest import ProgressFn, iter_jobs, log_progress
+from .job_columns import JobColumns, JobColumnsBuilder
+from .job_index import JobIndex
+from .semantic import make_semantic_index_from_env
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"JNCAT001"
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "mock_jobs.json"
+
+# Per-row display fields kept as string-table ids (-1 = None, -2 = key missing)
+_STRING_FIELDS = ("job_id", "title", "company", "location", "domain", "salary_unit")
+# Responses copy these into MatchItems unvalidated (see render.JobFragments)
+_REQUIRED_FIELDS = ("job_id", "title", "company", "location")
+
+
+class StringTable(Sequence[str]):
+    """Read-only view over (offsets, utf-8 blob) arrays; decodes on access."""
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].tobytes().decode("utf-8")
+
+
+class _StringSlice(Sequence[str]):
+    """A contiguous range of a StringTable, used for the large vocabularies."""
+
+    def __init__(self, table: StringTable, start: int, stop: int):
+        self._table, self._start, self._len = table, start, stop - start
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        return self._table[self._start + i]
+
+
+class _Rows(Sequence[Dict[str, Any]]):
+    """Job dicts materialized on demand from the columnar arrays (mapped or in memory)."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], strings: StringTable, columns: JobColumns):
+        self._a = arrays
+        self._s = strings
+        self._cols = columns
+
+    def __len__(self) -> int:
+        return self._cols.size
+
+    def __getitem__(self, row):  # type: ignore[override]
+        if isinstance(row, slice):
+            return [self[r] for r in range(*row.indices(len(self)))]
+        a, s, v = self._a, self._s, self._cols.vocabs
+        job: Dict[str, Any] = {}
+        for f in _STRING_FIELDS:
+            sid = int(a[f"str_{f}"][row])
+            if sid != -2:
+                job[f] = s[sid] if sid >= 0 else None
+        for f in ("salary_min", "salary_max"):
+            x = float(a[f"raw_{f}"][row])
+            job[f] = None if np.isnan(x) else (int(x) if x.is_integer() else x)
+        job["employment_type"] = v["employment_type"][int(a["employment_type_codes"][row])]
+        job["seniority"] = v["seniority"][int(a["seniority_codes"][row])]
+        job["remote"] = v["remote"][int(a["remote_codes"][row])]
+        lo, hi = int(a["skills_ptr"][row]), int(a["skills_ptr"][row + 1])
+        job["skills"] = [s[int(i)] for i in a["skills_str"][lo:hi]]
+        return job
+
+
+class Catalog:
+    """One immutable catalog snapshot: rows, columns and index. Replaced, never mutated."""
+
+    def __init__(self, jobs: Sequence[Dict[str, Any]], columns: JobColumns, source: Optional[Path] = None, mtime: float = 0.0, version: int = 0):
+        self.jobs = jobs
+        self.columns = columns
+        self.index = JobIndex(columns)
+        self.source = source
+        self.mtime = mtime
+        self.version = version
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Dict[str, Any]]) -> "Catalog":
+        builder = CatalogBuilder()
+        for job in jobs:
+            builder.add(job)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return self.columns.size
+
+
+def _checked(job: Dict[str, Any], row: int) -> Dict[str, Any]:
+    """
+    `job` with string display fields (numbers, e.g. an integer job_id, are converted)
+    and numeric salaries. Feeds are not validated upstream, so anything else is a
+    ValueError here rather than a malformed response later.
+    """
+    fixed: Optional[Dict[str, Any]] = None
+    for f in _STRING_FIELDS:
+        x = job.get(f)
+        if x is None:
+            if f in _REQUIRED_FIELDS:
+                raise ValueError(f"job {row}: missing {f}")
+        elif not isinstance(x, str):
+            if isinstance(x, bool) or not isinstance(x, (int, float)):
+                raise ValueError(f"job {row}: {f} must be a string, got {type(x).__name__}")
+            fixed = fixed if fixed is not None else dict(job)
+            fixed[f] = str(x)
+    for f in ("salary_min", "salary_max"):
+        x = job.get(f)
+        if x is not None and (isinstance(x, bool) or not isinstance(x, (int, float))):
+            raise ValueError(f"job {row}: {f} must be a number, got {type(x).__name__}")
+    return fixed if fixed is not None else job
+
+
+def _string_table(texts: List[str]) -> Dict[str, np.ndarray]:
+    encoded = [t.encode("utf-8") for t in texts]
+    return {
+        "str_offsets": np.cumsum([0] + [len(b) for b in encoded], dtype=np.int64),
+        "str_blob": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    }
+
+
+class CatalogBuilder:
+    """
+    Accumulates a catalog one job at a time in compact typed arrays (codes, string
+    ids, salaries), so a multi-GB feed never exists as a list of dicts. Finish with
+    `build()` for an in-memory Catalog or `write()` for the binary file.
+    """
+
+    def __init__(self):
+        self.columns = JobColumnsBuilder()
+        self._strings: Dict[str, int] = {}
+        self._str_ids = {f: array("i") for f in _STRING_FIELDS}
+        self._raw = {f: array("d") for f in ("salary_min", "salary_max")}
+        self._skills_ptr = array("q", [0])
+        self._skills_str = array("i")
+
+    def __len__(self) -> int:
+        return self.columns.size
+
+    def _sid(self, x: Optional[str]) -> int:
+        return -1 if x is None else self._strings.setdefault(x, len(self._strings))
+
+    def add(self, job: Dict[str, Any]) -> None:
+        job = _checked(job, len(self))
+        self.columns.add(job)
+        for f in _STRING_FIELDS:
+            self._str_ids[f].append(self._sid(job.get(f)) if f in job else -2)
+        for f in ("salary_min", "salary_max"):
+            self._raw[f].append(np.nan if job.get(f) is None else job[f])
+        for x in job.get("skills", []):
+            self._skills_str.append(self._sid(x))
+        self._skills_ptr.append(len(self._skills_str))
+
+    def _row_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {f"str_{f}": np.array(ids, dtype=np.int32) for f, ids in self._str_ids.items()}
+        arrays.update({f"raw_{f}": np.array(vals, dtype=np.float64) for f, vals in self._raw.items()})
+        arrays["skills_ptr"] = np.array(self._skills_ptr, dtype=np.int64)
+        arrays["skills_str"] = np.array(self._skills_str, dtype=np.int32)
+        return arrays
+
+    def build(self) -> Catalog:
+        cols = self.columns.build()
+        arrays = {**cols.arrays, **self._row_arrays(), **_string_table(list(self._strings))}
+        strings = StringTable(arrays["str_offsets"], arrays["str_blob"])
+        return Catalog(_Rows(arrays, strings, cols), cols)
+
+    def write(self, path: Path) -> None:
+        """Write the binary catalog to `path` atomically (temp file + rename)."""
+        cols = self.columns.build()
+        texts = list(self._strings)
+        vocab_ranges = {}
+        for name in ("title", "location", "skill"):
+            # Large vocabularies occupy contiguous ranges of the string table
+            vocab_ranges[name] = (len(texts), len(texts) + len(cols.vocabs[name]))
+            texts.extend(cols.vocabs[name])
+        arrays = {**cols.arrays, **self._row_arrays(), **_string_table(texts)}
+
+        header: Dict[str, Any] = {
+            "size": cols.size,
+            "vocabs": {k: cols.vocabs[k] for k in ("domain", "employment_type", "seniority", "remote")},
+            "vocab_ranges": vocab_ranges,
+            "arrays": {},
+        }
+        offset = 0
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            arrays[name] = arr
+            header["arrays"][name] = {"offset": offset, "dtype": arr.dtype.str, "shape": list(arr.shape)}
+            offset += -(-arr.nbytes // 8) * 8
+        head = json.dumps(header).encode("utf-8")
+        head += b" " * (-(len(MAGIC) + 8 + len(head)) % 8)
+
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(head)) + head)
+            for arr in arrays.values():
+                f.write(arr.tobytes())
+                f.write(b"\0" * (-arr.nbytes % 8))
+        os.replace(tmp, path)
+
+
+def write_binary(jobs: Iterable[Dict[str, Any]], path: Path) -> None:
+    builder = CatalogBuilder()
+    for job in jobs:
+        builder.add(job)
+    builder.write(path)
+
+
+def _read_binary(path: Path) -> Catalog:
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a binary job catalog")
+    (hlen,) = struct.unpack_from("<Q", mm, len(MAGIC))
+    base = len(MAGIC) + 8 + hlen
+    header = json.loads(mm[len(MAGIC) + 8:base])
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        arrays[name] = np.frombuffer(mm, dtype=dtype, count=count, offset=base + spec["offset"])
+    strings = StringTable(arrays["str_offsets"], arrays["str_blob"])
+    vocabs: Dict[str, Sequence[Any]] = dict(header["vocabs"])
+    for name, (start, stop) in header["vocab_ranges"].items():
+        vocabs[name] = _StringSlice(strings, start, stop)
+    columns = JobColumns(arrays, vocabs)
+    return Catalog(_Rows(arrays, strings, columns), columns)
+
+
+def load_catalog(path: Path, progress: Optional[ProgressFn] = log_progress) -> Catalog:
+    """
+    Load a binary catalog (mapped) or stream a JSON array / NDJSON feed through
+    CatalogBuilder, reporting progress every 100k jobs.
+    """
+    with open(path, "rb") as f:
+        is_binary = f.read(len(MAGIC)) == MAGIC
+    if is_binary:
+        cat = _read_binary(path)
+    else:
+        cat = Catalog.from_jobs(iter_jobs(path, progress=progress))
+    cat.source = path
+    cat.mtime = path.stat().st_mtime
+    return cat
+
+
+# --- process-wide current catalog -------------------------------------------------
+
+_current: Optional[Catalog] = None
+_reload_lock = threading.Lock()
+_version = 0
+
+
+def catalog_path() -> Path:
+    return Path(os.getenv("JOB_CATALOG_PATH") or DEFAULT_PATH)
+
+
+def current() -> Catalog:
+    """The live catalog. Callers should grab it once per request and keep using it."""
+    cat = _current
+    if cat is None:
+        # Requests arriving during a background warm-up wait for the one build in progress
+        with _reload_lock:
+            cat = _current
+            if cat is None:
+                cat = _swap(catalog_path())
+    return cat
+
+
+def loaded() -> Optional[Catalog]:
+    """The live catalog if one has been built, without triggering a load."""
+    return _current
+
+
+def reload(path: Optional[Path] = None) -> Catalog:
+    """
+    Build the new catalog fully (including the semantic index, if enabled), then
+    swap the module reference in one assignment. In-flight requests keep the
+    snapshot they already hold; no traffic is dropped.
+    """
+    with _reload_lock:
+        return _swap(path or catalog_path())
+
+
+def _swap(path: Path) -> Catalog:
+    # Caller holds _reload_lock
+    global _current, _version
+    cat = load_catalog(path)
+    cat.columns.semantic = make_semantic_index_from_env(cat.columns)
+    _version += 1
+    cat.version = _version
+    _current = cat
+    return cat
+
+
+def reload_if_changed() -> bool:
+    """Reload when the catalog file's mtime moved; returns True if a swap happened."""
+    cat = _current
+    path = catalog_path()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return False
+    if cat is not None and cat.source == path and cat.mtime == mtime:
+        return False
+    reload(path)
+    return True
+
+
+def start_watcher(interval: float = 5.0) -> threading.Event:
+    """Poll the catalog mtime in a daemon thread; set the returned event to stop."""
+    stop = threading.Event()
+
+    def _loop() -> None:
+        # (path, mtime) of the last file that failed to load; retried only once it changes
+        failed: Optional[Tuple[Path, float]] = None
+        while not stop.wait(interval):
+            path = catalog_path()
+            try:
+                key = (path, path.stat().st_mtime)
+            except OSError:
+                key = None
+            if key is not None and key == failed:
+                continue
+            try:
+                reload_if_changed()
+                failed = None
+            except Exception:
+                # Keep serving the previous snapshot if the new file is bad
+                failed = key
+                metrics.catalog_reload_failures.inc()
+                cat = _current
+                logger.exception(
+                    "catalog reload from %s failed; still serving version %s",
+                    path, cat.version if cat is not None else None,
+                )
+
+    threading.Thread(target=_loop, name="catalog-watcher", daemon=True).start()
+    return stop
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.catalog")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="convert a JSON array or NDJSON job feed into a binary catalog")
+    b.add_argument("src", type=Path)
+    b.add_argument("dst", type=Path)
+    args = ap.parse_args(argv)
+    builder = CatalogBuilder()
+    for job in iter_jobs(args.src, progress=lambda n: print(f"ingested {n} jobs", file=sys.stderr)):
+        builder.add(job)
+    builder.write(args.dst)
+    print(f"wrote {len(builder)} jobs to {args.dst}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
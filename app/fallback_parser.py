@@ -0,0 +1,217 @@
+# app/fallback_parser.py
+# Offline intent extraction: one pass over the utterance against a phrase vocabulary.
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import catalog
+from .schemas import JobPreference
+from .utils import _LOC_ALIASES, normalize_employment_type, normalize_location, parse_salary_span
+
+DEFAULT_VOCAB_PATH = Path(__file__).resolve().parent.parent / "data" / "fallback_vocab.json"
+
+# Words, keeping "c++", "c#" and "node.js" whole; "full-time" becomes "full time"
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+_TOKEN_ANY_CASE = re.compile(_TOKEN.pattern, re.IGNORECASE)
+# Catalog titles are reduced to the role they name before becoming phrases
+_TITLE_NOISE = re.compile(r"\(.*?\)|\b(?:intern|internship|senior|sr|junior|jr|lead|staff|principal)\b")
+
+Hit = Tuple[str, Any]
+
+
+class Context(NamedTuple):
+    """Neighbouring words that make an ambiguous phrase count (an all-caps spelling always does)."""
+
+    before: FrozenSet[str] = frozenset()
+    after: FrozenSet[str] = frozenset()
+
+
+# Two-letter aliases are ordinary words too ("3 pm", "de la Cruz", "da"): they only
+# match written in capitals ("PM", "LA") or next to a word that makes the reading likely
+_SHORT_ALIAS_MAX = 2
+_SHORT_ALIAS_CONTEXT = {
+    "role": Context(
+        before=frozenset({"a", "an", "as", "junior", "senior", "sr", "lead", "staff", "principal"}),
+        after=frozenset({"role", "roles", "job", "jobs", "position", "positions", "opening", "openings"}),
+    ),
+    "location": Context(before=frozenset({"in", "near", "around", "from", "to"})),
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class PhraseMatcher:
+    """
+    Word-level longest-match dictionary: phrases are keyed by their token tuple, and
+    `max_len` per first token bounds how far ahead a match can extend. Scanning is one
+    left-to-right pass; tokens that start no phrase cost a single dict miss.
+    """
+
+    def __init__(self):
+        self._phrases: Dict[Tuple[str, ...], List[Hit]] = {}
+        self._max_len: Dict[str, int] = {}
+        self._context: Dict[Tuple[str, ...], Context] = {}
+
+    def add(self, phrase: str, kind: str, value: Any, context: Optional[Context] = None) -> None:
+        """
+        Map `phrase` to (kind, value). With `context`, a single-word phrase only
+        matches in capitals or next to one of the context words, and never right
+        after a number.
+        """
+        toks = tuple(tokenize(phrase))
+        if not toks:
+            return
+        hits = self._phrases.setdefault(toks, [])
+        if all(k != kind for k, _ in hits):
+            hits.append((kind, value))
+            if context is not None and len(toks) == 1:
+                self._context[toks] = context
+        self._max_len[toks[0]] = max(self._max_len.get(toks[0], 0), len(toks))
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def phrases(self) -> List[str]:
+        return [" ".join(toks) for toks in self._phrases]
+
+    def scan(self, text: str) -> Iterator[Hit]:
+        """(kind, value) for each phrase found, in text order; matches do not overlap."""
+        raw = _TOKEN_ANY_CASE.findall(text)
+        toks = [t.lower() for t in raw]
+        phrases, max_len, guarded = self._phrases, self._max_len, self._context
+        i, n = 0, len(toks)
+        while i < n:
+            longest = max_len.get(toks[i])
+            if longest is None:
+                i += 1
+                continue
+            for size in range(min(longest, n - i), 0, -1):
+                key = tuple(toks[i:i + size])
+                hits = phrases.get(key)
+                if hits is not None and (size > 1 or key not in guarded or self._in_context(raw, toks, i)):
+                    yield from hits
+                    i += size
+                    break
+            else:
+                i += 1
+
+    def _in_context(self, raw: List[str], toks: List[str], i: int) -> bool:
+        """Whether the guarded one-word phrase at token `i` reads as that phrase here."""
+        if i > 0 and toks[i - 1][0].isdigit():
+            return False
+        if raw[i].isupper():
+            return True
+        ctx = self._context[(toks[i],)]
+        return (i > 0 and toks[i - 1] in ctx.before) or (i + 1 < len(toks) and toks[i + 1] in ctx.after)
+
+
+def load_vocabulary(path: Optional[Path] = None) -> Dict[str, Any]:
+    path = path or Path(os.getenv("FALLBACK_VOCAB_PATH", DEFAULT_VOCAB_PATH))
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _short_alias_context(alias: str, kind: str) -> Optional[Context]:
+    return _SHORT_ALIAS_CONTEXT[kind] if len(alias) <= _SHORT_ALIAS_MAX else None
+
+
+def build_matcher(vocab: Dict[str, Any], cat: Optional[catalog.Catalog] = None) -> PhraseMatcher:
+    """Phrases from the vocabulary file, location aliases from utils and, if given, the catalog."""
+    m = PhraseMatcher()
+    # Curated entries go first: the first value added for a phrase and kind wins
+    for role in vocab.get("roles", []):
+        m.add(role, "role", role)
+    for alias, role in vocab.get("role_aliases", {}).items():
+        m.add(alias, "role", role, _short_alias_context(alias, "role"))
+    for sk in vocab.get("skills", []):
+        m.add(sk, "skill", sk)
+    for alias, sk in vocab.get("skill_aliases", {}).items():
+        m.add(alias, "skill", sk)
+    for loc in vocab.get("locations", []):
+        m.add(loc, "location", normalize_location(loc))
+    for alias, loc in {**_LOC_ALIASES, **vocab.get("location_aliases", {})}.items():
+        m.add(alias, "location", normalize_location(loc), _short_alias_context(alias, "location"))
+    for phrase in vocab.get("remote", []):
+        m.add(phrase, "remote", True)
+    for alias, et in vocab.get("employment_types", {}).items():
+        m.add(alias, "employment_type", normalize_employment_type(et))
+    for alias, level in vocab.get("seniority", {}).items():
+        m.add(alias, "seniority", level)
+    for alias, domain in vocab.get("domains", {}).items():
+        m.add(alias, "domain", domain)
+    if cat is not None:
+        for title in cat.columns.vocabs["title"]:
+            role = " ".join(_TITLE_NOISE.sub(" ", title).split())
+            if role:
+                m.add(role, "role", role.title())
+        for loc in cat.columns.vocabs["location"]:
+            if loc and loc != "remote":
+                m.add(loc, "location", loc)
+        for sk in cat.columns.vocabs["skill"]:
+            m.add(sk, "skill", sk)
+    return m
+
+
+class FallbackParser:
+    """Turns phrase hits into a JobPreference: first role/location/etc. wins, skills accumulate."""
+
+    def __init__(self, matcher: PhraseMatcher):
+        self.matcher = matcher
+
+    def parse(self, utterance: str) -> JobPreference:
+        found: Dict[str, Any] = {}
+        skills: List[str] = []
+        for kind, value in self.matcher.scan(utterance):
+            if kind == "skill":
+                if value not in skills:
+                    skills.append(value)
+            else:
+                found.setdefault(kind, value)
+        remote = found.get("remote")
+        smin, smax, sunit = parse_salary_span(utterance)
+        return JobPreference(
+            role=found.get("role"),
+            location=found.get("location") or ("remote" if remote else None),
+            salary_min=smin,
+            salary_max=smax,
+            salary_unit=sunit,
+            employment_type=found.get("employment_type"),
+            domain=found.get("domain"),
+            seniority=found.get("seniority"),
+            remote=remote,
+            skills=skills,
+            notes="parsed by offline fallback",
+        )
+
+
+_parser: Optional[Tuple[int, FallbackParser]] = None
+_parser_lock = threading.Lock()
+
+
+def get_parser() -> FallbackParser:
+    """Parser for the current catalog, rebuilt after a catalog reload."""
+    global _parser
+    cat = catalog.current()
+    entry = _parser
+    if entry is None or entry[0] != cat.version:
+        with _parser_lock:
+            entry = _parser
+            if entry is None or entry[0] != cat.version:
+                entry = _parser = (cat.version, FallbackParser(build_matcher(load_vocabulary(), cat)))
+    return entry[1]
+
+
+def ready() -> bool:
+    """True once the parser for the live catalog is built; never triggers a build."""
+    cat, entry = catalog.loaded(), _parser
+    return cat is not None and entry is not None and entry[0] == cat.version
+
+
+def parse(utterance: str) -> JobPreference:
+    return get_parser().parse(utterance)
@@ -0,0 +1,91 @@
+# app/ingest.py
+# Streaming readers for job feeds: NDJSON or (arbitrarily large) JSON arrays.
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+ProgressFn = Callable[[int], None]
+
+
+def iter_ndjson(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """One JSON object per line; blank lines are skipped."""
+    for lineno, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {lineno}: {e}") from e
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    """
+    Decode the elements of a top-level JSON array one at a time, reading the file in
+    `chunk_size` pieces. Only the unconsumed tail of the buffer is kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf, pos = buf[pos:] + chunk, 0
+        return True
+
+    def skip(chars: str) -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or not fill():
+                return
+
+    skip(" \t\r\n")
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("expected a JSON array")
+    pos += 1
+    while True:
+        skip(" \t\r\n,")
+        if pos >= len(buf):
+            raise ValueError("unterminated JSON array")
+        if buf[pos] == "]":
+            return
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                break
+            except json.JSONDecodeError:
+                # Element straddles the chunk boundary; read more and retry
+                if eof or not fill():
+                    raise ValueError("truncated JSON array element")
+        pos = end
+        yield obj
+
+
+def iter_jobs(path: Path, progress: Optional[ProgressFn] = None, every: int = 100_000) -> Iterator[Dict[str, Any]]:
+    """Stream jobs from `path`, sniffing NDJSON vs. JSON array from the first character."""
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        jobs = iter_json_array(f) if head == "[" else iter_ndjson(f)
+        n = 0
+        for n, job in enumerate(jobs, 1):
+            yield job
+            if progress is not None and n % every == 0:
+                progress(n)
+        if progress is not None:
+            progress(n)
+
+
+def log_progress(n: int) -> None:
+    logger.info("catalog ingest: %d jobs", n)
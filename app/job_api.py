@@ -1,14 +1,27 @@
 # app/job_api.py
-# Mock Jobnova API implementation: load jobs, score, and return reasons.
+# Mock Jobnova API implementation: score jobs from the live catalog and return reasons.
 
-import json
-from pathlib import Path
-from typing import List
+import base64
+import heapq
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from . import catalog, metrics
+from .catalog import Catalog
+from .job_columns import job_location_key
+from .match_cache import CachedRanking, Ranked, canonical_preference, make_match_cache_from_env, preference_key
+from .render import JobFragments, json_array
+from .rerank import SessionRankCache
 from .schemas import JobPreference, MatchItem
+from .semantic import SemanticIndex
 from .utils import normalize_text
 
 
-_DATA = json.loads(Path("data/mock_jobs.json").read_text(encoding="utf-8"))
+_session_scores = SessionRankCache()
+_match_cache = make_match_cache_from_env()
+# Rankings are cached at least this deep so follow-up pages are slices
+_CACHE_DEPTH = 50
+# Job-only MatchItem fields of the current catalog, keyed by its version
+_fragments: Optional[Tuple[int, JobFragments]] = None
 
 
 def _skill_overlap(a: List[str], b: List[str]) -> List[str]:
@@ -18,11 +31,14 @@ def _skill_overlap(a: List[str], b: List[str]) -> List[str]:
 
 
 def score_job(pref: JobPreference, job: dict) -> float:
-    """Very simple heuristic scorer; deterministic and explainable."""
+    """
+    Very simple heuristic scorer; deterministic and explainable. Exact matches
+    only: with SEMANTIC_MATCH=1 the ranking uses `JobColumns.score` instead.
+    """
     s = 0.0
     if pref.role and pref.role.lower() in job["title"].lower():
         s += 2.0
-    if pref.location and pref.location.lower() in job["location"].lower():
+    if pref.location and pref.location.lower() in job_location_key(job["location"]):
         s += 1.4
     if pref.domain and pref.domain.lower() == str(job.get("domain", "")).lower():
         s += 1.1
@@ -43,11 +59,13 @@ def score_job(pref: JobPreference, job: dict) -> float:
     return s
 
 
-def reasons(pref: JobPreference, job: dict) -> List[str]:
+def reasons(pref: JobPreference, job: dict, semantic: Optional[SemanticIndex] = None) -> List[str]:
     r = []
     if pref.role and pref.role.lower() in job["title"].lower():
         r.append("Title matches desired role")
-    if pref.location and pref.location.lower() in job["location"].lower():
+    elif pref.role and semantic is not None and semantic.title_weight(pref.role, job["title"]) > 0:
+        r.append("Title similar to desired role")
+    if pref.location and pref.location.lower() in job_location_key(job["location"]):
         r.append("Preferred location matched")
     if pref.domain and pref.domain and pref.domain.lower() == str(job.get("domain", "")).lower():
         r.append("Domain aligned")
@@ -56,6 +74,10 @@ def reasons(pref: JobPreference, job: dict) -> List[str]:
     ov = _skill_overlap(pref.skills or [], job.get("skills", []))
     if ov:
         r.append(f"Skill overlap: {', '.join(ov)}")
+    if semantic is not None and pref.skills:
+        related = semantic.related_skill_matches(pref.skills, job.get("skills", []))
+        if related:
+            r.append(f"Related skills: {', '.join(related)}")
     if pref.salary_min and job.get("salary_min") and job["salary_min"] >= pref.salary_min:
         r.append("Salary meets minimum requirement")
     if pref.employment_type and pref.employment_type == job.get("employment_type"):
@@ -63,22 +85,194 @@ def reasons(pref: JobPreference, job: dict) -> List[str]:
     return r
 
 
-def query_top_n(pref: JobPreference, n: int = 10) -> List[MatchItem]:
-    scored: List[MatchItem] = []
-    for job in _DATA:
-        sc = score_job(pref, job)
-        if sc <= 0:
-            continue
-        sr = job.get("salary_min"), job.get("salary_max"), job.get("salary_unit", "year")
-        item = MatchItem(
-            job_id=job["job_id"],
-            title=job["title"],
-            company=job["company"],
-            location=job["location"],
-            salary_range=f"{sr[0]}–{sr[1]} / {sr[2]}" if sr[0] and sr[1] else None,
-            domain=job.get("domain"),
-            reasons=reasons(pref, job),
-            score=round(sc, 3),
-        )
-        scored.append(item)
-    return sorted(scored, key=lambda x: x.score, reverse=True)[:n]
+def _job_fragments(cat: Catalog) -> JobFragments:
+    global _fragments
+    entry = _fragments
+    if entry is None or entry[0] != cat.version:
+        entry = _fragments = (cat.version, JobFragments(cat.jobs))
+    return entry[1]
+
+
+def _cursor_tag(pref: JobPreference) -> str:
+    # Short fingerprint of the ranked query; a full preference_key is not needed to tell queries apart
+    return preference_key(pref)[:8]
+
+
+def encode_cursor(score: float, row: int, version: int, pref: JobPreference) -> str:
+    """
+    Opaque keyset cursor pointing just past (score, row) in ranking order,
+    bound to the catalog version and the (canonical) preference it was issued for.
+    """
+    raw = f"{version}:{_cursor_tag(pref)}:{score!r}:{row}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, version: int, pref: JobPreference) -> Tuple[float, int]:
+    """(score, row) of a cursor; ValueError if malformed or issued for another query or catalog."""
+    try:
+        v, tag, score, row = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        v, after = int(v), (float(score), int(row))
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+    if v != version:
+        raise ValueError("cursor was issued for another catalog version; restart pagination")
+    if tag != _cursor_tag(pref):
+        raise ValueError("cursor was issued for a different query")
+    return after
+
+
+def _rank(
+    cat: Catalog, pref: JobPreference, k: int, after: Optional[Tuple[float, int]] = None
+) -> List[Tuple[float, int]]:
+    if k <= 0:
+        return []
+    # Only jobs sharing at least one populated field can score above zero
+    rows = cat.index.candidates(pref)
+    return _top_k(rows, cat.columns.score(pref, rows), k, after)
+
+
+def _top_k(
+    rows: np.ndarray, scores: np.ndarray, k: int, after: Optional[Tuple[float, int]] = None
+) -> List[Tuple[float, int]]:
+    """
+    Bounded top-k over (score, row) without materializing MatchItems.
+    Order is score desc (rounded to 3 places), then catalog order, as before.
+    """
+    if k <= 0:
+        return []
+    metrics.candidates_scored.observe(len(rows))
+    keep = scores > 0
+    rows, rounded = rows[keep], np.round(scores[keep], 3)
+    if after is not None:
+        a_score, a_row = after
+        keep = (rounded < a_score) | ((rounded == a_score) & (rows > a_row))
+        rows, rounded = rows[keep], rounded[keep]
+    if len(rows) > k:
+        # Drop everything strictly below the k-th best score before the heap pass
+        kth = np.partition(rounded, len(rounded) - k)[len(rounded) - k]
+        keep = rounded >= kth
+        rows, rounded = rows[keep], rounded[keep]
+    top = heapq.nsmallest(k, zip((-rounded).tolist(), rows.tolist()))
+    return [(-neg, row) for neg, row in top]
+
+
+def _lookup(cat: Catalog, pref: JobPreference, k: int, rank: Callable[[int], Ranked]) -> CachedRanking:
+    """
+    At least `k` ranked entries for a canonical preference: from the match cache,
+    or computed with `rank(depth)` and cached with some headroom for later pages.
+    """
+    key = preference_key(pref)
+    if _match_cache is not None:
+        entry = _match_cache.get(cat.version, key, k)
+        if entry is not None:
+            return entry
+    depth = max(k, _CACHE_DEPTH)
+    ranked = rank(depth + 1)
+    complete = len(ranked) <= depth
+    if _match_cache is not None:
+        return _match_cache.put(cat.version, key, ranked[:depth], complete)
+    return CachedRanking(ranked[:depth], complete, expires=0.0)
+
+
+def _items(cat: Catalog, pref: JobPreference, entry: CachedRanking, ranked: Ranked) -> List[MatchItem]:
+    frags, sem = _job_fragments(cat), cat.columns.semantic
+    return [
+        entry.item(row, lambda row=row, sc=sc: frags.item(row, reasons(pref, cat.jobs[row], sem), sc))
+        for sc, row in ranked
+    ]
+
+
+def _items_json(cat: Catalog, pref: JobPreference, entry: CachedRanking, ranked: Ranked) -> bytes:
+    """`_items` serialized as a JSON array, spliced from per-job fragments."""
+    frags, sem = _job_fragments(cat), cat.columns.semantic
+    return json_array([
+        entry.item_json(row, lambda row=row, sc=sc: frags.item_json(row, reasons(pref, cat.jobs[row], sem), sc))
+        for sc, row in ranked
+    ])
+
+
+def query_top_n(pref: JobPreference, n: int = 10, offset: int = 0) -> List[MatchItem]:
+    cat = catalog.current()
+    pref = canonical_preference(pref)
+    entry = _lookup(cat, pref, offset + n, lambda k: _rank(cat, pref, k))
+    return _items(cat, pref, entry, entry.ranked[offset:offset + n])
+
+
+def query_top_n_for_session(session_id: str, pref: JobPreference, n: int = 10) -> List[MatchItem]:
+    """
+    Same ranking as `query_top_n`. On a match-cache miss it reuses the session's
+    per-field scores from the previous turn so only the changed fields are rescored.
+    """
+    cat = catalog.current()
+    pref = canonical_preference(pref)
+    entry = _lookup(cat, pref, n, lambda k: _top_k(*_session_scores.scores(session_id, cat, pref), k))
+    return _items(cat, pref, entry, entry.ranked[:n])
+
+
+def prime_session_ranking(session_id: str, pref: JobPreference, max_rows: int) -> bool:
+    """
+    Rank a partial preference for the session ahead of time (see app.speculate):
+    the next `query_top_n_for_session` then only rescores the fields that changed.
+    """
+    cat = catalog.current()
+    pref = canonical_preference(pref)
+    return _session_scores.prime(session_id, cat, pref, max_rows)
+
+
+def _page(
+    pref: JobPreference, limit: int, offset: int, cursor: Optional[str]
+) -> Tuple[Catalog, JobPreference, CachedRanking, Ranked, Optional[str]]:
+    cat = catalog.current()
+    pref = canonical_preference(pref)
+    if cursor:
+        after = decode_cursor(cursor, cat.version, pref)
+        entry = _match_cache.get(cat.version, preference_key(pref), 0) if _match_cache is not None else None
+        start = entry.position_after(after) if entry is not None else 0
+        if entry is None or not entry.covers(start + limit + 1):
+            ranked = _rank(cat, pref, limit + 1, after=after)
+            entry = CachedRanking(ranked, True, expires=0.0)
+            start = 0
+    else:
+        entry = _lookup(cat, pref, offset + limit + 1, lambda k: _rank(cat, pref, k))
+        start = offset
+    ranked = entry.ranked[start:start + limit + 1]
+    page = ranked[:limit]
+    nxt = encode_cursor(*page[-1], cat.version, pref) if len(ranked) > limit else None
+    return cat, pref, entry, page, nxt
+
+
+def query_page(
+    pref: JobPreference, limit: int = 10, offset: int = 0, cursor: Optional[str] = None
+) -> Tuple[List[MatchItem], Optional[str]]:
+    """
+    One page of matches plus a cursor for the next page (None when exhausted).
+    Pages within the cached depth are slices; deeper cursor pages select only
+    `limit` rows past the cursor instead of `offset + limit`.
+    """
+    cat, pref, entry, page, nxt = _page(pref, limit, offset, cursor)
+    return _items(cat, pref, entry, page), nxt
+
+
+def query_page_json(
+    pref: JobPreference, limit: int = 10, offset: int = 0, cursor: Optional[str] = None
+) -> Tuple[bytes, Optional[str]]:
+    """`query_page` with the page already encoded as a JSON array of MatchItems."""
+    cat, pref, entry, page, nxt = _page(pref, limit, offset, cursor)
+    return _items_json(cat, pref, entry, page), nxt
+
+
+def _catalog_stats() -> dict:
+    cat = catalog.loaded()
+    return {"jobs": len(cat), "version": cat.version} if cat is not None else {}
+
+
+def _semantic_stats() -> dict:
+    cat = catalog.loaded()
+    return cat.columns.semantic.stats() if cat is not None and cat.columns.semantic is not None else {}
+
+
+metrics.register_stats("jobnova_catalog", "Loaded catalog size and version", _catalog_stats)
+metrics.register_stats("jobnova_semantic_index", "Similar title / related skill index", _semantic_stats)
+metrics.register_stats("jobnova_session_rank_cache", "Per-session rescoring", _session_scores.stats)
+if _match_cache is not None:
+    metrics.register_stats("jobnova_match_cache", "Ranked match cache", _match_cache.stats)
@@ -0,0 +1,270 @@
+# app/job_columns.py
+# Columnar view of the job catalog with a vectorized batch scorer.
+
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .schemas import JobPreference
+from .semantic import SemanticIndex
+from .utils import normalize_location, normalize_text
+
+# Integer-coded categorical columns: name -> how the value is read from a job dict
+CATEGORICAL = {
+    "title": lambda j: j["title"].lower(),
+    "location": lambda j: job_location_key(j["location"]),
+    "domain": lambda j: str(j.get("domain", "")).lower(),
+    "employment_type": lambda j: j.get("employment_type"),
+    "seniority": lambda j: j.get("seniority"),
+    "remote": lambda j: j.get("remote"),
+}
+
+
+# Scored preference fields, in the order `score_job` adds their terms
+FIELDS = ("role", "location", "domain", "employment_type", "remote", "seniority", "skills", "salary_min")
+
+
+def _is_set(pref: JobPreference, field: str) -> bool:
+    v = getattr(pref, field)
+    return v is not None if field == "remote" else bool(v)
+
+
+def job_location_key(location: str) -> str:
+    """Normalized job location that `pref.location` is matched against."""
+    return normalize_location(location) or ""
+
+
+def _postings(codes: np.ndarray, n_values: int) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR posting lists: rows of code c are order[starts[c]:starts[c + 1]], ascending."""
+    order = np.argsort(codes, kind="stable").astype(np.int64)
+    starts = np.searchsorted(codes[order], np.arange(n_values + 1)).astype(np.int64)
+    return order, starts
+
+
+class JobColumns:
+    """
+    Integer-coded categorical columns, a skills bitmap and a salary_min array.
+    Without a semantic index, `score()` reproduces `job_api.score_job` for many
+    jobs in a few array ops.
+
+    Every column is a flat array (see `arrays`), with per-code CSR posting lists
+    alongside, so the whole thing can be written to disk and memory-mapped.
+    The skills bitmap is stored column-wise and sparse (job rows per skill id):
+    catalogs have thousands of distinct skills but only a handful per job.
+
+    With a `semantic` index attached, role and skills also credit similar titles
+    and related skills (cosine weight instead of 1.0); exact matches score as before,
+    but rows with only similar titles or related skills score above `score_job`,
+    which stays exact-match only.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], vocabs: Dict[str, Sequence[Any]]):
+        self.arrays = arrays
+        self.vocabs = vocabs
+        self.size = len(arrays["salary_min"])
+        self.lookups: Dict[str, Dict[Any, int]] = {
+            name: {v: i for i, v in enumerate(vocabs[name])} for name in CATEGORICAL if name not in ("title", "location")
+        }
+        self._skill_ids: Dict[str, int] = {sk: i for i, sk in enumerate(vocabs["skill"])}
+        self.salary_min = arrays["salary_min"]
+        self.semantic: Optional[SemanticIndex] = None
+        # (column, query) -> (evaluated, hit) per vocab code; filled in as codes are seen
+        self._substring_memo: "OrderedDict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    @classmethod
+    def from_jobs(cls, jobs: Sequence[Dict[str, Any]]) -> "JobColumns":
+        builder = JobColumnsBuilder()
+        for job in jobs:
+            builder.add(job)
+        return builder.build()
+
+    def code_of(self, name: str, value: Any) -> Optional[int]:
+        return self.lookups[name].get(value)
+
+    def rows_for_codes(self, name: str, codes: Sequence[int]) -> np.ndarray:
+        """Union of the posting lists for the given codes of one column (unsorted)."""
+        order, starts = self.arrays[f"{name}_order"], self.arrays[f"{name}_starts"]
+        parts = [order[starts[c]:starts[c + 1]] for c in codes]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def skill_id(self, skill: str) -> Optional[int]:
+        return self._skill_ids.get(skill)
+
+    def rows_for_skill(self, sid: int) -> np.ndarray:
+        starts = self.arrays["skill_starts"]
+        return self.arrays["skill_rows"][starts[sid]:starts[sid + 1]]
+
+    def rows_with_salary_at_least(self, salary_min: float) -> np.ndarray:
+        order = self.arrays["salary_order"]
+        return order[np.searchsorted(self.salary_min[order], salary_min, side="left"):]
+
+    _MEMO_QUERIES = 128
+
+    def _substring_mask(self, name: str, rows: np.ndarray, query: str) -> np.ndarray:
+        """
+        Evaluate `query in text` once per distinct value, then broadcast to rows.
+        Results are remembered per recent query, so later rankings of the same
+        role or location (next page, next turn) only test values not seen yet.
+        """
+        q = query.lower()
+        codes = self.arrays[f"{name}_codes"][rows]
+        vocab = self.vocabs[name]
+        with self._memo_lock:
+            entry = self._substring_memo.get((name, q))
+            if entry is None:
+                entry = self._substring_memo[(name, q)] = (np.zeros(len(vocab), bool), np.zeros(len(vocab), bool))
+                if len(self._substring_memo) > self._MEMO_QUERIES:
+                    self._substring_memo.popitem(last=False)
+            else:
+                self._substring_memo.move_to_end((name, q))
+        done, hit = entry
+        todo = np.unique(codes)
+        todo = todo[~done[todo]]
+        if todo.size:
+            hit[todo] = [q in vocab[c] for c in todo.tolist()]
+            done[todo] = True
+        return hit[codes]
+
+    def _equals(self, name: str, rows: np.ndarray, value: Any) -> np.ndarray:
+        code = self.code_of(name, value)
+        if code is None:
+            return np.zeros(len(rows), dtype=bool)
+        return self.arrays[f"{name}_codes"][rows] == code
+
+    def skill_overlap_counts(self, skills: List[str], rows: np.ndarray) -> np.ndarray:
+        """Number of distinct normalized preference skills each row has."""
+        wanted = {normalize_text(x) for x in skills if x}
+        hits = [self.rows_for_skill(self._skill_ids[sk]) for sk in wanted if sk in self._skill_ids]
+        if not hits:
+            return np.zeros(len(rows), dtype=np.int64)
+        counts = np.bincount(np.concatenate(hits), minlength=self.size)
+        return counts[rows]
+
+    def related_skill_ids(self, skill: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(skill ids, weights) a normalized preference skill matches: itself, plus related ones if semantic."""
+        if self.semantic is not None:
+            return self.semantic.related_skills(skill)
+        sid = self._skill_ids.get(skill)
+        if sid is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return np.array([sid], dtype=np.int64), np.ones(1, dtype=np.float64)
+
+    def related_skill_scores(self, skills: List[str], rows: np.ndarray) -> np.ndarray:
+        """
+        Sum over distinct preference skills of the best weight among each row's
+        skills; equals `skill_overlap_counts` when only exact matches exist.
+        """
+        total = np.zeros(self.size, dtype=np.float64)
+        for sk in {normalize_text(x) for x in skills if x}:
+            sids, weights = self.related_skill_ids(sk)
+            best = np.zeros(self.size, dtype=np.float64)
+            for sid, w in zip(sids.tolist(), weights.tolist()):
+                hit = self.rows_for_skill(sid)
+                best[hit] = np.maximum(best[hit], w)
+            total += best
+        return total[rows]
+
+    def _role_weights(self, rows: np.ndarray, role: str) -> np.ndarray:
+        hit = self._substring_mask("title", rows, role)
+        if self.semantic is None:
+            return hit
+        similar = self.semantic.similar_titles(role)[1]
+        return np.maximum(hit, similar[self.arrays["title_codes"][rows]])
+
+    def contribution(self, field: str, pref: JobPreference, rows: np.ndarray) -> np.ndarray:
+        """
+        One preference field's additive share of `score_job` for the given rows;
+        zeros when the field is unset. `score()` is the ordered sum over FIELDS.
+        """
+        zero = np.zeros(len(rows), dtype=np.float64)
+        if field == "role":
+            return 2.0 * self._role_weights(rows, pref.role) if pref.role else zero
+        if field == "location":
+            return 1.4 * self._substring_mask("location", rows, pref.location) if pref.location else zero
+        if field == "domain":
+            return 1.1 * self._equals("domain", rows, pref.domain.lower()) if pref.domain else zero
+        if field == "employment_type":
+            return 0.9 * self._equals("employment_type", rows, pref.employment_type) if pref.employment_type else zero
+        if field == "remote":
+            return 0.8 * self._equals("remote", rows, pref.remote) if pref.remote is not None else zero
+        if field == "seniority":
+            return 0.6 * self._equals("seniority", rows, pref.seniority) if pref.seniority else zero
+        if field == "skills":
+            if not pref.skills:
+                return zero
+            if self.semantic is not None:
+                return np.minimum(self.related_skill_scores(pref.skills, rows), 6) * 0.55
+            return np.minimum(self.skill_overlap_counts(pref.skills, rows), 6) * 0.55
+        if field == "salary_min":
+            if not pref.salary_min:
+                return zero
+            sal = self.salary_min[rows]
+            has = sal != 0
+            return np.where(has & (sal >= pref.salary_min), 0.7, np.where(has, -0.5, 0.0))
+        raise KeyError(field)
+
+    def score(self, pref: JobPreference, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Batch equivalent of `score_job` for the given rows (all rows if None).
+        Terms are added in the same order as the scalar scorer, so with semantic
+        matching off the floats match exactly.
+        """
+        if rows is None:
+            rows = np.arange(self.size, dtype=np.int64)
+        s = np.zeros(len(rows), dtype=np.float64)
+        for field in FIELDS:
+            if _is_set(pref, field):
+                s += self.contribution(field, pref, rows)
+        return s
+
+
+class JobColumnsBuilder:
+    """
+    Incremental construction: `add()` normalizes one job and appends its codes to
+    compact typed arrays, so a feed can be streamed without holding job dicts.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self._codes = {name: array("i") for name in CATEGORICAL}
+        self._lookups: Dict[str, Dict[Any, int]] = {name: {} for name in CATEGORICAL}
+        self._skill_ids: Dict[str, int] = {}
+        self._skill_sid = array("i")
+        self._skill_row = array("q")
+        self._salary = array("d")
+
+    def add(self, job: Dict[str, Any]) -> None:
+        row = self.size
+        for name, read in CATEGORICAL.items():
+            lookup = self._lookups[name]
+            self._codes[name].append(lookup.setdefault(read(job), len(lookup)))
+        for sk in {normalize_text(x) for x in job.get("skills", []) if x}:
+            self._skill_sid.append(self._skill_ids.setdefault(sk, len(self._skill_ids)))
+            self._skill_row.append(row)
+        self._salary.append(job.get("salary_min") or 0)
+        self.size += 1
+
+    def build(self) -> JobColumns:
+        arrays: Dict[str, np.ndarray] = {}
+        vocabs: Dict[str, Sequence[Any]] = {}
+        for name in CATEGORICAL:
+            codes = np.array(self._codes[name], dtype=np.int32)
+            arrays[f"{name}_codes"] = codes
+            vocabs[name] = list(self._lookups[name])
+            arrays[f"{name}_order"], arrays[f"{name}_starts"] = _postings(codes, len(vocabs[name]))
+
+        sids = np.asarray(self._skill_sid, dtype=np.int32)
+        srows = np.asarray(self._skill_row, dtype=np.int64)
+        order, starts = _postings(sids, len(self._skill_ids))
+        arrays["skill_rows"], arrays["skill_starts"] = srows[order], starts
+        vocabs["skill"] = list(self._skill_ids)
+
+        salary = np.asarray(self._salary, dtype=np.float64)
+        arrays["salary_min"] = salary
+        with_salary = np.flatnonzero(salary != 0)
+        arrays["salary_order"] = with_salary[np.argsort(salary[with_salary], kind="stable")].astype(np.int64)
+        return JobColumns(arrays, vocabs)
@@ -0,0 +1,108 @@
+# app/job_index.py
+# Inverted index over the job catalog: posting lists per preference field.
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from .job_columns import FIELDS, JobColumns
+from .schemas import JobPreference
+from .utils import normalize_text
+
+
+def _substring_terms(vocab: Iterable[str], query: str) -> Optional[List[List[str]]]:
+    """
+    Map a substring query onto index terms. Returns one group of terms per query
+    token; a document can only contain the query if every group matches one of
+    its tokens. Returns None when the query has no tokens (cannot be narrowed).
+    """
+    toks = query.lower().split()
+    if not toks:
+        return None
+    vocab = list(vocab)
+    if len(toks) == 1:
+        return [[t for t in vocab if toks[0] in t]]
+    groups = [[t for t in vocab if t.endswith(toks[0])]]
+    for tok in toks[1:-1]:
+        groups.append([tok])
+    groups.append([t for t in vocab if t.startswith(toks[-1])])
+    return groups
+
+
+class JobIndex:
+    """
+    Candidate generation on top of `JobColumns`: title/location tokens map to column
+    codes, and every other field uses the columns' CSR posting lists directly.
+    Similar titles and related skills from the columns' semantic index, if any,
+    are added to the role and skills postings.
+    `candidates()` returns a superset of the jobs that `score_job` can score above
+    zero, so ranking stays identical to a full scan.
+    """
+
+    def __init__(self, columns: JobColumns):
+        self.columns = columns
+        self.size = columns.size
+        self._tokens: Dict[str, Dict[str, List[int]]] = {}
+        for name in ("title", "location"):
+            postings: Dict[str, List[int]] = defaultdict(list)
+            for code, text in enumerate(columns.vocabs[name]):
+                for tok in set(text.split()):
+                    postings[tok].append(code)
+            self._tokens[name] = dict(postings)
+
+    def _substring_rows(self, name: str, query: str) -> np.ndarray:
+        postings = self._tokens[name]
+        groups = _substring_terms(postings.keys(), query)
+        if groups is None:
+            return np.arange(self.size, dtype=np.int64)
+        codes: Optional[Set[int]] = None
+        for terms in groups:
+            hit: Set[int] = set()
+            for t in terms:
+                hit.update(postings.get(t, ()))
+            codes = hit if codes is None else codes & hit
+            if not codes:
+                return np.empty(0, dtype=np.int64)
+        return self.columns.rows_for_codes(name, sorted(codes or ()))
+
+    def _equal_rows(self, name: str, value) -> np.ndarray:
+        code = self.columns.code_of(name, value)
+        return self.columns.rows_for_codes(name, [] if code is None else [code])
+
+    def field_rows(self, field: str, pref: JobPreference) -> np.ndarray:
+        """Rows (unsorted) where `field` can contribute a positive score; empty if unset."""
+        cols = self.columns
+        empty = np.empty(0, dtype=np.int64)
+        if field == "role":
+            if not pref.role:
+                return empty
+            rows = self._substring_rows("title", pref.role)
+            if cols.semantic is not None:
+                similar = cols.semantic.similar_titles(pref.role)[0]
+                rows = np.concatenate([rows, cols.rows_for_codes("title", similar.tolist())])
+            return rows
+        if field == "location":
+            return self._substring_rows("location", pref.location) if pref.location else empty
+        if field == "domain":
+            return self._equal_rows("domain", pref.domain.lower()) if pref.domain else empty
+        if field in ("employment_type", "seniority"):
+            value = getattr(pref, field)
+            return self._equal_rows(field, value) if value else empty
+        if field == "remote":
+            return self._equal_rows("remote", pref.remote) if pref.remote is not None else empty
+        if field == "skills":
+            parts = [
+                cols.rows_for_skill(sid)
+                for sk in {normalize_text(x) for x in pref.skills if x}
+                for sid in cols.related_skill_ids(sk)[0].tolist()
+            ]
+            return np.concatenate(parts) if parts else empty
+        if field == "salary_min":
+            return cols.rows_with_salary_at_least(pref.salary_min) if pref.salary_min else empty
+        raise KeyError(field)
+
+    def candidates(self, pref: JobPreference) -> np.ndarray:
+        """Row ids (ascending, unique) matching at least one populated preference field."""
+        parts = [self.field_rows(f, pref) for f in FIELDS]
+        return np.unique(np.concatenate(parts))
@@ -1,27 +1,105 @@
 # app/llm.py
 # Robust LLM wrapper with dotenv loading and offline fallback.
 
+import asyncio
 import json
 import os
 import re
-from typing import Dict, Any
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
 from dotenv import load_dotenv
-from openai import OpenAI, OpenAIError
-from importlib import resources
+from pydantic import ValidationError
 
+from . import fallback_parser, metrics
+from .llm_guard import CircuitOpen, LLMGuard, LLMTimeout, make_circuit_breaker_from_env, make_llm_guard_from_env
+from .parse_cache import make_cache_key, make_parse_cache_from_env
+from .prompts import PromptTemplate, TokenCounter, parse_prompt_store
 from .schemas import JobPreference
+from .singleflight import AsyncSingleFlight, SingleFlight
 from .utils import (
-    normalize_location,
     normalize_employment_type,
+    normalize_location,
     parse_salary_span,
 )
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
 # Ensure environment variables from .env are loaded
 load_dotenv()
 
-# Create client (may be unused if we fall back)
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+# Clients are created on first use (None without OPENAI_API_KEY, i.e. fallback only):
+# importing the openai package is most of a worker's cold start
+_UNSET: Any = object()
+client: "Optional[OpenAI]" = _UNSET
+async_client: "Optional[AsyncOpenAI]" = _UNSET
+_client_lock = threading.Lock()
+
+MODEL = "gpt-4o-mini"
+
+# Template read once and re-read only when the file changes; token accounting per call
+_templates = parse_prompt_store()
+_tokens = TokenCounter(MODEL)
+# Longer utterances are cut (head + tail kept) before they reach the prompt
+MAX_UTTERANCE_TOKENS = int(os.getenv("LLM_MAX_UTTERANCE_TOKENS", "512"))
+# A parse is one small JSON object; this caps what a runaway completion can cost
+MAX_COMPLETION_TOKENS = int(os.getenv("LLM_MAX_COMPLETION_TOKENS", "300"))
+
+# Temperature-0 parses are deterministic: identical inputs reuse the stored result
+parse_cache = make_parse_cache_from_env()
+
+# In-flight LLM parses keyed like the cache (see `flight_stats()` for coalescing counts)
+_flight = SingleFlight()
+_async_flight = AsyncSingleFlight()
+
+# Latency budget, hedging and circuit breaker around every LLM parse
+_guard = make_llm_guard_from_env()
+
+# Batched parses produce far more output tokens: a longer budget, no hedging
+# (a duplicate batch doubles the cost), and a breaker of their own so failing
+# bulk re-parses cannot short-circuit live /chat traffic
+BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "8"))
+BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "4"))
+_batch_guard = LLMGuard(
+    budget_seconds=float(os.getenv("LLM_BATCH_TIMEOUT", "60")), hedge=False, breaker=make_circuit_breaker_from_env()
+)
+
+
+def _new_client(cls_name: str) -> Any:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    import openai
+
+    return getattr(openai, cls_name)(api_key=api_key)
+
+
+def get_client() -> "Optional[OpenAI]":
+    """The OpenAI client, created on first call; None when no API key is set."""
+    global client
+    if client is _UNSET:
+        with _client_lock:
+            if client is _UNSET:
+                client = _new_client("OpenAI")
+    return client
+
+
+def get_async_client() -> "Optional[AsyncOpenAI]":
+    """AsyncOpenAI twin of `get_client`."""
+    global async_client
+    if async_client is _UNSET:
+        with _client_lock:
+            if async_client is _UNSET:
+                async_client = _new_client("AsyncOpenAI")
+    return async_client
+
+
+def llm_configured() -> bool:
+    """Whether parses will try the LLM, without creating a client."""
+    if client is not _UNSET:
+        return client is not None
+    return bool(os.getenv("OPENAI_API_KEY"))
 
 
 def _extract_json_block(text: str) -> Dict[str, Any]:
@@ -37,125 +115,369 @@ def _extract_json_block(text: str) -> Dict[str, Any]:
         return {}
 
 
-def _load_prompt() -> str:
-    """
-    Read prompts/parse_intent.md using importlib.resources for robust packaging.
-    Fallback to a minimal inline prompt if file is missing.
-    """
-    try:
-        with resources.files("app").joinpath("../prompts/parse_intent.md").open("r", encoding="utf-8") as f:
-            return f.read()
-    except Exception:
-        # Minimal inline prompt fallback
-        return (
-            'You are a job-intent parser. Return STRICT JSON with keys: '
-            '{ "role": null, "location": null, "salary_min": null, "salary_max": null, '
-            '"salary_unit": null, "employment_type": null, "domain": null, '
-            '"seniority": null, "remote": null, "skills": [], "notes": null }. '
-            'User: "{USER_UTTERANCE}"'
-        )
+def _prepare(user_utterance: str) -> Tuple[PromptTemplate, str, int]:
+    """Template, rendered prompt (utterance cut to the token budget) and its token count."""
+    template = _templates.get()
+    utterance, n = _tokens.truncate(user_utterance, MAX_UTTERANCE_TOKENS)
+    return template, template.render(utterance), _tokens.template_tokens(template) + n
 
 
 def _fallback_parse_intent(utterance: str) -> JobPreference:
     """
-    Offline heuristic when LLM is unavailable: naive extraction of a few fields.
+    Offline extraction when LLM is unavailable (see app/fallback_parser.py).
     This guarantees /chat never crashes.
     """
-    u = utterance.lower()
-    role = None
-    # crude role guess
-    for kw in ["data analyst", "ai engineer", "ml engineer", "data scientist", "nlp engineer"]:
-        if kw in u:
-            role = kw.title()
-            break
-
-    # location guess
-    location = None
-    for loc in ["bay area", "san francisco", "los angeles", "new york", "austin", "remote"]:
-        if loc in u:
-            location = "Remote" if loc == "remote" else loc.title()
-            break
-
-    # salary
-    smin, smax, sunit = parse_salary_span(utterance)
-
-    # remote flag
-    remote = True if "remote is fine" in u or "remote ok" in u or "remote" in u else None
-
-    # skills (very rough)
-    skills = []
-    for sk in ["sql", "python", "tableau", "pandas", "langchain", "fastapi"]:
-        if sk in u:
-            skills.append(sk)
+    return fallback_parser.parse(utterance)
+
+
+def _failure_reason(e: BaseException) -> str:
+    if isinstance(e, ValidationError):
+        return "malformed"
+    if isinstance(e, LLMTimeout):
+        return "timeout"
+    if isinstance(e, CircuitOpen):
+        return "circuit_open"
+    from openai import OpenAIError
+
+    if isinstance(e, OpenAIError):
+        return "api_error"
+    return "error"
+
+
+def _fallback(user_utterance: str, reason: str) -> JobPreference:
+    """Heuristic parse, counted by reason so the fallback rate is visible."""
+    metrics.llm_fallbacks.inc(reason=reason)
+    metrics.intent_parses.inc(source="fallback")
+    return _fallback_parse_intent(user_utterance)
+
+
+def _pref_from_completion(txt: str, user_utterance: str) -> JobPreference:
+    """Normalize the model's JSON answer into a JobPreference."""
+    return _pref_from_data(_extract_json_block(txt), user_utterance)
+
+
+def _pref_from_data(data: Dict[str, Any], user_utterance: str) -> JobPreference:
+    # Normalize and return
+    role = data.get("role")
+    location = normalize_location(data.get("location"))
+    employment_type = normalize_employment_type(data.get("employment_type"))
+    salary_min = data.get("salary_min")
+    salary_max = data.get("salary_max")
+    salary_unit = data.get("salary_unit")
+    notes = data.get("notes")
+
+    # Infer salary unit from raw utterance if missing
+    if not salary_unit and (salary_min or salary_max):
+        _, _, unit = parse_salary_span(user_utterance)
+        salary_unit = unit
 
     return JobPreference(
         role=role,
-        location=normalize_location(location),
-        salary_min=smin,
-        salary_max=smax,
-        salary_unit=sunit,
-        employment_type=None,
-        domain=None,
-        seniority=None,
-        remote=remote,
-        skills=skills,
-        notes="parsed by offline fallback",
+        location=location,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        salary_unit=salary_unit,
+        employment_type=employment_type,
+        domain=data.get("domain"),
+        seniority=data.get("seniority"),
+        remote=data.get("remote"),
+        skills=data.get("skills") or [],
+        notes=notes,
+    )
+
+
+def _complete(prompt: str, prompt_tokens: int) -> str:
+    metrics.llm_calls.inc(kind="single")
+    resp = get_client().chat.completions.create(
+        model=MODEL,
+        temperature=0,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=MAX_COMPLETION_TOKENS,
+        timeout=_guard.budget,
+    )
+    txt = resp.choices[0].message.content or ""
+    _tokens.record(prompt_tokens, txt)
+    return txt
+
+
+async def _complete_async(prompt: str, prompt_tokens: int) -> str:
+    metrics.llm_calls.inc(kind="single")
+    resp = await get_async_client().chat.completions.create(
+        model=MODEL,
+        temperature=0,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=MAX_COMPLETION_TOKENS,
+        timeout=_guard.budget,
     )
+    txt = resp.choices[0].message.content or ""
+    _tokens.record(prompt_tokens, txt)
+    return txt
+
+
+def _accept(txt: str, user_utterance: str, key: str) -> JobPreference:
+    """
+    Build the preference from a completion. Runs outside the guard: an answer
+    with bad JSON or fields is not an outage and must not trip the breaker.
+    """
+    pref = _pref_from_completion(txt, user_utterance)
+    # Only successful LLM parses are cached; fallbacks are retried next time
+    if parse_cache is not None:
+        parse_cache.set(key, pref)
+    return pref
+
+
+def _llm_parse(prompt: str, prompt_tokens: int, user_utterance: str, key: str) -> JobPreference:
+    return _accept(_guard.call(lambda: _complete(prompt, prompt_tokens)), user_utterance, key)
+
+
+async def _llm_parse_async(prompt: str, prompt_tokens: int, user_utterance: str, key: str) -> JobPreference:
+    return _accept(await _guard.call_async(lambda: _complete_async(prompt, prompt_tokens)), user_utterance, key)
 
 
 def parse_intent(user_utterance: str) -> JobPreference:
     """
     Try the LLM first; if it fails for any reason (no key, network, bad model),
-    fall back to a heuristic parser so /chat always returns a response.
+    runs past the latency budget or the circuit breaker is open, fall back to a
+    heuristic parser so /chat always returns a response.
     """
-    prompt_template = _load_prompt()
-    prompt = prompt_template.replace("{USER_UTTERANCE}", user_utterance)
+    if get_client() is None:
+        return _fallback(user_utterance, "no_client")
 
-    if client is None:
-        return _fallback_parse_intent(user_utterance)
+    template, prompt, prompt_tokens = _prepare(user_utterance)
+    key = make_cache_key(user_utterance, template.text, MODEL)
+    if parse_cache is not None:
+        cached = parse_cache.get(key)
+        if cached is not None:
+            metrics.intent_parses.inc(source="cache")
+            return cached
 
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            temperature=0,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        txt = resp.choices[0].message.content or ""
-        data = _extract_json_block(txt)
-
-        # Normalize and return
-        role = data.get("role")
-        location = normalize_location(data.get("location"))
-        employment_type = normalize_employment_type(data.get("employment_type"))
-        salary_min = data.get("salary_min")
-        salary_max = data.get("salary_max")
-        salary_unit = data.get("salary_unit")
-        notes = data.get("notes")
-
-        # Infer salary unit from raw utterance if missing
-        if not salary_unit and (salary_min or salary_max):
-            _, _, unit = parse_salary_span(user_utterance)
-            salary_unit = unit
-
-        return JobPreference(
-            role=role,
-            location=location,
-            salary_min=salary_min,
-            salary_max=salary_max,
-            salary_unit=salary_unit,
-            employment_type=employment_type,
-            domain=data.get("domain"),
-            seniority=data.get("seniority"),
-            remote=data.get("remote"),
-            skills=data.get("skills") or [],
-            notes=notes,
-        )
-    except OpenAIError:
-        # Explicit API errors
-        return _fallback_parse_intent(user_utterance)
-    except Exception:
-        # Any other unexpected issues (JSON, prompt, etc.)
-        return _fallback_parse_intent(user_utterance)
+        # Concurrent identical utterances share one guarded LLM call
+        pref = _flight.do(key, lambda: _llm_parse(prompt, prompt_tokens, user_utterance, key))
+    except Exception as e:
+        # API errors, timeouts, open breaker, invalid fields, or anything unexpected
+        return _fallback(user_utterance, _failure_reason(e))
+    metrics.intent_parses.inc(source="llm")
+    return pref
+
+
+async def parse_intent_async(user_utterance: str) -> JobPreference:
+    """
+    Non-blocking twin of `parse_intent` on AsyncOpenAI: the event loop keeps serving
+    other turns while this one waits on the LLM. Same cache and fallback rules.
+    """
+    if get_async_client() is None:
+        return _fallback(user_utterance, "no_client")
+
+    template, prompt, prompt_tokens = _prepare(user_utterance)
+    key = make_cache_key(user_utterance, template.text, MODEL)
+    if parse_cache is not None:
+        cached = parse_cache.get(key)
+        if cached is not None:
+            metrics.intent_parses.inc(source="cache")
+            return cached
+
+    try:
+        pref = await _async_flight.do(key, lambda: _llm_parse_async(prompt, prompt_tokens, user_utterance, key))
+    except Exception as e:
+        return _fallback(user_utterance, _failure_reason(e))
+    metrics.intent_parses.inc(source="llm")
+    return pref
+
+
+def _batch_prompt(template: PromptTemplate, utterances: List[str]) -> str:
+    """
+    The single-utterance prompt minus its `User:` line, asking for one JSON object
+    that maps each message number to the usual per-utterance object.
+    """
+    head = template.head
+    messages = "\n".join(f"{i}: {json.dumps(u)}" for i, u in enumerate(utterances, 1))
+    return (
+        f"{head}\n\n"
+        f"Batch mode: there are {len(utterances)} numbered user messages below. Return ONE JSON object whose "
+        'keys are the message numbers as strings ("1", "2", ...) and whose values are the JSON object '
+        "described above for that message, in the same format.\n\n"
+        f"Messages:\n{messages}"
+    )
+
+
+def _split_batch_completion(txt: str, n: int) -> List[Optional[Dict[str, Any]]]:
+    """Per-message answers from a batch completion; None where missing or malformed."""
+    data = _extract_json_block(txt)
+    out: List[Optional[Dict[str, Any]]] = []
+    for i in range(1, n + 1):
+        item = data.get(str(i))
+        out.append(item if isinstance(item, dict) else None)
+    return out
+
+
+def _batch_results(txt: str, utterances: List[str], keys: List[str]) -> List[JobPreference]:
+    """Per-item preferences from a batch answer; a missing or invalid item falls back on its own."""
+    prefs = []
+    for utterance, key, data in zip(utterances, keys, _split_batch_completion(txt, len(utterances))):
+        try:
+            pref = _pref_from_data(data, utterance) if data is not None else None
+        except ValidationError:
+            pref = None
+        if pref is None:
+            prefs.append(_fallback(utterance, "malformed"))
+            continue
+        metrics.intent_parses.inc(source="llm")
+        if parse_cache is not None:
+            parse_cache.set(key, pref)
+        prefs.append(pref)
+    return prefs
+
+
+def _batch_request(template: PromptTemplate, utterances: List[str]) -> Tuple[Dict[str, Any], int]:
+    """Chat-completions kwargs for one batch, plus its prompt token count."""
+    prompt = _batch_prompt(template, [_tokens.truncate(u, MAX_UTTERANCE_TOKENS)[0] for u in utterances])
+    kwargs = dict(
+        model=MODEL,
+        temperature=0,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=MAX_COMPLETION_TOKENS * len(utterances),
+        timeout=_batch_guard.budget,
+    )
+    return kwargs, _tokens.count(prompt)
+
+
+def _complete_batch(template: PromptTemplate, utterances: List[str]) -> str:
+    kwargs, prompt_tokens = _batch_request(template, utterances)
+    metrics.llm_calls.inc(kind="batch")
+    resp = get_client().chat.completions.create(**kwargs)
+    txt = resp.choices[0].message.content or ""
+    _tokens.record(prompt_tokens, txt)
+    return txt
+
+
+async def _complete_batch_async(template: PromptTemplate, utterances: List[str]) -> str:
+    kwargs, prompt_tokens = _batch_request(template, utterances)
+    metrics.llm_calls.inc(kind="batch")
+    resp = await get_async_client().chat.completions.create(**kwargs)
+    txt = resp.choices[0].message.content or ""
+    _tokens.record(prompt_tokens, txt)
+    return txt
+
+
+def _batch_plan(
+    template: PromptTemplate, utterances: List[str], batch_size: int
+) -> Tuple[List[Optional[JobPreference]], List[Tuple[List[str], List[str]]]]:
+    """
+    Cache hits, plus the distinct uncached utterances split into chunks.
+    Returns (results with cache hits filled in, chunks of (utterances, keys)).
+    """
+    results: List[Optional[JobPreference]] = [None] * len(utterances)
+    pending: Dict[str, str] = {}  # utterance -> cache key, first-seen order
+    for i, u in enumerate(utterances):
+        key = make_cache_key(u, template.text, MODEL)
+        cached = parse_cache.get(key) if parse_cache is not None else None
+        if cached is not None:
+            metrics.intent_parses.inc(source="cache")
+            results[i] = cached
+        else:
+            pending.setdefault(u, key)
+    todo = list(pending.items())
+    chunks = [todo[i:i + batch_size] for i in range(0, len(todo), max(1, batch_size))]
+    return results, [([u for u, _ in c], [k for _, k in c]) for c in chunks]
+
+
+def _fan_out(
+    utterances: List[str], results: List[Optional[JobPreference]], parsed: Dict[str, JobPreference]
+) -> List[JobPreference]:
+    return [r if r is not None else parsed[u] for u, r in zip(utterances, results)]
+
+
+def parse_intents_batch(utterances: List[str], batch_size: int = BATCH_SIZE) -> List[JobPreference]:
+    """
+    Parse many utterances with one LLM call per `batch_size` distinct uncached
+    utterances, in input order. Items the model leaves out or answers with
+    malformed JSON or invalid fields fall back individually; a failed call falls
+    back for its chunk.
+    """
+    if get_client() is None:
+        return [_fallback(u, "no_client") for u in utterances]
+
+    template = _templates.get()
+    results, chunks = _batch_plan(template, utterances, batch_size)
+    parsed: Dict[str, JobPreference] = {}
+    for chunk, keys in chunks:
+        try:
+            txt = _batch_guard.call(lambda: _complete_batch(template, chunk))
+        except Exception as e:
+            prefs = [_fallback(u, _failure_reason(e)) for u in chunk]
+        else:
+            # Outside the guard, like single parses: bad items are not outages
+            prefs = _batch_results(txt, chunk, keys)
+        parsed.update(zip(chunk, prefs))
+    return _fan_out(utterances, results, parsed)
+
+
+async def parse_intents_batch_async(
+    utterances: List[str], batch_size: int = BATCH_SIZE, concurrency: int = BATCH_CONCURRENCY
+) -> List[JobPreference]:
+    """`parse_intents_batch` with up to `concurrency` chunk calls in flight at once."""
+    if get_async_client() is None:
+        return [_fallback(u, "no_client") for u in utterances]
+
+    template = _templates.get()
+    results, chunks = _batch_plan(template, utterances, batch_size)
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(chunk: List[str], keys: List[str]) -> List[JobPreference]:
+        async with sem:
+            try:
+                txt = await _batch_guard.call_async(lambda: _complete_batch_async(template, chunk))
+            except Exception as e:
+                return [_fallback(u, _failure_reason(e)) for u in chunk]
+        return _batch_results(txt, chunk, keys)
+
+    parsed: Dict[str, JobPreference] = {}
+    for (chunk, _), prefs in zip(chunks, await asyncio.gather(*(run(c, k) for c, k in chunks))):
+        parsed.update(zip(chunk, prefs))
+    return _fan_out(utterances, results, parsed)
+
+
+def token_stats() -> Dict[str, Any]:
+    """Prompt/completion tokens spent on LLM parses (tiktoken counts)."""
+    return {**_tokens.stats(), "prompt_loads": _templates.loads}
+
+
+def flight_stats() -> Dict[str, int]:
+    """LLM calls issued vs. coalesced onto an identical in-flight parse, e.g. `async_coalesced`."""
+    return {
+        f"{path}_{k}": v
+        for path, flight in (("sync", _flight), ("async", _async_flight))
+        for k, v in flight.stats().items()
+    }
+
+
+def parse_cache_stats() -> Dict[str, int]:
+    """Hits, misses and size of the parse cache ({} when PARSE_CACHE_SIZE=0)."""
+    return parse_cache.stats() if parse_cache is not None else {}
+
+
+def warm_up() -> None:
+    """Load the prompt template and token encoding ahead of the first LLM parse."""
+    if llm_configured():
+        _tokens.template_tokens(_templates.get())
+
+
+def guard_stats() -> Dict[str, Any]:
+    """Hedges, timeouts and circuit breaker state for LLM parses."""
+    return _guard.stats()
+
+
+def batch_guard_stats() -> Dict[str, Any]:
+    """`guard_stats` for batched parses, which have their own breaker."""
+    return _batch_guard.stats()
+
+
+metrics.register_stats("jobnova_llm_guard", "LLM hedges, timeouts and short circuits", guard_stats)
+metrics.register_stats("jobnova_llm_batch_guard", "Batched LLM parse timeouts and short circuits", batch_guard_stats)
+metrics.register_stats("jobnova_llm_tokens", "LLM prompt and completion tokens", lambda: _tokens.stats())
+metrics.register_stats("jobnova_llm_flight", "LLM parses issued vs. coalesced onto an in-flight call", flight_stats)
+metrics.register_stats("jobnova_parse_cache", "Parse cache hits, misses and size", parse_cache_stats)
 
 
 # English-only follow-up prompts
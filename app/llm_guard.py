@@ -0,0 +1,243 @@
+# app/llm_guard.py
+# Latency protection for LLM calls: a time budget, hedged requests and a circuit breaker.
+
+import asyncio
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+
+class LLMTimeout(TimeoutError):
+    """The call did not finish within the latency budget."""
+
+
+class CircuitOpen(RuntimeError):
+    """The breaker is open; the caller should use the heuristic parser."""
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies."""
+
+    def __init__(self, window: int = 256):
+        self._samples: "deque[float]" = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `cooldown_seconds`. Then one probe call is let through (half-open): success
+    closes the breaker, failure opens it for another cool-down.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 30.0, clock: Callable[[], float] = monotonic):
+        self._lock = threading.Lock()
+        self._threshold = failure_threshold
+        self._cooldown = cooldown_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if self._clock() - self._opened_at >= self._cooldown else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self._cooldown or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self._threshold):
+                self._opened_at = self._clock()
+                self._probing = False
+                self.opened += 1
+
+
+class LLMGuard:
+    """
+    Runs an LLM call under a latency budget. If the first attempt has not finished
+    after the hedge delay (the recent p95, or `initial_hedge_delay` until there are
+    enough samples), one identical request is started and the first success wins.
+    Every outcome feeds the circuit breaker; while it is open calls fail fast with
+    `CircuitOpen`.
+    """
+
+    def __init__(
+        self,
+        budget_seconds: float = 10.0,
+        hedge: bool = True,
+        initial_hedge_delay: float = 2.0,
+        hedge_quantile: float = 0.95,
+        min_samples: int = 20,
+        breaker: Optional[CircuitBreaker] = None,
+        max_workers: int = 64,
+    ):
+        self.budget = budget_seconds
+        self.hedge = hedge
+        self._initial_hedge_delay = initial_hedge_delay
+        self._quantile = hedge_quantile
+        self._min_samples = min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+        # Threads are only started as calls need them
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self.calls = 0
+        self.hedges = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.short_circuits = 0
+
+    def hedge_delay(self) -> float:
+        p = self.latency.quantile(self._quantile) if len(self.latency) >= self._min_samples else None
+        return min(self.budget, self._initial_hedge_delay if p is None else p)
+
+    def _admit(self) -> float:
+        if not self.breaker.allow():
+            self.short_circuits += 1
+            raise CircuitOpen("LLM circuit breaker is open")
+        self.calls += 1
+        return monotonic()
+
+    def _record(self, start: float, error: Optional[BaseException]) -> None:
+        if error is None:
+            self.latency.add(monotonic() - start)
+            self.breaker.record_success()
+            return
+        if isinstance(error, LLMTimeout):
+            self.timeouts += 1
+        else:
+            self.failures += 1
+        self.breaker.record_failure()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run `fn` (blocking) on the guard's worker threads; raises LLMTimeout or fn's error."""
+        start = self._admit()
+        deadline = start + self.budget
+        hedge_at = start + self.hedge_delay() if self.hedge else None
+        pending: Set[Future] = {self._pool.submit(fn)}
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                now = monotonic()
+                if now >= deadline:
+                    raise LLMTimeout(f"LLM call exceeded {self.budget:.2f}s")
+                if hedge_at is not None and now >= hedge_at:
+                    pending.add(self._pool.submit(fn))
+                    self.hedges += 1
+                    hedge_at = None
+                done, pending = wait(
+                    pending, timeout=min(deadline, hedge_at or deadline) - now, return_when=FIRST_COMPLETED
+                )
+                for f in done:
+                    if f.exception() is None:
+                        self._record(start, None)
+                        return f.result()
+                    error = f.exception()
+                if not pending:
+                    raise error
+        except BaseException as e:
+            # Losing attempts are not interruptible; the client-side timeout bounds them
+            for f in pending:
+                f.cancel()
+            self._record(start, e)
+            raise
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async twin of `call`; losing and timed-out attempts are cancelled."""
+        start = self._admit()
+        deadline = start + self.budget
+        hedge_at = start + self.hedge_delay() if self.hedge else None
+        pending: Set["asyncio.Future[Any]"] = {asyncio.ensure_future(fn())}
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                now = monotonic()
+                if now >= deadline:
+                    raise LLMTimeout(f"LLM call exceeded {self.budget:.2f}s")
+                if hedge_at is not None and now >= hedge_at:
+                    pending.add(asyncio.ensure_future(fn()))
+                    self.hedges += 1
+                    hedge_at = None
+                done, pending = await asyncio.wait(
+                    pending, timeout=min(deadline, hedge_at or deadline) - now, return_when=asyncio.FIRST_COMPLETED
+                )
+                for t in done:
+                    if t.exception() is None:
+                        self._record(start, None)
+                        return t.result()
+                    error = t.exception()
+                if not pending:
+                    raise error
+        except BaseException as e:
+            self._record(start, e)
+            raise
+        finally:
+            for t in pending:
+                t.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+            "breaker": self.breaker.state,
+            "hedge_delay": round(self.hedge_delay(), 4),
+        }
+
+
+def make_circuit_breaker_from_env() -> CircuitBreaker:
+    """LLM_BREAKER_FAILURES / LLM_BREAKER_COOLDOWN configure a circuit breaker."""
+    return CircuitBreaker(
+        failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+        cooldown_seconds=float(os.getenv("LLM_BREAKER_COOLDOWN", "30")),
+    )
+
+
+def make_llm_guard_from_env() -> LLMGuard:
+    """
+    LLM_TIMEOUT: total seconds per parse; LLM_HEDGE=0 disables hedging and
+    LLM_HEDGE_DELAY sets the delay used before enough latencies are observed;
+    see `make_circuit_breaker_from_env` for the breaker settings.
+    """
+    return LLMGuard(
+        budget_seconds=float(os.getenv("LLM_TIMEOUT", "10")),
+        hedge=os.getenv("LLM_HEDGE", "1") not in ("0", "false", "no"),
+        initial_hedge_delay=float(os.getenv("LLM_HEDGE_DELAY", "2")),
+        breaker=make_circuit_breaker_from_env(),
+    )
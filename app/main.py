@@ -1,26 +1,135 @@
 # app/main.py
 # FastAPI entrypoint with health, mock API, and chat API routes.
 
-from fastapi import FastAPI
-from .schemas import ChatTurn, JobPreference
-from .orchestrator import handle_chat
-from .job_api import query_top_n
+import hmac
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import TypeAdapter
+from . import catalog, metrics, orchestrator, profiling, startup
+from .render import RawJSONResponse
+from .schemas import ChatBatch, ChatResponse, ChatTurn, JobPreference, MatchItem
+from .orchestrator import handle_chat_async, handle_chat_batch_async, stream_chat_async
+from .job_api import query_page_json
 
-app = FastAPI(title="JobNova Conversational Assistant", version="1.0.0")
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Catalog, index and fallback matcher are built before traffic (or in a thread, see /ready)
+    startup.warm_up.start(background=startup.background_warm_up())
+    # CATALOG_WATCH_SECONDS > 0 hot-reloads the catalog when its file changes
+    interval = float(os.getenv("CATALOG_WATCH_SECONDS", "0"))
+    stop = catalog.start_watcher(interval) if interval > 0 else None
+    yield
+    if stop is not None:
+        stop.set()
+    if orchestrator._speculator is not None:
+        orchestrator._speculator.shutdown()
 
+
+app = FastAPI(title="JobNova Conversational Assistant", version="1.0.0", lifespan=lifespan)
+
+
+# With PROFILING_ENABLED=1, a request carrying `X-Profile: 1` is run under cProfile
+# (event loop thread only, one at a time); the report is at /debug/profile/{X-Profile-Id}
+app.add_middleware(profiling.ProfileMiddleware)
+
+
+# Liveness: the process is up. Readiness (/ready): the catalog is built and warm.
 @app.get("/health")
 def health():
     return {"ok": True}
 
 
+@app.get("/ready")
+def ready():
+    status = startup.warm_up.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+# Prometheus text exposition: stage latency histograms, parse/fallback counters, cache gauges
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/debug/profile/{profile_id}")
+def debug_profile(profile_id: str):
+    report = profiling.profiles.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="unknown or expired profile id")
+    return PlainTextResponse(report)
+
+
 # Mock Jobnova API endpoint (for grading/demo)
-@app.post("/mock/jobs")
-def mock_jobs(pref: JobPreference):
-    return [m.model_dump() for m in query_top_n(pref)]
+# Pagination: `offset`, or the opaque `cursor` from the X-Next-Cursor header (400 if it was
+# issued for another query or before a catalog reload).
+# Bodies are encoded once (pydantic-core, cached job fragments); `response_model` only documents them.
+@app.post("/mock/jobs", response_model=List[MatchItem])
+def mock_jobs(
+    pref: JobPreference,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+):
+    try:
+        body, next_cursor = query_page_json(pref, limit=limit, offset=offset, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return RawJSONResponse(body, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+
+def _require_admin(token: Optional[str]) -> None:
+    # ADMIN_TOKEN unset: admin routes do not exist (a rebuild resets every cache, so no open default)
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token is None or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="invalid admin token")
+
+
+# Swap in a freshly built catalog without restarting; in-flight requests finish on the old one.
+# Requires ADMIN_TOKEN to be set and sent back as the X-Admin-Token header.
+@app.post("/admin/catalog/reload")
+def reload_catalog(x_admin_token: Optional[str] = Header(None)):
+    _require_admin(x_admin_token)
+    try:
+        cat = catalog.reload()
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=500, detail=f"catalog reload failed: {e}")
+    return {"version": cat.version, "jobs": len(cat), "source": str(cat.source)}
 
 
 # Main conversational endpoint
-@app.post("/chat")
-def chat(turn: ChatTurn):
-    return handle_chat(turn)
+@app.post("/chat", response_model=ChatResponse)
+async def chat(turn: ChatTurn):
+    return RawJSONResponse(await handle_chat_async(turn))
+
+
+_responses = TypeAdapter(List[ChatResponse])
+
+
+# Bulk processing (e.g. re-parsing stored transcripts): one LLM call per chunk of turns
+@app.post("/chat/batch", response_model=List[ChatResponse])
+async def chat_batch(batch: ChatBatch):
+    return RawJSONResponse(_responses.dump_json(await handle_chat_batch_async(batch.turns)))
+
+
+async def _sse(turn: ChatTurn) -> AsyncIterator[str]:
+    # Comment line first so the client gets bytes before the LLM parse finishes
+    yield ": turn accepted\n\n"
+    async for event, payload in stream_chat_async(turn):
+        yield f"event: {event}\ndata: {payload.model_dump_json()}\n\n"
+
+
+# Server-Sent Events: preferences, then clarification or match events, then the
+# final reply (a full ChatResponse, same shape as /chat)
+@app.post("/chat/stream")
+async def chat_stream(turn: ChatTurn):
+    return StreamingResponse(
+        _sse(turn),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,134 @@
+# app/match_cache.py
+# Ranking cache keyed on the canonical form of a JobPreference.
+
+import hashlib
+import json
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .schemas import JobPreference, MatchItem
+from .utils import normalize_employment_type, normalize_location, normalize_text
+
+Ranked = List[Tuple[float, int]]
+
+
+def canonical_preference(pref: JobPreference) -> JobPreference:
+    """Normalize the fields scoring depends on, so equivalent preferences rank identically."""
+    return pref.model_copy(
+        update={
+            "location": normalize_location(pref.location),
+            "employment_type": normalize_employment_type(pref.employment_type),
+            "skills": sorted({normalize_text(s) for s in pref.skills if s}),
+        }
+    )
+
+
+def preference_key(pref: JobPreference) -> str:
+    """Hash of the scored fields of a canonical preference (notes, salary_max etc. excluded)."""
+    fields = [
+        pref.role.lower() if pref.role else None,
+        pref.location.lower() if pref.location else None,
+        pref.domain.lower() if pref.domain else None,
+        pref.employment_type or None,
+        pref.remote,
+        pref.seniority or None,
+        pref.skills,
+        pref.salary_min or None,
+    ]
+    return hashlib.blake2b(json.dumps(fields).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CachedRanking:
+    """The best `len(ranked)` (score, row) pairs, plus MatchItems (and their JSON) built on first use."""
+
+    __slots__ = ("ranked", "complete", "expires", "_items", "_json", "_order")
+
+    def __init__(self, ranked: Ranked, complete: bool, expires: float):
+        self.ranked = ranked
+        self.complete = complete  # True when `ranked` holds every positive match
+        self.expires = expires
+        self._items: Dict[int, MatchItem] = {}
+        self._json: Dict[int, bytes] = {}
+        self._order = [(-sc, row) for sc, row in ranked]
+
+    def covers(self, k: int) -> bool:
+        return self.complete or len(self.ranked) >= k
+
+    def position_after(self, after: Tuple[float, int]) -> int:
+        """Index of the first entry ranked strictly after the cursor position."""
+        return bisect_right(self._order, (-after[0], after[1]))
+
+    def item(self, row: int, build: Callable[[], MatchItem]) -> MatchItem:
+        it = self._items.get(row)
+        if it is None:
+            it = self._items[row] = build()
+        return it
+
+    def item_json(self, row: int, build: Callable[[], bytes]) -> bytes:
+        js = self._json.get(row)
+        if js is None:
+            js = self._json[row] = build()
+        return js
+
+
+class MatchCache:
+    """
+    LRU + TTL cache of rankings. Entries belong to one catalog version; the first
+    lookup after a reload sees the new version and drops everything.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 300, clock: Callable[[], float] = monotonic):
+        self._data: "OrderedDict[str, CachedRanking]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _check_version(self, version: int) -> bool:
+        """Drop entries from older catalogs; False if `version` itself is stale."""
+        if self._version is None or version > self._version:
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+            self._version = version
+        return version == self._version
+
+    def get(self, version: int, key: str, k: int) -> Optional[CachedRanking]:
+        with self._lock:
+            entry = self._data.get(key) if self._check_version(version) else None
+            if entry is None or entry.expires < self._clock() or not entry.covers(k):
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, version: int, key: str, ranked: Ranked, complete: bool) -> CachedRanking:
+        entry = CachedRanking(ranked, complete, self._clock() + self._ttl)
+        with self._lock:
+            if not self._check_version(version):
+                return entry
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self._max:
+                self._data.popitem(last=False)
+        return entry
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "invalidations": self.invalidations}
+
+
+def make_match_cache_from_env() -> Optional[MatchCache]:
+    """MATCH_CACHE_SIZE=0 disables the cache; MATCH_CACHE_TTL sets expiry in seconds."""
+    size = int(os.getenv("MATCH_CACHE_SIZE", "2048"))
+    if size <= 0:
+        return None
+    return MatchCache(max_entries=size, ttl_seconds=float(os.getenv("MATCH_CACHE_TTL", "300")))
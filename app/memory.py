@@ -1,38 +1,310 @@
 # app/memory.py
-# Minimal in-memory session store. Swap to Redis for production.
+# Session stores behind a common protocol: in-process shards, SQLite WAL, Redis.
 
-from typing import Dict, Any
-from time import time
-from .schemas import JobPreference
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from time import monotonic, time
+from typing import Any, Callable, Dict, List, Protocol, Tuple, Union
+from .schemas import JobPreference, trusted
 
 
-class InMemorySession:
-    """A tiny session store with soft TTL to keep memory bounded in demos."""
-    def __init__(self, ttl_seconds: int = 3600):
-        self._store: Dict[str, Dict[str, Any]] = {}
+# A validated preference (trusted, e.g. a parse result) or a plain dict of field updates
+Updates = Union[JobPreference, Dict[str, Any]]
+
+
+class SessionStore(Protocol):
+    """What the orchestrator needs from session memory; one call per turn."""
+
+    def get_preferences(self, session_id: str) -> JobPreference: ...
+
+    def update_preferences(self, session_id: str, updates: Updates) -> JobPreference: ...
+
+    def stats(self) -> Dict[str, int]: ...
+
+
+def _non_empty(updates: Updates) -> Dict[str, Any]:
+    items = updates.__dict__.items() if isinstance(updates, JobPreference) else updates.items()
+    return {k: v for k, v in items if v not in (None, "", [], {})}
+
+
+# Preferences are stored as a tuple in field order instead of a model_dump() dict
+_FIELDS: Tuple[str, ...] = tuple(JobPreference.model_fields)
+
+
+def _pack(pref: JobPreference) -> tuple:
+    return tuple(tuple(v) if isinstance(v, list) else v for v in (getattr(pref, f) for f in _FIELDS))
+
+
+def _unpack(packed: tuple) -> Dict[str, Any]:
+    return {f: list(v) if isinstance(v, tuple) else v for f, v in zip(_FIELDS, packed)}
+
+
+_EMPTY = _pack(JobPreference())
+
+
+class _Entry:
+    __slots__ = ("prefs", "last_seen")
+
+    def __init__(self, prefs: tuple, last_seen: float):
+        self.prefs = prefs
+        self.last_seen = last_seen
+
+
+class _Shard:
+    """
+    One lock plus an OrderedDict kept in access order. Because every access moves
+    the entry to the end, the front is always the least recently seen entry, so it
+    serves both LRU eviction and TTL expiry (expired entries sit at the front).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+
+class ShardedSessionStore:
+    """
+    Session preferences with active expiry: each operation sweeps a few expired
+    entries from its shard, and `sweep()` reclaims everything expired on demand.
+    `max_entries` caps the total size with per-shard LRU eviction.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        max_entries: int = 100_000,
+        shards: int = 16,
+        sweep_batch: int = 8,
+        clock: Callable[[], float] = monotonic,
+    ):
         self._ttl = ttl_seconds
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self._per_shard = max(1, -(-max_entries // shards))
+        self._sweep_batch = sweep_batch
+        self._clock = clock
+        self._stats_lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    def _shard(self, session_id: str) -> _Shard:
+        return self._shards[hash(session_id) % len(self._shards)]
 
-    def _ensure(self, session_id: str) -> Dict[str, Any]:
-        now = time()
-        s = self._store.get(session_id)
-        if not s or now - s.get("last_seen", 0) > self._ttl:
-            s = {"preferences": JobPreference().model_dump(), "last_seen": now}
-            self._store[session_id] = s
+    def _expire_front(self, shard: _Shard, now: float, limit: int) -> int:
+        """Drop up to `limit` expired entries from the front. Caller holds the lock."""
+        n = 0
+        entries = shard.entries
+        while entries and n < limit:
+            key = next(iter(entries))
+            if now - entries[key].last_seen <= self._ttl:
+                break
+            del entries[key]
+            n += 1
+        return n
+
+    def _touch(self, shard: _Shard, session_id: str, now: float) -> _Entry:
+        """Fetch or create the entry and mark it most recent. Caller holds the lock."""
+        entries = shard.entries
+        expired = self._expire_front(shard, now, self._sweep_batch)
+        e = entries.get(session_id)
+        if e is not None and now - e.last_seen > self._ttl:
+            del entries[session_id]
+            expired += 1
+            e = None
+        evicted = 0
+        if e is None:
+            e = entries[session_id] = _Entry(_EMPTY, now)
+            while len(entries) > self._per_shard:
+                entries.popitem(last=False)
+                evicted += 1
         else:
-            s["last_seen"] = now
-        return s
+            e.last_seen = now
+            entries.move_to_end(session_id)
+        if expired or evicted:
+            with self._stats_lock:
+                self.expired += expired
+                self.evicted += evicted
+        return e
 
     def get(self, session_id: str) -> Dict[str, Any]:
-        return self._ensure(session_id)
-
-    def update_preferences(self, session_id: str, updates: Dict[str, Any]) -> JobPreference:
-        s = self._ensure(session_id)
-        # Merge non-empty values only
-        merged = {**s["preferences"]}
-        for k, v in updates.items():
-            if v not in (None, "", [], {}):
-                merged[k] = v
-        pref = JobPreference(**merged)
-        s["preferences"] = pref.model_dump()
-        self._store[session_id] = s
+        shard = self._shard(session_id)
+        with shard.lock:
+            e = self._touch(shard, session_id, self._clock())
+            return {"preferences": _unpack(e.prefs), "last_seen": e.last_seen}
+
+    def get_preferences(self, session_id: str) -> JobPreference:
+        return trusted(JobPreference, self.get(session_id)["preferences"])
+
+    def update_preferences(self, session_id: str, updates: Updates) -> JobPreference:
+        shard = self._shard(session_id)
+        with shard.lock:
+            e = self._touch(shard, session_id, self._clock())
+            # Merge non-empty values only; stored values and a JobPreference's are already valid
+            merged = {**_unpack(e.prefs), **_non_empty(updates)}
+            if isinstance(updates, JobPreference):
+                pref = trusted(JobPreference, merged)
+            else:
+                pref = JobPreference(**merged)
+            e.prefs = _pack(pref)
         return pref
+
+    def sweep(self) -> int:
+        """Reclaim every expired session; cheap enough to run from a periodic task."""
+        total = 0
+        now = self._clock()
+        for shard in self._shards:
+            with shard.lock:
+                total += self._expire_front(shard, now, len(shard.entries))
+        with self._stats_lock:
+            self.expired += total
+        return total
+
+    def __len__(self) -> int:
+        return sum(len(s.entries) for s in self._shards)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self), "expired": self.expired, "evicted": self.evicted}
+
+
+# Backwards-compatible name for the original demo store
+InMemorySession = ShardedSessionStore
+
+
+class SQLiteSessionStore:
+    """
+    Shared across worker processes through one SQLite file in WAL mode (readers
+    never block the writer). Each thread keeps its own connection; a turn's
+    read-merge-write runs in a single IMMEDIATE transaction.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 3600, sweep_every: int = 1000, clock: Callable[[], float] = time):
+        self._path = path
+        self._ttl = ttl_seconds
+        self._sweep_every = sweep_every
+        self._clock = clock
+        self._local = threading.local()
+        self._updates = 0
+        self.expired = 0
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, prefs TEXT NOT NULL, last_seen REAL NOT NULL)"
+        )
+        self._conn().execute("CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions(last_seen)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _load(self, conn: sqlite3.Connection, session_id: str, now: float) -> Dict[str, Any]:
+        row = conn.execute(
+            "SELECT prefs, last_seen FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None or now - row[1] > self._ttl:
+            return {}
+        return json.loads(row[0])
+
+    def get_preferences(self, session_id: str) -> JobPreference:
+        return JobPreference(**self._load(self._conn(), session_id, self._clock()))
+
+    def update_preferences(self, session_id: str, updates: Updates) -> JobPreference:
+        conn = self._conn()
+        now = self._clock()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            pref = JobPreference(**{**self._load(conn, session_id, now), **_non_empty(updates)})
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, prefs, last_seen) VALUES (?, ?, ?)",
+                (session_id, pref.model_dump_json(exclude_defaults=True), now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._updates += 1
+        if self._sweep_every and self._updates % self._sweep_every == 0:
+            self.sweep()
+        return pref
+
+    def sweep(self) -> int:
+        cur = self._conn().execute("DELETE FROM sessions WHERE last_seen < ?", (self._clock() - self._ttl,))
+        self.expired += cur.rowcount
+        return cur.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        (size,) = self._conn().execute(
+            "SELECT COUNT(*) FROM sessions WHERE last_seen >= ?", (self._clock() - self._ttl,)
+        ).fetchone()
+        return {"size": size, "expired": self.expired}
+
+
+class RedisSessionStore:
+    """
+    Redis-backed store. Each session is a hash of JSON-encoded non-empty fields, so a
+    turn is HSET + EXPIRE + HGETALL in one MULTI/EXEC pipeline: one round trip, and
+    expiry is handled by Redis. `client` is any redis-py compatible client.
+    """
+
+    def __init__(self, client: Any, ttl_seconds: int = 3600, prefix: str = "jobnova:session:"):
+        self._client = client
+        self._ttl = ttl_seconds
+        self._prefix = prefix
+        self.round_trips = 0
+
+    @classmethod
+    def from_url(cls, url: str, max_connections: int = 50, **kwargs: Any) -> "RedisSessionStore":
+        try:
+            import redis
+        except ImportError as e:  # optional dependency
+            raise RuntimeError("SESSION_BACKEND=redis requires the `redis` package") from e
+        pool = redis.ConnectionPool.from_url(url, max_connections=max_connections)
+        return cls(redis.Redis(connection_pool=pool), **kwargs)
+
+    @staticmethod
+    def _decode(raw: Dict[Any, Any]) -> Dict[str, Any]:
+        out = {}
+        for k, v in raw.items():
+            k = k.decode() if isinstance(k, bytes) else k
+            out[k] = json.loads(v)
+        return out
+
+    def get_preferences(self, session_id: str) -> JobPreference:
+        self.round_trips += 1
+        return JobPreference(**self._decode(self._client.hgetall(self._prefix + session_id)))
+
+    def update_preferences(self, session_id: str, updates: Updates) -> JobPreference:
+        # Validate before writing so a bad update never reaches shared state
+        updates = _non_empty(updates)
+        fields = JobPreference(**updates).model_dump(include=set(updates))
+        key = self._prefix + session_id
+        pipe = self._client.pipeline(transaction=True)
+        if fields:
+            pipe.hset(key, mapping={k: json.dumps(v) for k, v in fields.items()})
+        pipe.expire(key, self._ttl)
+        pipe.hgetall(key)
+        merged = pipe.execute()[-1]
+        self.round_trips += 1
+        return JobPreference(**self._decode(merged))
+
+    def stats(self) -> Dict[str, int]:
+        return {"round_trips": self.round_trips}
+
+
+def make_session_store_from_env() -> SessionStore:
+    """
+    SESSION_BACKEND=memory (default) | sqlite | redis, with SESSION_DB_PATH,
+    REDIS_URL and SESSION_TTL. Use sqlite or redis when running several workers.
+    """
+    backend = os.getenv("SESSION_BACKEND", "memory").lower()
+    ttl = int(os.getenv("SESSION_TTL", "3600"))
+    if backend == "sqlite":
+        return SQLiteSessionStore(os.getenv("SESSION_DB_PATH", "sessions.db"), ttl_seconds=ttl)
+    if backend == "redis":
+        return RedisSessionStore.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"), ttl_seconds=ttl)
+    return ShardedSessionStore(ttl_seconds=ttl)
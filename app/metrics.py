@@ -0,0 +1,231 @@
+# app/metrics.py
+# Process-local counters and histograms rendered in the Prometheus text format.
+
+import math
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets in seconds: sub-millisecond ranking up to multi-second LLM calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Candidate rows scored per ranking
+SIZE_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def _fmt(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.label_names, k)} {_fmt(v)}" for k, v in sorted(self._values.items())]
+
+
+class _HistogramChild:
+    """One label set of a histogram; resolve once with `Histogram.labels` on hot paths."""
+
+    __slots__ = ("_buckets", "_lock", "_row")
+
+    def __init__(self, buckets: Tuple[float, ...], lock: threading.Lock, row: List[float]):
+        self._buckets = buckets
+        self._lock = lock
+        self._row = row
+
+    def observe(self, value: float) -> None:
+        row = self._row
+        with self._lock:
+            row[bisect_left(self._buckets, value)] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    """Context manager observing elapsed seconds; errors are counted if `errors` is given."""
+
+    __slots__ = ("_child", "_errors", "_t0")
+
+    def __init__(self, child: _HistogramChild, errors: Optional[Callable[[], None]] = None):
+        self._child = child
+        self._errors = errors
+
+    def __enter__(self) -> None:
+        self._t0 = perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._child.observe(perf_counter() - self._t0)
+        if exc_type is not None and self._errors is not None and issubclass(exc_type, Exception):
+            self._errors()
+        return False
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets) + (math.inf,)
+        # Per label set: [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._children: Dict[LabelValues, _HistogramChild] = {}
+
+    def labels(self, **labels: str) -> _HistogramChild:
+        key = self._key(labels)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    row = self._values[key] = [0] * (len(self.buckets) + 2)
+                    child = self._children[key] = _HistogramChild(self.buckets, self._lock, row)
+        return child
+
+    def observe(self, value: float, **labels: str) -> None:
+        self.labels(**labels).observe(value)
+
+    def time(self, **labels: str) -> _Timer:
+        return _Timer(self.labels(**labels))
+
+    def count(self, **labels: str) -> float:
+        row = self._values.get(self._key(labels))
+        return row[-1] if row else 0
+
+    def samples(self) -> List[str]:
+        out = []
+        for key, row in sorted(self._values.items()):
+            cumulative = 0.0
+            for b, n in zip(self.buckets, row):
+                cumulative += n
+                le = 'le="' + _fmt(b) + '"'
+                out.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {_fmt(cumulative)}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, key)} {_fmt(row[-2])}")
+            out.append(f"{self.name}_count{_labels(self.label_names, key)} {_fmt(row[-1])}")
+        return out
+
+
+class StatsGauge(_Metric):
+    """Gauge read at scrape time from a `stats()`-style dict, one sample per numeric key."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], Mapping[str, object]]):
+        super().__init__(name, help, ("stat",))
+        self._fn = fn
+
+    def samples(self) -> List[str]:
+        try:
+            stats = self._fn()
+        except Exception:
+            return []
+        return [
+            f'{self.name}{{stat="{k}"}} {_fmt(v)}'
+            for k, v in stats.items()
+            if isinstance(v, (int, float)) and not isinstance(v, bool)
+        ]
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics.values():
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+chat_turns = REGISTRY.register(Counter("jobnova_chat_turns_total", "Chat turns by outcome", ("outcome",)))
+chat_turn_seconds = REGISTRY.register(Histogram("jobnova_chat_turn_seconds", "Whole chat turn latency"))
+stage_seconds = REGISTRY.register(
+    Histogram("jobnova_chat_stage_seconds", "Latency of each chat turn stage", ("stage",))
+)
+stage_errors = REGISTRY.register(Counter("jobnova_chat_stage_errors_total", "Exceptions by chat stage", ("stage",)))
+intent_parses = REGISTRY.register(
+    Counter("jobnova_intent_parses_total", "Intent parses by source (llm, cache, fallback)", ("source",))
+)
+llm_fallbacks = REGISTRY.register(
+    Counter("jobnova_llm_fallbacks_total", "Heuristic fallbacks by reason", ("reason",))
+)
+llm_calls = REGISTRY.register(Counter("jobnova_llm_calls_total", "LLM requests sent, including hedges", ("kind",)))
+catalog_reload_failures = REGISTRY.register(
+    Counter("jobnova_catalog_reload_failures_total", "Catalog hot reloads that failed (old snapshot kept)")
+)
+candidates_scored = REGISTRY.register(
+    Histogram("jobnova_candidates_scored", "Catalog rows scored per ranking", buckets=SIZE_BUCKETS)
+)
+
+
+# Stage name -> (histogram child, error counter), resolved once per stage
+_stages: Dict[str, Tuple[_HistogramChild, Callable[[], None]]] = {}
+
+
+def stage(name: str) -> _Timer:
+    """Time one chat stage; exceptions are counted against it and re-raised."""
+    entry = _stages.get(name)
+    if entry is None:
+        entry = _stages[name] = (stage_seconds.labels(stage=name), lambda: stage_errors.inc(stage=name))
+    return _Timer(*entry)
+
+
+def register_stats(name: str, help: str, fn: Callable[[], Mapping[str, object]]) -> None:
+    REGISTRY.register(StatsGauge(name, help, fn))
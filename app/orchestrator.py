@@ -1,13 +1,27 @@
 # app/orchestrator.py
 # Dialogue orchestration: parse -> merge session -> clarify -> query -> format reply. ENGLISH ONLY.
 
-from typing import List
+import logging
+from typing import AsyncIterator, Iterator, List, Tuple
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from .schemas import ChatResponse, ChatTurn, JobPreference, ClarifyQuestion, MatchItem
-from .memory import InMemorySession
-from .llm import parse_intent, gen_clarify_questions
-from .job_api import query_top_n
+from .memory import SessionStore, ShardedSessionStore, make_session_store_from_env
+from . import fallback_parser, llm, metrics
+from .llm import gen_clarify_questions
+from .job_api import query_top_n_for_session
+from .speculate import make_speculator_from_env
 
-_mem = InMemorySession()
+logger = logging.getLogger(__name__)
+
+_mem: SessionStore = make_session_store_from_env()
+metrics.register_stats("jobnova_session_store", "Session store size and expiry counters", lambda: _mem.stats())
+# SQLite lock waits and Redis round trips block: async handlers merge on the threadpool
+_blocking_store = not isinstance(_mem, ShardedSessionStore)
+# Ranks a session's partial preference in the background while a clarification is pending
+_speculator = make_speculator_from_env()
+if _speculator is not None:
+    metrics.register_stats("jobnova_speculation", "Background ranking during clarifications", _speculator.stats)
 
 
 def _format_top3_preview(matches: List[MatchItem]) -> str:
@@ -21,34 +35,74 @@ def _format_top3_preview(matches: List[MatchItem]) -> str:
     return msg.strip()
 
 
-# app/orchestrator.py (only the handle_chat function shown below)
+def _merge(turn: ChatTurn, parsed: JobPreference) -> JobPreference:
+    """Stage 2: merge the parsed preference into session memory."""
+    with metrics.stage("merge"):
+        return _mem.update_preferences(turn.session_id, parsed)
+
+
+async def _warm_async() -> None:
+    # A cold catalog and fallback matcher take seconds to build (or to wait for during
+    # a background warm-up): do that on the threadpool, not the event loop
+    if not fallback_parser.ready():
+        await run_in_threadpool(fallback_parser.get_parser)
+
+
+async def _merge_async(turn: ChatTurn, parsed: JobPreference) -> JobPreference:
+    if _blocking_store:
+        return await run_in_threadpool(_merge, turn, parsed)
+    return _merge(turn, parsed)
 
-def handle_chat(turn: ChatTurn) -> ChatResponse:
-    try:
-        # 1) Parse user utterance into a structured preference
-        parsed: JobPreference = parse_intent(turn.user_utterance)
 
-        # 2) Merge into session memory
-        pref: JobPreference = _mem.update_preferences(turn.session_id, parsed.model_dump())
+async def _claim_async(turn: ChatTurn, pref: JobPreference) -> None:
+    # The turn will query: wait for its speculative ranking without blocking the loop
+    if _speculator is not None and not gen_clarify_questions(pref):
+        await _speculator.claim_async(turn.session_id)
 
-        # 3) Clarifications if needed
+
+def _stages(turn: ChatTurn, pref: JobPreference, claimed: bool = False) -> Iterator[Tuple[str, BaseModel]]:
+    """
+    Stages 3-5 of a turn for the merged preference, as (event, payload) pairs in
+    the order they become available (starting with the preference itself). The
+    last pair is always ("reply", ChatResponse). Stage timers stop before each
+    yield, so a slow stream consumer is not counted. `claimed`: the caller has
+    already claimed the session's speculative ranking (see `_claim_async`).
+    """
+    yield "preferences", pref
+
+    # 3) Clarifications if needed
+    with metrics.stage("clarify"):
         missing = gen_clarify_questions(pref)
-        if missing:
+    if missing:
+        with metrics.stage("compose"):
             qs = [ClarifyQuestion(field=k, question=v) for k, v in missing.items()]
             reply = "To improve match quality, please clarify:\n- " + "\n- ".join(
                 [q.question for q in qs][:3]
             )
-            return ChatResponse(
+            response = ChatResponse(
                 assistant_reply=reply,
                 asked_clarifications=qs,
                 parsed_preferences=pref,
                 top_matches=[],
             )
+        if _speculator is not None:
+            _speculator.submit(turn.session_id, pref)
+        for q in qs:
+            yield "clarification", q
+        metrics.chat_turns.inc(outcome="clarify")
+        yield "reply", response
+        return
 
-        # 4) Query mock API
-        matches: List[MatchItem] = query_top_n(pref, n=10)
+    # 4) Query mock API (starting from the speculative ranking, if one was made)
+    with metrics.stage("query"):
+        if _speculator is not None and not claimed:
+            _speculator.claim(turn.session_id)
+        matches: List[MatchItem] = query_top_n_for_session(turn.session_id, pref, n=10)
+    for m in matches:
+        yield "match", m
 
-        # 5) Compose message
+    # 5) Compose message
+    with metrics.stage("compose"):
         if not matches:
             msg = (
                 "No roles match your current filters. Consider broadening location, "
@@ -56,24 +110,100 @@ def handle_chat(turn: ChatTurn) -> ChatResponse:
             )
         else:
             msg = _format_top3_preview(matches)
-
-        return ChatResponse(
+        response = ChatResponse(
             assistant_reply=msg,
             asked_clarifications=[],
             parsed_preferences=pref,
             top_matches=matches,
         )
+    metrics.chat_turns.inc(outcome="matches" if matches else "no_matches")
+    yield "reply", response
+
+
+def _respond(turn: ChatTurn, pref: JobPreference, claimed: bool = False) -> ChatResponse:
+    """Run the stages after the merge and keep only the final ChatResponse."""
+    for event, payload in _stages(turn, pref, claimed):
+        if event == "reply":
+            return payload
+    raise RuntimeError("turn produced no reply")
+
+
+def _error_response() -> ChatResponse:
+    """Never crash the endpoint; provide a graceful message."""
+    logger.exception("chat turn failed")
+    metrics.chat_turns.inc(outcome="error")
+    safe_pref = JobPreference()
+    return ChatResponse(
+        assistant_reply=(
+            "Something went wrong while processing your request. "
+            "Please try again, and consider providing your desired role, "
+            "location, and minimum compensation."
+        ),
+        asked_clarifications=[],
+        parsed_preferences=safe_pref,
+        top_matches=[],
+    )
+
+
+def handle_chat(turn: ChatTurn) -> ChatResponse:
+    with metrics.chat_turn_seconds.time():
+        try:
+            # 1) Parse user utterance into a structured preference
+            with metrics.stage("parse"):
+                parsed: JobPreference = llm.parse_intent(turn.user_utterance)
+            return _respond(turn, _merge(turn, parsed))
+        except Exception:
+            return _error_response()
+
+
+async def handle_chat_async(turn: ChatTurn) -> ChatResponse:
+    """Same pipeline, but the LLM wait does not hold a threadpool worker."""
+    with metrics.chat_turn_seconds.time():
+        try:
+            await _warm_async()
+            with metrics.stage("parse"):
+                parsed: JobPreference = await llm.parse_intent_async(turn.user_utterance)
+            pref = await _merge_async(turn, parsed)
+            await _claim_async(turn, pref)
+            return _respond(turn, pref, claimed=True)
+        except Exception:
+            return _error_response()
+
+
+async def stream_chat_async(turn: ChatTurn) -> AsyncIterator[Tuple[str, BaseModel]]:
+    """
+    Streaming variant of `handle_chat_async`: yields each stage's event as soon as
+    it exists (preferences right after the parse), ending with ("reply", ChatResponse).
+    """
+    try:
+        await _warm_async()
+        with metrics.stage("parse"):
+            parsed: JobPreference = await llm.parse_intent_async(turn.user_utterance)
+        pref = await _merge_async(turn, parsed)
+        await _claim_async(turn, pref)
+        for event, payload in _stages(turn, pref, claimed=True):
+            yield event, payload
     except Exception:
-        # Never crash the endpoint; provide a graceful message.
-        safe_pref = JobPreference()
-        return ChatResponse(
-            assistant_reply=(
-                "Something went wrong while processing your request. "
-                "Please try again, and consider providing your desired role, "
-                "location, and minimum compensation."
-            ),
-            asked_clarifications=[],
-            parsed_preferences=safe_pref,
-            top_matches=[],
-        )
+        yield "reply", _error_response()
 
+
+async def handle_chat_batch_async(turns: List[ChatTurn]) -> List[ChatResponse]:
+    """
+    Parse every utterance with batched LLM calls, then run the remaining stages
+    turn by turn in input order (so a session's turns merge in sequence).
+    """
+    try:
+        await _warm_async()
+        with metrics.stage("parse"):
+            parsed = await llm.parse_intents_batch_async([t.user_utterance for t in turns])
+    except Exception:
+        return [_error_response() for _ in turns]
+    out: List[ChatResponse] = []
+    for turn, pref in zip(turns, parsed):
+        try:
+            merged = await _merge_async(turn, pref)
+            await _claim_async(turn, merged)
+            out.append(_respond(turn, merged, claimed=True))
+        except Exception:
+            out.append(_error_response())
+    return out
@@ -0,0 +1,138 @@
+# app/parse_cache.py
+# Content-addressed cache for parse_intent results (LRU + TTL, optional SQLite).
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from time import time
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
+
+from .schemas import JobPreference, trusted
+from .utils import normalize_text
+
+
+def make_cache_key(utterance: str, prompt_template: str, model: str) -> str:
+    """Key = normalized utterance + prompt template hash + model name."""
+    prompt_hash = hashlib.sha256(prompt_template.encode("utf-8")).hexdigest()
+    raw = "\0".join([model, prompt_hash, normalize_text(utterance) or ""])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ParseCache(Protocol):
+    """Anything that can store parsed preferences by cache key."""
+
+    def get(self, key: str) -> Optional[JobPreference]: ...
+
+    def set(self, key: str, pref: JobPreference) -> None: ...
+
+    def stats(self) -> Dict[str, int]: ...
+
+
+class MemoryParseCache:
+    """Bounded in-process LRU with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 3600, clock: Callable[[], float] = time):
+        self._data: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._max = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[JobPreference]:
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or now - entry[0] > self._ttl:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+        # Stored from a validated model; only the list needs a fresh copy per caller
+        return trusted(JobPreference, {**value, "skills": list(value["skills"])})
+
+    def set(self, key: str, pref: JobPreference) -> None:
+        with self._lock:
+            self._data[key] = (self._clock(), pref.model_dump())
+            self._data.move_to_end(key)
+            while len(self._data) > self._max:
+                self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+class SQLiteParseCache:
+    """On-disk variant that survives restarts; LRU by last access, TTL by creation time."""
+
+    def __init__(self, path: str, max_entries: int = 100_000, ttl_seconds: float = 86400, clock: Callable[[], float] = time):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS parse_cache_lru ON parse_cache(last_used)")
+        self._max = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[JobPreference]:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self._ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE parse_cache SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return JobPreference(**json.loads(row[0]))
+
+    def set(self, key: str, pref: JobPreference) -> None:
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, value, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, pref.model_dump_json(), now, now),
+            )
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()
+            if size > self._max:
+                self._conn.execute(
+                    "DELETE FROM parse_cache WHERE key IN "
+                    "(SELECT key FROM parse_cache ORDER BY last_used LIMIT ?)",
+                    (size - self._max,),
+                )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "size": size}
+
+
+def make_parse_cache_from_env() -> Optional[ParseCache]:
+    """
+    PARSE_CACHE_SIZE=0 disables caching; PARSE_CACHE_PATH selects the SQLite backend;
+    PARSE_CACHE_TTL sets expiry in seconds.
+    """
+    size = int(os.getenv("PARSE_CACHE_SIZE", "4096"))
+    if size <= 0:
+        return None
+    ttl = float(os.getenv("PARSE_CACHE_TTL", "3600"))
+    path = os.getenv("PARSE_CACHE_PATH")
+    if path:
+        return SQLiteParseCache(path, max_entries=size, ttl_seconds=ttl)
+    return MemoryParseCache(max_entries=size, ttl_seconds=ttl)
@@ -0,0 +1,84 @@
+# app/profiling.py
+# Opt-in cProfile sampling of single requests, enabled per request by header.
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+PROFILE_HEADER = b"x-profile"
+
+
+class ProfileStore:
+    """The most recent `max_profiles` pstats reports, by id."""
+
+    def __init__(self, max_profiles: int = 20):
+        self._max = max_profiles
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+
+    def put(self, pid: str, report: str) -> None:
+        with self._lock:
+            self._data[pid] = report
+            while len(self._data) > self._max:
+                self._data.popitem(last=False)
+
+    def get(self, pid: str) -> Optional[str]:
+        return self._data.get(pid)
+
+
+def render(profile: cProfile.Profile, sort: str = "cumulative", limit: int = 40) -> str:
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def profiling_enabled() -> bool:
+    """PROFILING_ENABLED=1 lets clients request a profile with the X-Profile header."""
+    return os.getenv("PROFILING_ENABLED", "0") in ("1", "true", "yes")
+
+
+def wants_profile(scope: Dict[str, Any]) -> bool:
+    if scope["type"] != "http" or not profiling_enabled():
+        return False
+    return any(k == PROFILE_HEADER and v not in (b"", b"0") for k, v in scope["headers"])
+
+
+profiles = ProfileStore()
+
+
+class ProfileMiddleware:
+    """
+    Plain ASGI middleware (no per-request wrapping unless asked): profiles requests
+    with an X-Profile header and returns the report id as X-Profile-Id.
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if not wants_profile(scope) or not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        pid = uuid.uuid4().hex[:12]
+
+        async def send_with_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", pid.encode())]}
+            await send(message)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                profile.disable()
+        finally:
+            self._lock.release()
+        profiles.put(pid, render(profile))
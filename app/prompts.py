@@ -0,0 +1,186 @@
+# app/prompts.py
+# Prompt templates loaded once (reloaded when the file changes) and tiktoken accounting.
+
+import logging
+import os
+import threading
+from pathlib import Path
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+PLACEHOLDER = "{USER_UTTERANCE}"
+
+# Used when prompts/parse_intent.md is missing
+INLINE_PARSE_PROMPT = (
+    'You are a job-intent parser. Return STRICT JSON with keys: '
+    '{ "role": null, "location": null, "salary_min": null, "salary_max": null, '
+    '"salary_unit": null, "employment_type": null, "domain": null, '
+    '"seniority": null, "remote": null, "skills": [], "notes": null }. '
+    'User: "{USER_UTTERANCE}"'
+)
+
+
+class PromptTemplate:
+    """A template split once around its placeholder, so rendering is two concatenations."""
+
+    __slots__ = ("text", "prefix", "suffix", "head", "_has_placeholder")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.prefix, sep, self.suffix = text.partition(PLACEHOLDER)
+        self._has_placeholder = bool(sep)
+        # Instructions without the line that carries the utterance (used by batch prompts)
+        self.head = "\n".join(line for line in text.splitlines() if PLACEHOLDER not in line).rstrip()
+
+    def render(self, utterance: str) -> str:
+        return self.prefix + utterance + self.suffix if self._has_placeholder else self.text
+
+
+class TemplateStore:
+    """
+    Caches one template file. The file's mtime is checked at most every
+    `check_interval` seconds and the template is re-read only when it changed.
+    """
+
+    def __init__(self, path: Path, default: str, check_interval: float = 2.0, clock: Callable[[], float] = monotonic):
+        self.path = path
+        self._default = default
+        self._interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked = float("-inf")
+        self._template = PromptTemplate(default)
+        self.loads = 0
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return self.path.stat().st_mtime
+        except OSError:
+            return None
+
+    def get(self) -> PromptTemplate:
+        now = self._clock()
+        if now - self._checked < self._interval:
+            return self._template
+        with self._lock:
+            if now - self._checked >= self._interval:
+                mtime = self._stat()
+                if mtime != self._mtime:
+                    try:
+                        text = self.path.read_text(encoding="utf-8")
+                    except OSError:
+                        text = self._default
+                    self._template, self._mtime = PromptTemplate(text), mtime
+                    self.loads += 1
+                self._checked = now
+        return self._template
+
+
+def _approx_encoding():
+    """Rough stand-in (~4 characters per token) when no tiktoken encoding can be loaded."""
+
+    class _Approx:
+        name = "approx-4-chars"
+
+        @staticmethod
+        def encode(text: str) -> List[str]:
+            return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+        @staticmethod
+        def decode(tokens: List[str]) -> str:
+            return "".join(tokens)
+
+    return _Approx()
+
+
+def _load_encoding(model: str):
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # tiktoken fetches BPE files on first use; offline hosts fall back to an estimate
+        logger.warning("tiktoken encoding for %s unavailable (%s); estimating tokens", model, e)
+        return _approx_encoding()
+
+
+class TokenCounter:
+    """
+    Token accounting for LLM calls. The encoding is loaded on first use; the
+    fixed part of each template is counted once and memoized.
+    """
+
+    def __init__(self, model: str, encoding=None):
+        self.model = model
+        self._encoding = encoding
+        self._lock = threading.Lock()
+        self._template_tokens: Dict[str, int] = {}
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.truncated = 0
+
+    @property
+    def encoding(self):
+        if self._encoding is None:
+            with self._lock:
+                if self._encoding is None:
+                    self._encoding = _load_encoding(self.model)
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text)) if text else 0
+
+    def template_tokens(self, template: PromptTemplate) -> int:
+        n = self._template_tokens.get(template.text)
+        if n is None:
+            n = self._template_tokens[template.text] = self.count(template.prefix) + self.count(template.suffix)
+        return n
+
+    def truncate(self, text: str, max_tokens: int) -> Tuple[str, int]:
+        """
+        Fit `text` into `max_tokens` by keeping its head and tail (where intent
+        usually sits) around an ellipsis. Returns (text, token count).
+        """
+        tokens = self.encoding.encode(text)
+        if max_tokens <= 0 or len(tokens) <= max_tokens:
+            return text, len(tokens)
+        with self._lock:
+            self.truncated += 1
+        head = max_tokens * 2 // 3
+        tail = max_tokens - head
+        enc = self.encoding
+        return enc.decode(tokens[:head]) + " … " + enc.decode(tokens[len(tokens) - tail:]), max_tokens
+
+    def record(self, prompt_tokens: int, completion: str) -> None:
+        completion_tokens = self.count(completion)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def stats(self) -> Dict[str, object]:
+        # Don't load the encoding just to report it (a /metrics scrape must stay cheap)
+        return {
+            "encoding": self._encoding.name if self._encoding is not None else None,
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "truncated_utterances": self.truncated,
+        }
+
+
+def parse_prompt_store() -> TemplateStore:
+    """prompts/parse_intent.md; PROMPT_RELOAD_SECONDS sets how often its mtime is checked."""
+    return TemplateStore(
+        PROMPTS_DIR / "parse_intent.md",
+        INLINE_PARSE_PROMPT,
+        check_interval=float(os.getenv("PROMPT_RELOAD_SECONDS", "2")),
+    )
@@ -0,0 +1,77 @@
+# app/render.py
+# Lean JSON output: pydantic-core serialization straight to bytes and per-job MatchItem fragments.
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+from .schemas import MatchItem, trusted
+
+
+class RawJSONResponse(Response):
+    """JSON response whose body is already encoded (FastAPI's JSONResponse re-encodes via json.dumps)."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content if isinstance(content, bytes) else to_json(content)
+
+
+def salary_range(job: Dict[str, Any]) -> Optional[str]:
+    lo, hi, unit = job.get("salary_min"), job.get("salary_max"), job.get("salary_unit", "year")
+    return f"{lo}–{hi} / {unit}" if lo and hi else None
+
+
+class JobFragments:
+    """
+    The job-only MatchItem fields of catalog rows, as a dict and as a JSON
+    fragment (object members without braces). Built on first use of a row; the
+    `max_rows` most recently used rows are kept, so a large mapped catalog is
+    not copied back onto the heap one fragment at a time.
+    """
+
+    def __init__(self, jobs: Sequence[Dict[str, Any]], max_rows: int = 10_000):
+        self._jobs = jobs
+        self._max = max_rows
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[int, Tuple[Dict[str, Any], bytes]]" = OrderedDict()
+
+    def get(self, row: int) -> Tuple[Dict[str, Any], bytes]:
+        with self._lock:
+            entry = self._data.get(row)
+            if entry is not None:
+                self._data.move_to_end(row)
+                return entry
+        job = self._jobs[row]
+        fields = {
+            "job_id": job["job_id"],
+            "title": job["title"],
+            "company": job["company"],
+            "location": job["location"],
+            "salary_range": salary_range(job),
+            "domain": job.get("domain"),
+        }
+        entry = (fields, to_json(fields)[1:-1])
+        with self._lock:
+            self._data[row] = entry
+            while len(self._data) > self._max:
+                self._data.popitem(last=False)
+        return entry
+
+    def item(self, row: int, reasons: List[str], score: float) -> MatchItem:
+        """A MatchItem without validation: catalog fields are checked at build time, the rest come from the ranker."""
+        return trusted(MatchItem, {**self.get(row)[0], "reasons": reasons, "score": score})
+
+    def item_json(self, row: int, reasons: List[str], score: float) -> bytes:
+        """Same bytes as `to_json(self.item(...))`, without building the model."""
+        return b"{" + self.get(row)[1] + b',"reasons":' + to_json(reasons) + b',"score":' + to_json(score) + b"}"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def json_array(parts: Sequence[bytes]) -> bytes:
+    return b"[" + b",".join(parts) + b"]"
@@ -0,0 +1,140 @@
+# app/rerank.py
+# Incremental per-session re-ranking: keep per-field score contributions between turns.
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .catalog import Catalog
+from .job_columns import FIELDS
+from .schemas import JobPreference
+
+
+class SessionRanking:
+    """
+    Candidate rows for a session plus one contribution row per scored field.
+    `score_job` is additive per field, so when a turn changes one field only that
+    row is recomputed (on the rows that field can touch); the other fields and
+    the candidate set are reused. Summing in FIELDS order keeps floats identical
+    to a full `JobColumns.score`.
+    """
+
+    __slots__ = ("version", "pref", "rows", "contrib")
+
+    def __init__(self, cat: Catalog, pref: JobPreference, rows: Optional[np.ndarray] = None):
+        self.version = cat.version
+        self.pref = pref
+        self.rows = cat.index.candidates(pref) if rows is None else rows
+        self.contrib = self._all_fields(cat, pref, self.rows)
+
+    @staticmethod
+    def _all_fields(cat: Catalog, pref: JobPreference, rows: np.ndarray) -> np.ndarray:
+        return np.stack([cat.columns.contribution(f, pref, rows) for f in FIELDS])
+
+    def update(self, cat: Catalog, pref: JobPreference) -> int:
+        """Apply the new preference; returns how many fields had to be recomputed."""
+        changed = [f for f in FIELDS if getattr(self.pref, f) != getattr(pref, f)]
+        if not changed:
+            self.pref = pref
+            return 0
+        # Rows the changed fields newly reach get every field scored once
+        reach = np.unique(np.concatenate([cat.index.field_rows(f, pref) for f in changed]))
+        added = np.setdiff1d(reach, self.rows, assume_unique=True)
+        if added.size:
+            # Both sorted and disjoint: a linear merge instead of re-sorting everything
+            pos = np.searchsorted(self.rows, added)
+            self.contrib = np.insert(self.contrib, pos, self._all_fields(cat, pref, added), axis=1)
+            self.rows = np.insert(self.rows, pos, added)
+        for f in changed:
+            i = FIELDS.index(f)
+            if f == "salary_min":
+                # The salary term also penalizes rows below the minimum, so it spans all rows
+                self.contrib[i] = cat.columns.contribution(f, pref, self.rows)
+                continue
+            self.contrib[i].fill(0.0)
+            touched = np.unique(cat.index.field_rows(f, pref))
+            if touched.size:
+                pos = np.searchsorted(self.rows, touched)
+                self.contrib[i, pos] = cat.columns.contribution(f, pref, touched)
+        self.pref = pref
+        return len(changed)
+
+    def scores(self) -> np.ndarray:
+        s = np.zeros(len(self.rows), dtype=np.float64)
+        for i in range(len(FIELDS)):
+            s += self.contrib[i]
+        return s
+
+
+class SessionRankCache:
+    """Bounded LRU of SessionRanking by session id (process-local)."""
+
+    def __init__(self, max_sessions: int = 10_000, max_rows: int = 250_000):
+        self._data: "OrderedDict[str, SessionRanking]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_sessions = max_sessions
+        self._max_rows = max_rows
+        self.full = 0
+        self.incremental = 0
+        self.fields_recomputed = 0
+        self.primed = 0
+
+    def _advance(
+        self, session_id: str, cat: Catalog, pref: JobPreference, max_new_rows: Optional[int] = None
+    ) -> Optional[SessionRanking]:
+        """
+        The session's ranking moved to `pref` (taken out of the LRU). None if it had
+        to be built from scratch with more than `max_new_rows` candidates.
+        """
+        with self._lock:
+            state = self._data.pop(session_id, None)
+        if state is None or state.version != cat.version:
+            rows = cat.index.candidates(pref)
+            if max_new_rows is not None and len(rows) > max_new_rows:
+                return None
+            state = SessionRanking(cat, pref, rows)
+            self.full += 1
+        else:
+            self.fields_recomputed += state.update(cat, pref)
+            self.incremental += 1
+        return state
+
+    def _keep(self, session_id: str, state: SessionRanking) -> None:
+        # Sessions whose candidate set grew past max_rows are recomputed from scratch
+        if len(state.rows) <= self._max_rows:
+            with self._lock:
+                self._data[session_id] = state
+                while len(self._data) > self._max_sessions:
+                    self._data.popitem(last=False)
+
+    def scores(self, session_id: str, cat: Catalog, pref: JobPreference) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, scores) for the session's current preference."""
+        state = self._advance(session_id, cat, pref)
+        assert state is not None
+        scores = state.scores()
+        self._keep(session_id, state)
+        return state.rows, scores
+
+    def prime(self, session_id: str, cat: Catalog, pref: JobPreference, max_rows: int) -> bool:
+        """
+        Bring the session's ranking up to a (partial) preference ahead of its next
+        query, so that query only rescores the fields that change. A ranking that
+        would start with more than `max_rows` candidates is not built.
+        """
+        state = self._advance(session_id, cat, pref, max_new_rows=max_rows)
+        if state is None:
+            return False
+        self._keep(session_id, state)
+        self.primed += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self._data),
+            "full": self.full,
+            "incremental": self.incremental,
+            "fields_recomputed": self.fields_recomputed,
+            "primed": self.primed,
+        }
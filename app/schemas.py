@@ -2,7 +2,9 @@
 # Pydantic models for request/response contracts.
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+M = TypeVar("M", bound=BaseModel)
 
 
 class JobPreference(BaseModel):
@@ -26,6 +28,11 @@ class ChatTurn(BaseModel):
     user_utterance: str
 
 
+class ChatBatch(BaseModel):
+    """Many chat turns parsed together; turns of one session are applied in order."""
+    turns: List[ChatTurn] = Field(..., min_length=1, max_length=200)
+
+
 class ClarifyQuestion(BaseModel):
     """A single follow-up question for a missing or ambiguous field."""
     field: str
@@ -50,3 +57,20 @@ class ChatResponse(BaseModel):
     asked_clarifications: List[ClarifyQuestion] = Field(default_factory=list)
     parsed_preferences: JobPreference
     top_matches: List[MatchItem] = Field(default_factory=list)
+
+
+def trusted(model: Type[M], values: Dict[str, Any]) -> M:
+    """
+    Build `model` from values that were already validated (stored sessions, catalog
+    rows checked by CatalogBuilder, ranker scores) without validating again. `model_construct` does the same
+    in pure Python and is slower than validation. `values` must hold every field;
+    they are copied in field order, which is the order serialization follows.
+    """
+    fields = {f: values[f] for f in model.model_fields}
+    # Sets pydantic's instance slots directly; tests/test_render.py checks them against model_construct
+    obj = model.__new__(model)
+    object.__setattr__(obj, "__dict__", fields)
+    object.__setattr__(obj, "__pydantic_fields_set__", set(fields))
+    object.__setattr__(obj, "__pydantic_extra__", None)
+    object.__setattr__(obj, "__pydantic_private__", None)
+    return obj
@@ -0,0 +1,257 @@
+# app/semantic.py
+# Local title/skill similarity: hashed character n-gram TF-IDF vectors, built once per catalog load.
+
+import json
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .utils import normalize_text
+
+TERMS_PATH = Path(__file__).resolve().parent.parent / "data" / "semantic_terms.json"
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+class TermExpander:
+    """
+    Curated vocabulary that character n-grams cannot infer: abbreviations are
+    spelled out next to the original token ("ml" -> "ml machine learning"), and a
+    text mentioning any member of a concept group also gets the group's name
+    ("pytorch" -> "pytorch deep learning machine learning").
+    """
+
+    def __init__(self, abbreviations: Dict[str, str], related: Dict[str, List[str]]):
+        self._abbrev = {k: _TOKEN.findall(v.lower()) for k, v in abbreviations.items()}
+        # One level of nesting, e.g. "genai" -> "generative ai" -> "... artificial intelligence"
+        self._abbrev = {k: self._spell_out(v) for k, v in self._abbrev.items()}
+        self._groups: List[Tuple[List[str], List[str]]] = []
+        for head, members in related.items():
+            phrases = {" ".join(self._spell_out(_TOKEN.findall(m.lower()))) for m in [head, *members]}
+            self._groups.append((_TOKEN.findall(head.lower()), [f" {p} " for p in phrases if p]))
+
+    @classmethod
+    def load(cls, path: Path = TERMS_PATH) -> "TermExpander":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(data.get("abbreviations", {}), data.get("related", {}))
+
+    def _spell_out(self, tokens: List[str]) -> List[str]:
+        out: List[str] = []
+        for t in tokens:
+            out.append(t)
+            out.extend(self._abbrev.get(t, ()))
+        return out
+
+    def expand(self, text: str) -> List[str]:
+        tokens = self._spell_out(_TOKEN.findall(text.lower()))
+        padded = f" {' '.join(tokens)} "
+        for head, phrases in self._groups:
+            if any(p in padded for p in phrases):
+                tokens.extend(head)
+        return tokens
+
+
+def _float_env(name: str, default: float) -> float:
+    return float(os.getenv(name) or default)
+
+
+def _int_env(name: str, default: int) -> int:
+    return int(os.getenv(name) or default)
+
+
+class SemanticIndex:
+    """
+    One L2-normalized float32 row per distinct catalog title and skill, from
+    hashed character 3-grams of the expanded text weighted by TF-IDF. Retrieval is
+    a matrix-vector product plus argpartition; results per query text are kept in
+    a small LRU, so the scorer and the candidate index share one lookup.
+
+    Memory is (titles + skills) * dim * 4 bytes; `dim` trades that for collisions.
+    """
+
+    def __init__(
+        self,
+        titles: Sequence[str],
+        skills: Sequence[str],
+        expander: Optional[TermExpander] = None,
+        dim: int = 512,
+        title_k: int = 200,
+        title_threshold: float = 0.55,
+        skill_k: int = 8,
+        skill_threshold: float = 0.4,
+        max_cached: int = 2048,
+    ):
+        t0 = perf_counter()
+        self.expander = expander or TermExpander.load()
+        self.dim = dim
+        self.title_k, self.title_threshold = title_k, title_threshold
+        self.skill_k, self.skill_threshold = skill_k, skill_threshold
+        self.titles: List[str] = list(titles)
+        self.skills: List[str] = list(skills)
+        self._title_ids = {t: i for i, t in enumerate(self.titles)}
+        self._skill_ids = {s: i for i, s in enumerate(self.skills)}
+        self._buckets: Dict[str, int] = {}
+
+        title_tf = self._term_counts(self.titles)
+        skill_tf = self._term_counts(self.skills)
+        n_docs = len(self.titles) + len(self.skills)
+        df = (title_tf > 0).sum(axis=0) + (skill_tf > 0).sum(axis=0)
+        self.idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+        self.title_vectors = self._weigh(title_tf)
+        self.skill_vectors = self._weigh(skill_tf)
+
+        self._cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._max_cached = max_cached
+        self._lock = threading.Lock()
+        self.build_seconds = perf_counter() - t0
+
+    @classmethod
+    def from_columns(cls, columns: Any, **kwargs: Any) -> "SemanticIndex":
+        """Index the distinct (lowercased) titles and normalized skills of a `JobColumns`."""
+        return cls(columns.vocabs["title"], columns.vocabs["skill"], **kwargs)
+
+    # --- vectors -------------------------------------------------------------------
+
+    def _features(self, text: str) -> List[int]:
+        buckets = self._buckets
+        out = []
+        for tok in self.expander.expand(text):
+            padded = f" {tok} "
+            for j in range(len(padded) - 2):
+                gram = padded[j:j + 3]
+                b = buckets.get(gram)
+                if b is None:
+                    b = buckets[gram] = zlib.crc32(gram.encode("utf-8")) % self.dim
+                out.append(b)
+        return out
+
+    def _term_counts(self, texts: Iterable[str]) -> np.ndarray:
+        rows: List[int] = []
+        cols: List[int] = []
+        n = 0
+        for i, text in enumerate(texts):
+            feats = self._features(text)
+            rows.extend([i] * len(feats))
+            cols.extend(feats)
+            n = i + 1
+        counts = np.zeros((n, self.dim), dtype=np.float32)
+        np.add.at(counts, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)), 1.0)
+        return counts
+
+    def _weigh(self, counts: np.ndarray) -> np.ndarray:
+        """Sublinear tf times idf, rows scaled to unit length (in place)."""
+        nz = counts > 0
+        counts[nz] = 1.0 + np.log(counts[nz])
+        counts *= self.idf
+        norms = np.linalg.norm(counts, axis=1, keepdims=True)
+        counts /= np.maximum(norms, 1e-12)
+        return counts
+
+    def vector(self, text: str) -> np.ndarray:
+        counts = np.zeros((1, self.dim), dtype=np.float32)
+        np.add.at(counts[0], np.asarray(self._features(text), dtype=np.int64), 1.0)
+        return self._weigh(counts)[0]
+
+    # --- retrieval -----------------------------------------------------------------
+
+    def _cached(self, key: Tuple[str, str], build: Any) -> Any:
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return hit
+        value = build()
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self._max_cached:
+                self._cache.popitem(last=False)
+        return value
+
+    @staticmethod
+    def _top_k(sims: np.ndarray, k: int, threshold: float) -> np.ndarray:
+        """Indices (ascending) of the k most similar entries at or above threshold."""
+        idx = np.flatnonzero(sims >= threshold)
+        if len(idx) > k:
+            idx = np.sort(idx[np.argpartition(-sims[idx], k - 1)[:k]])
+        return idx
+
+    def _titles(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        sims = self.title_vectors @ self.vector(query)
+        codes = self._top_k(sims, self.title_k, self.title_threshold)
+        weights = np.zeros(len(self.titles), dtype=np.float64)
+        weights[codes] = np.minimum(sims[codes], 1.0)
+        return codes, weights
+
+    def similar_titles(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(title codes, dense weight per title code); weight is cosine, 0 outside the top k."""
+        q = normalize_text(query) or ""
+        return self._cached(("title", q), lambda: self._titles(q))
+
+    def _skills(self, skill: str) -> Tuple[np.ndarray, np.ndarray]:
+        sims = self.skill_vectors @ self.vector(skill)
+        sids = self._top_k(sims, self.skill_k, self.skill_threshold)
+        weights = np.minimum(sims[sids], 1.0).astype(np.float64)
+        exact = self._skill_ids.get(skill)
+        if exact is not None:
+            weights[sids == exact] = 1.0
+            if exact not in sids:
+                sids, weights = np.append(sids, exact), np.append(weights, 1.0)
+        return sids, weights
+
+    def related_skills(self, skill: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(skill ids, weights) for one normalized skill: the skill itself at 1.0 plus similar ones."""
+        return self._cached(("skill", skill), lambda: self._skills(skill))
+
+    def title_weight(self, query: str, title: str) -> float:
+        code = self._title_ids.get(title.lower())
+        return 0.0 if code is None else float(self.similar_titles(query)[1][code])
+
+    def related_skill_matches(self, wanted: Iterable[str], have: Iterable[str]) -> List[str]:
+        """Skills in `have` related to (but not equal to) a skill in `wanted`."""
+        wanted_set = {normalize_text(x) for x in wanted if x}
+        have_set = {normalize_text(x) for x in have if x}
+        out = set()
+        for sk in wanted_set:
+            sids, _ = self.related_skills(sk)
+            out.update(self.skills[s] for s in sids.tolist())
+        return sorted((out & have_set) - wanted_set)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "titles": len(self.titles),
+            "skills": len(self.skills),
+            "dim": self.dim,
+            "bytes": self.title_vectors.nbytes + self.skill_vectors.nbytes,
+            "build_seconds": round(self.build_seconds, 3),
+            "cached_queries": len(self._cache),
+        }
+
+
+def semantic_enabled() -> bool:
+    """SEMANTIC_MATCH=1 adds similar titles and related skills to exact matching."""
+    return os.getenv("SEMANTIC_MATCH", "0") in ("1", "true", "yes")
+
+
+def make_semantic_index_from_env(columns: Any) -> Optional[SemanticIndex]:
+    """
+    SEMANTIC_MATCH=1 builds the index for a catalog's columns; SEMANTIC_DIM,
+    SEMANTIC_TITLE_K / SEMANTIC_TITLE_THRESHOLD and SEMANTIC_SKILL_K /
+    SEMANTIC_SKILL_THRESHOLD tune it.
+    """
+    if not semantic_enabled():
+        return None
+    return SemanticIndex.from_columns(
+        columns,
+        dim=_int_env("SEMANTIC_DIM", 512),
+        title_k=_int_env("SEMANTIC_TITLE_K", 200),
+        title_threshold=_float_env("SEMANTIC_TITLE_THRESHOLD", 0.55),
+        skill_k=_int_env("SEMANTIC_SKILL_K", 8),
+        skill_threshold=_float_env("SEMANTIC_SKILL_THRESHOLD", 0.4),
+    )
@@ -0,0 +1,161 @@
+# app/speculate.py
+# Speculative ranking: rank a session's partial preference while its clarification is pending.
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from time import monotonic
+from typing import Callable, Dict, Optional
+
+from . import job_api
+from .schemas import JobPreference
+
+logger = logging.getLogger(__name__)
+
+# (session_id, partial preference) -> whether a ranking was built
+PrimeFn = Callable[[str, JobPreference], bool]
+
+
+class Speculator:
+    """
+    At most one background job per session on a small thread pool, and at most
+    `max_pending` jobs in total (further submissions are dropped, not queued).
+
+    `submit()` replaces the session's queued job. `claim()` (or `claim_async()` on
+    the event loop) is called by the session's next query: a job that has not
+    started is cancelled (the query does the work itself), a running one is waited
+    for up to `wait` seconds. Jobs that
+    sat in the queue longer than `max_age` are skipped, so abandoned sessions cost
+    nothing beyond their entry in the bounded session rank cache.
+    """
+
+    def __init__(
+        self,
+        fn: PrimeFn,
+        workers: int = 2,
+        max_pending: int = 64,
+        max_age: float = 30.0,
+        wait: float = 0.25,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self._fn = fn
+        self._workers = workers
+        self._max_pending = max_pending
+        self._max_age = max_age
+        self._wait = wait
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, "Future[None]"] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.counts = {k: 0 for k in ("submitted", "dropped", "done", "skipped", "expired", "cancelled", "late", "errors")}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def _run(self, session_id: str, pref: JobPreference, submitted: float) -> None:
+        if self._clock() - submitted > self._max_age:
+            self._count("expired")
+            return
+        try:
+            built = self._fn(session_id, pref)
+        except Exception:
+            logger.exception("speculative ranking failed")
+            self._count("errors")
+            return
+        self._count("done" if built else "skipped")
+
+    def _forget(self, session_id: str, fut: "Future[None]") -> None:
+        with self._lock:
+            if self._jobs.get(session_id) is fut:
+                del self._jobs[session_id]
+
+    def submit(self, session_id: str, pref: JobPreference) -> bool:
+        """Queue a ranking of `pref` for the session; False if the pool is saturated."""
+        with self._lock:
+            old = self._jobs.pop(session_id, None)
+            if old is not None and old.cancel():
+                self.counts["cancelled"] += 1
+            if len(self._jobs) >= self._max_pending:
+                self.counts["dropped"] += 1
+                return False
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="speculate")
+            fut = self._pool.submit(self._run, session_id, pref, self._clock())
+            self._jobs[session_id] = fut
+            self.counts["submitted"] += 1
+        # Outside the lock: the callback runs at once if the job already finished
+        fut.add_done_callback(lambda f: self._forget(session_id, f))
+        return True
+
+    def _take(self, session_id: str) -> "Optional[Future[None]]":
+        """The session's job if it is already running; a queued one is cancelled."""
+        with self._lock:
+            fut = self._jobs.pop(session_id, None)
+        if fut is not None and fut.cancel():
+            self._count("cancelled")
+            return None
+        return fut
+
+    def claim(self, session_id: str) -> None:
+        """Before the session's own query: cancel its queued job or briefly wait for a running one."""
+        fut = self._take(session_id)
+        if fut is None:
+            return
+        try:
+            fut.result(timeout=self._wait)
+        except FutureTimeout:
+            self._count("late")
+        except CancelledError:
+            # shutdown() got to it first
+            self._count("cancelled")
+
+    async def claim_async(self, session_id: str) -> None:
+        """`claim` for the event loop: the wait does not block other requests."""
+        fut = self._take(session_id)
+        if fut is None:
+            return
+        try:
+            # shield: timing out stops the wait, not the job
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(fut)), self._wait)
+        except asyncio.TimeoutError:
+            self._count("late")
+        except asyncio.CancelledError:
+            if not fut.cancelled():
+                raise
+            self._count("cancelled")
+
+    def shutdown(self) -> None:
+        """Drop queued jobs and stop the pool (running jobs finish in the background)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._jobs.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": len(self._jobs), **self.counts}
+
+
+def make_speculator_from_env() -> Optional[Speculator]:
+    """
+    SPECULATE_WORKERS=N (default 0, off) ranks partial preferences on N threads.
+    That uses CPU left idle while users answer; on a saturated CPU it competes
+    with live turns, hence opt-in. SPECULATE_MAX_PENDING, SPECULATE_MAX_AGE_SECONDS,
+    SPECULATE_WAIT_SECONDS and SPECULATE_MAX_ROWS (largest candidate set worth
+    ranking ahead of time) bound the work.
+    """
+    workers = int(os.getenv("SPECULATE_WORKERS", "0"))
+    if workers <= 0:
+        return None
+    max_rows = int(os.getenv("SPECULATE_MAX_ROWS", "50000"))
+    return Speculator(
+        lambda session_id, pref: job_api.prime_session_ranking(session_id, pref, max_rows),
+        workers=workers,
+        max_pending=int(os.getenv("SPECULATE_MAX_PENDING", "64")),
+        max_age=float(os.getenv("SPECULATE_MAX_AGE_SECONDS", "30")),
+        wait=float(os.getenv("SPECULATE_WAIT_SECONDS", "0.25")),
+    )
@@ -0,0 +1,72 @@
+# app/startup.py
+# Startup warm-up (catalog, index, fallback matcher, prompt) and the readiness it reports.
+
+import logging
+import os
+import threading
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+from . import catalog, fallback_parser, llm
+
+logger = logging.getLogger(__name__)
+
+
+class WarmUp:
+    """
+    Builds what the first request would otherwise pay for. State goes
+    pending -> running -> done | failed; `ready` also needs a live catalog,
+    so a later successful reload recovers from a failed warm-up.
+    """
+
+    def __init__(self):
+        self.state = "pending"
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def run(self) -> None:
+        with self._lock:
+            if self.state == "running":
+                return
+            self.state = "running"
+        t0 = perf_counter()
+        try:
+            catalog.current()
+            fallback_parser.get_parser()
+            llm.warm_up()
+        except Exception as e:
+            logger.exception("warm-up failed")
+            self.error, self.state = repr(e), "failed"
+        else:
+            self.state = "done"
+        self.seconds = round(perf_counter() - t0, 3)
+
+    def start(self, background: bool) -> None:
+        if background:
+            threading.Thread(target=self.run, name="warm-up", daemon=True).start()
+        else:
+            self.run()
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("done", "failed") and catalog.loaded() is not None
+
+    def status(self) -> Dict[str, Any]:
+        cat = catalog.loaded()
+        return {
+            "ready": self.ready,
+            "warmup": self.state,
+            "warmup_seconds": self.seconds,
+            "error": self.error,
+            "catalog": {"jobs": len(cat), "version": cat.version} if cat is not None else None,
+            "llm": "configured" if llm.llm_configured() else "fallback-only",
+        }
+
+
+def background_warm_up() -> bool:
+    """CATALOG_BACKGROUND_LOAD=1: accept traffic at once and warm up in a thread (see /ready)."""
+    return os.getenv("CATALOG_BACKGROUND_LOAD", "0") in ("1", "true", "yes")
+
+
+warm_up = WarmUp()
@@ -15,6 +15,10 @@ _LOC_ALIASES = {
 
 _EMPLOYMENT_TYPES = {"full-time", "part-time", "intern", "contract", "temporary"}
 
+_SALARY_NUMBER = re.compile(r"\$?\s*([0-9]+\.?[0-9]*)(k)?")
+_HOUR_UNIT = re.compile(r"hour|hr")
+_YEAR_UNIT = re.compile(r"/yr|year|annum|annual")
+
 
 def normalize_text(s: Optional[str]) -> Optional[str]:
     if not s:
@@ -55,14 +59,15 @@ def parse_salary_span(text: Optional[str]) -> Tuple[Optional[int], Optional[int]
     if not text:
         return None, None, None
     t = text.lower().replace(",", "")
-    unit = None
-    if "/hr" in t or "/hour" in t or "hour" in t or "hr" in t:
+    if _HOUR_UNIT.search(t):
         unit = "hour"
-    if "/yr" in t or "/year" in t or "year" in t or "annum" in t or "annual" in t:
-        unit = "year" if unit is None else unit
+    elif _YEAR_UNIT.search(t):
+        unit = "year"
+    else:
+        unit = None
 
     # capture two numbers
-    nums = re.findall(r"\$?\s*([0-9]+\.?[0-9]*)(k)?", t)
+    nums = _SALARY_NUMBER.findall(t)
     values = []
     for n, kflag in nums:
         val = float(n)
@@ -0,0 +1,64 @@
+# bench/batch_parse.py
+# Batched vs one-call-per-utterance intent parsing against the local stub LLM.
+#
+#   python -m bench.batch_parse --utterances 200 --batch-size 8
+#
+# Prompt characters stand in for input tokens (cost); the stub charges
+# --item-latency per answered message to model output-token generation.
+
+import argparse
+import asyncio
+import os
+import time
+
+from .stub_llm import StubLLMServer
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Batched vs per-utterance intent parsing benchmark")
+    ap.add_argument("--utterances", type=int, default=200)
+    ap.add_argument("--batch-size", type=int, default=8)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--llm-latency", type=float, default=0.3)
+    ap.add_argument("--item-latency", type=float, default=0.02)
+    args = ap.parse_args()
+
+    with StubLLMServer(latency=args.llm_latency, item_latency=args.item_latency) as stub:
+        os.environ.update(OPENAI_API_KEY="sk-bench", OPENAI_BASE_URL=stub.base_url, PARSE_CACHE_SIZE="0")
+        from app import llm
+
+        utts = [f"data analyst intern in the bay area, transcript #{i}" for i in range(args.utterances)]
+
+        async def singles():
+            sem = asyncio.Semaphore(args.concurrency)
+
+            async def one(u):
+                async with sem:
+                    return await llm.parse_intent_async(u)
+
+            return await asyncio.gather(*(one(u) for u in utts))
+
+        async def compare():
+            # One event loop for both runs: the async client's connections are bound to it
+            for label, run in (
+                ("single", singles),
+                ("batch", lambda: llm.parse_intents_batch_async(utts, args.batch_size, args.concurrency)),
+            ):
+                before = stub.stats()
+                t0 = time.perf_counter()
+                prefs = await run()
+                elapsed = time.perf_counter() - t0
+                after = stub.stats()
+                calls = after["calls"] - before["calls"]
+                chars = after["prompt_chars"] - before["prompt_chars"]
+                fallbacks = sum(p.notes == "parsed by offline fallback" for p in prefs)
+                print(
+                    f"{label:>6}: {len(utts) / elapsed:7.1f} utt/s, {calls} LLM calls, "
+                    f"{chars / len(utts):6.0f} prompt chars/utt, fallbacks={fallbacks}"
+                )
+
+        asyncio.run(compare())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench/cold_start.py
+# Worker cold start: fresh interpreters timing `import app.main` and the startup warm-up.
+#
+#   python -m bench.cold_start --runs 10
+#   python -X importtime -c "import app.main" 2>&1 | sort -t'|' -k2 -n | tail   # where it goes
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from app import startup
+startup.warm_up.run()
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1e3, "ready_ms": (t2 - t0) * 1e3, "state": startup.warm_up.state}))
+"""
+
+
+def probe(env: Dict[str, str] = None) -> Dict[str, float]:
+    """One fresh interpreter: ms to import the app, and to import plus warm up."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=ROOT, env={**os.environ, **(env or {})},
+        capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    if result.pop("state") != "done":
+        raise RuntimeError(f"warm-up did not finish: {out.stderr[-2000:]}")
+    return result
+
+
+def _stage(samples: List[float]) -> Dict[str, float]:
+    """Same shape as bench.suite stages, so cold start rides along in baselines."""
+    ms = np.array(samples)
+    return {
+        "n": len(samples),
+        "ops_per_s": round(1e3 / float(ms.mean()), 2),
+        "p50_us": round(float(np.percentile(ms, 50)) * 1e3, 1),
+        "p99_us": round(float(np.percentile(ms, 99)) * 1e3, 1),
+    }
+
+
+def measure(runs: int = 5, env: Dict[str, str] = None) -> Dict[str, Dict[str, float]]:
+    results = [probe(env) for _ in range(runs)]
+    return {
+        "cold_import": _stage([r["import_ms"] for r in results]),
+        "cold_ready": _stage([r["ready_ms"] for r in results]),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Cold-start timing for app.main")
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--catalog", type=Path, help="JOB_CATALOG_PATH for the warm-up")
+    args = ap.parse_args()
+    env = {"JOB_CATALOG_PATH": str(args.catalog)} if args.catalog else None
+    for name, r in measure(args.runs, env).items():
+        print(f"{name:<12} p50={r['p50_us'] / 1e3:.0f} ms  p99={r['p99_us'] / 1e3:.0f} ms  (n={r['n']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# bench/fallback_parse.py
+# Microbenchmark: per-utterance cost of the offline fallback parser.
+#
+#   python -m bench.fallback_parse --iterations 20000
+#
+# "scan" is the single-pass phrase matcher; "naive" runs one `in` check per
+# vocabulary phrase over the same vocabulary, which is what the old per-list
+# substring loops grow into as the vocabulary gets bigger.
+
+import argparse
+import time
+from typing import Callable, List
+
+from app import catalog
+from app.fallback_parser import FallbackParser, build_matcher, load_vocabulary, tokenize
+
+UTTERANCES = [
+    "Looking for a Data Analyst role in the Bay Area at a startup, remote OK, $35/hr+",
+    "senior MLE in SF, full time, fintech, PyTorch + Kubernetes + Postgres, $150k-$180k/yr",
+    "any NLP engineer internships? I know python, transformers and huggingface",
+    "I want something remote, maybe data engineering with airflow, dbt and snowflake",
+    "hi",
+    "Product manager in New York City, healthcare or edtech, 140k per year",
+]
+
+
+def _naive(phrases: List[str]) -> Callable[[str], List[str]]:
+    def parse(utterance: str) -> List[str]:
+        u = utterance.lower()
+        return [p for p in phrases if p in u]
+
+    return parse
+
+
+def _time(fn: Callable[[str], object], iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(UTTERANCES[i % len(UTTERANCES)])
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Offline fallback parser microbenchmark")
+    ap.add_argument("--iterations", type=int, default=20_000)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    matcher = build_matcher(load_vocabulary(), catalog.current())
+    print(f"built matcher: {len(matcher)} phrases in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    parser = FallbackParser(matcher)
+    for label, fn in (
+        ("tokenize", tokenize),
+        ("scan", lambda u: list(matcher.scan(u))),
+        ("parse", parser.parse),
+        ("naive", _naive(matcher.phrases())),
+    ):
+        print(f"{label:>8}: {_time(fn, args.iterations) * 1e6:7.2f} us/utterance")
+
+
+if __name__ == "__main__":
+    main()
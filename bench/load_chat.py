@@ -0,0 +1,58 @@
+# bench/load_chat.py
+# Load test: sync (threadpool) vs async /chat against a local stub LLM.
+#
+#   python -m bench.load_chat --requests 400 --llm-latency 0.2
+
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from .stub_llm import StubLLMServer
+
+
+async def _fire(app, n: int, label: str) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        t0 = time.perf_counter()
+        resps = await asyncio.gather(
+            *[
+                c.post("/chat", json={"session_id": f"{label}-{i}", "user_utterance": f"data analyst roles #{i}"})
+                for i in range(n)
+            ]
+        )
+        elapsed = time.perf_counter() - t0
+    errors = sum(r.status_code != 200 for r in resps)
+    print(f"{label:>5}: {n} requests in {elapsed:.2f}s -> {n / elapsed:.0f} req/s, errors={errors}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Sync (threadpool) vs async /chat load test")
+    ap.add_argument("--requests", type=int, default=400)
+    ap.add_argument("--llm-latency", type=float, default=0.2)
+    args = ap.parse_args()
+
+    with StubLLMServer(latency=args.llm_latency) as stub:
+        # Must be set before app.llm builds its clients; distinct utterances + no cache
+        os.environ.update(OPENAI_API_KEY="sk-bench", OPENAI_BASE_URL=stub.base_url, PARSE_CACHE_SIZE="0")
+        from fastapi import FastAPI
+        from app.main import app as async_app
+        from app.orchestrator import handle_chat
+        from app.schemas import ChatTurn
+
+        sync_app = FastAPI()
+
+        @sync_app.post("/chat")
+        def chat(turn: ChatTurn):
+            return handle_chat(turn)
+
+        print(f"stub LLM latency {args.llm_latency * 1000:.0f} ms")
+        asyncio.run(_fire(sync_app, args.requests, "sync"))
+        asyncio.run(_fire(async_app, args.requests, "async"))
+        print(f"stub LLM calls: {stub.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# bench/replay.py
+# Open-loop replay of captured /chat traffic against the app, with a stub LLM.
+#
+#   python -m bench.synth trace 200 /tmp/trace.jsonl --duration 60
+#   python -m bench.replay /tmp/trace.jsonl --speed 4 --llm-latency 0.3     # app in-process
+#   python -m bench.replay /tmp/trace.jsonl --uvicorn                        # app in a local uvicorn
+#   python -m bench.replay /tmp/trace.jsonl --url http://127.0.0.1:8000      # already running server
+#
+# Trace lines are {"ts": seconds, "session_id": ..., "user_utterance": ...}; only
+# differences between timestamps matter, so epoch or relative times both work.
+# Turns are sent at their recorded offset divided by --speed whether or not the
+# server keeps up (open loop); only a session's own next turn waits for its reply.
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+import numpy as np
+
+from .stub_llm import StubLLMServer
+
+
+@dataclass
+class TraceTurn:
+    at: float
+    session_id: str
+    user_utterance: str
+
+
+@dataclass
+class Result:
+    session_id: str
+    scheduled: float
+    sent: float
+    done: float
+    status: int  # 0 when the request failed at the transport level
+
+
+def load_trace(path: Path) -> List[TraceTurn]:
+    """Trace turns sorted by time, offsets relative to the first one."""
+    from app.schemas import ChatTurn
+
+    turns: List[TraceTurn] = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+                turn = ChatTurn(session_id=rec["session_id"], user_utterance=rec["user_utterance"])
+                turns.append(TraceTurn(float(rec["ts"]), turn.session_id, turn.user_utterance))
+            except (ValueError, TypeError, KeyError) as e:
+                raise ValueError(f"{path}:{lineno}: not a trace record ({e!r})") from None
+    if not turns:
+        raise ValueError(f"{path}: empty trace")
+    base = min(t.at for t in turns)
+    for t in turns:
+        t.at -= base
+    turns.sort(key=lambda t: t.at)
+    return turns
+
+
+async def replay(
+    client: httpx.AsyncClient, trace: List[TraceTurn], speed: float = 1.0, timeout: float = 30.0
+) -> List[Result]:
+    """Send every turn to /chat on schedule; one task per session keeps its turns in order."""
+    sessions: Dict[str, List[TraceTurn]] = {}
+    for t in trace:
+        sessions.setdefault(t.session_id, []).append(t)
+    results: List[Result] = []
+    start = time.perf_counter()
+
+    async def run_session(turns: List[TraceTurn]) -> None:
+        for t in turns:
+            scheduled = t.at / speed
+            delay = start + scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            sent = time.perf_counter() - start
+            try:
+                resp = await client.post(
+                    "/chat", json={"session_id": t.session_id, "user_utterance": t.user_utterance}, timeout=timeout
+                )
+                status = resp.status_code
+            except httpx.HTTPError:
+                status = 0
+            results.append(Result(t.session_id, scheduled, sent, time.perf_counter() - start, status))
+
+    await asyncio.gather(*(run_session(turns) for turns in sessions.values()))
+    return results
+
+
+def _ms(values: np.ndarray, q: float) -> float:
+    return round(float(np.percentile(values, q)) * 1e3, 1) if len(values) else 0.0
+
+
+def report(results: List[Result]) -> Dict[str, Any]:
+    """Throughput, latency percentiles, error rate and schedule lag (send time minus planned time)."""
+    ok = [r for r in results if r.status == 200]
+    latency = np.array([r.done - r.sent for r in ok])
+    lag = np.array([r.sent - r.scheduled for r in results])
+    elapsed = max((r.done for r in results), default=0.0)
+    span = max((r.scheduled for r in results), default=0.0)
+    return {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "error_rate": round((len(results) - len(ok)) / len(results), 4) if results else 0.0,
+        "elapsed_s": round(elapsed, 2),
+        "offered_rps": round(len(results) / span, 1) if span > 0 else None,
+        "throughput_rps": round(len(ok) / elapsed, 1) if elapsed > 0 else None,
+        "latency_ms": {"p50": _ms(latency, 50), "p90": _ms(latency, 90), "p99": _ms(latency, 99),
+                       "max": round(float(latency.max()) * 1e3, 1) if len(latency) else 0.0},
+        "lag_ms": {"p50": _ms(lag, 50), "p99": _ms(lag, 99)},
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def _uvicorn(env: Dict[str, str], workers: int) -> Iterator[str]:
+    """The app under a local uvicorn child process; yields its base URL."""
+    port = _free_port()
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, env={**os.environ, **env})
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                httpx.get(f"{url}/health")
+                break
+            except httpx.TransportError:
+                if time.time() > deadline or proc.poll() is not None:
+                    raise RuntimeError("uvicorn did not start")
+                time.sleep(0.1)
+        yield url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def _print(r: Dict[str, Any]) -> None:
+    lat, lag = r["latency_ms"], r["lag_ms"]
+    print(f"requests={r['requests']} errors={r['errors']} ({r['error_rate']:.2%}) elapsed={r['elapsed_s']}s")
+    print(f"offered={r['offered_rps']} req/s  throughput={r['throughput_rps']} req/s")
+    print(f"latency ms: p50={lat['p50']} p90={lat['p90']} p99={lat['p99']} max={lat['max']}")
+    print(f"schedule lag ms: p50={lag['p50']} p99={lag['p99']}")
+
+
+async def _run(base_url: Optional[str], trace: List[TraceTurn], speed: float, timeout: float) -> List[Result]:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    if base_url is not None:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as c:
+            return await replay(c, trace, speed, timeout)
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://replay") as c:
+        return await replay(c, trace, speed, timeout)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Replay a /chat trace open-loop")
+    ap.add_argument("trace", type=Path)
+    ap.add_argument("--speed", type=float, default=1.0, help="rate multiplier (2 = twice as fast)")
+    ap.add_argument("--llm-latency", type=float, default=0.2, help="stub LLM seconds per call")
+    ap.add_argument("--timeout", type=float, default=30.0)
+    target = ap.add_mutually_exclusive_group()
+    target.add_argument("--uvicorn", action="store_true", help="serve the app from a local uvicorn")
+    target.add_argument("--url", help="replay against a running server (its own LLM config applies)")
+    ap.add_argument("--workers", type=int, default=1, help="uvicorn workers with --uvicorn")
+    ap.add_argument("--json", type=Path, help="also write the report here")
+    args = ap.parse_args()
+
+    trace = load_trace(args.trace)
+    print(f"{len(trace)} turns, {len({t.session_id for t in trace})} sessions, "
+          f"{trace[-1].at / args.speed:.1f}s at speed x{args.speed}")
+    if args.url:
+        results = asyncio.run(_run(args.url, trace, args.speed, args.timeout))
+        stub_calls = None
+    else:
+        with StubLLMServer(latency=args.llm_latency) as stub:
+            # Distinct utterances should reach the stub: no parse cache
+            env = {"OPENAI_API_KEY": "sk-replay", "OPENAI_BASE_URL": stub.base_url, "PARSE_CACHE_SIZE": "0"}
+            if args.uvicorn:
+                with _uvicorn(env, args.workers) as url:
+                    results = asyncio.run(_run(url, trace, args.speed, args.timeout))
+            else:
+                # Must be set before app.llm builds its clients
+                os.environ.update(env)
+                results = asyncio.run(_run(None, trace, args.speed, args.timeout))
+            stub_calls = stub.calls
+
+    r = report(results)
+    r["meta"] = {"trace": str(args.trace), "speed": args.speed, "llm_latency": args.llm_latency,
+                 "target": args.url or ("uvicorn" if args.uvicorn else "in-process"), "stub_llm_calls": stub_calls}
+    _print(r)
+    if args.json:
+        args.json.write_text(json.dumps(r, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
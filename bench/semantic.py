@@ -0,0 +1,106 @@
+# bench/semantic.py
+# Ranking quality vs. latency, exact matching vs. the semantic title/skill index.
+# Queries are paraphrases and abbreviations of the synthetic catalog's seed titles
+# and skill concepts; a job is relevant if its seed title (or a skill) is in the
+# query's target set.
+#
+#   python -m bench.semantic --jobs 100000 --iterations 500
+
+import argparse
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app import job_api
+from app.catalog import Catalog
+from app.schemas import JobPreference
+from app.semantic import SemanticIndex
+
+from .suite import _time
+from .synth import SEED_JOBS, generate_jobs
+
+# (preference, seed titles that count as relevant, skills that count as relevant)
+QUERIES: List[Tuple[JobPreference, Set[str], Set[str]]] = [
+    (JobPreference(role="ML Engineer"), {"Machine Learning Engineer"}, set()),
+    (JobPreference(role="MLE"), {"Machine Learning Engineer"}, set()),
+    (JobPreference(role="NLP Data Scientist"), {"Data Scientist (NLP)"}, set()),
+    (JobPreference(role="Natural Language Processing Engineer"), {"NLP Engineer"}, set()),
+    (JobPreference(role="Large Language Model Engineer"), {"LLM Engineer", "LLM Platform Engineer"}, set()),
+    (JobPreference(role="GenAI Engineer"), {"Generative AI Engineer"}, set()),
+    (JobPreference(role="CV Engineer"), {"Computer Vision Engineer"}, set()),
+    (JobPreference(role="BI Analyst"), {"Data Analyst (BI)", "Business Data Analyst"}, set()),
+    (JobPreference(role="Quantitative Researcher"), {"Quant Researcher"}, set()),
+    (JobPreference(role="DS Intern"), {"Data Scientist Intern"}, set()),
+    (JobPreference(role="Analytics Engineering"), {"Analytics Engineer"}, set()),
+    (JobPreference(role="Data Analyst"), {"Data Analyst"}, set()),
+    (JobPreference(skills=["deep learning"]), set(), {"pytorch", "tensorflow", "keras", "jax"}),
+    (JobPreference(skills=["data visualization"]), set(), {"tableau", "powerbi", "looker"}),
+    (JobPreference(skills=["cloud"]), set(), {"aws", "gcp", "azure"}),
+    (JobPreference(role="ML Engineer", skills=["deep learning"], remote=True),
+     {"Machine Learning Engineer"}, {"pytorch", "tensorflow", "keras", "jax"}),
+]
+
+
+def _relevant(cat: Catalog, titles: Set[str], skills: Set[str]) -> np.ndarray:
+    """Relevance per row: its seed title is a target, or it has a target skill."""
+    seed_titles = np.array([j["title"] for j in SEED_JOBS])
+    out = np.isin(seed_titles[np.arange(len(cat)) % len(seed_titles)], list(titles))
+    for sk in skills:
+        sid = cat.columns.skill_id(sk)
+        if sid is not None:
+            out[cat.columns.rows_for_skill(sid)] = True
+    return out
+
+
+def quality(cat: Catalog, k: int = 10) -> Dict[str, float]:
+    """Mean precision@k and reciprocal rank of the first relevant job over QUERIES."""
+    precision, rr = [], []
+    for pref, titles, skills in QUERIES:
+        rel = _relevant(cat, titles, skills)
+        top = [row for _, row in job_api._rank(cat, pref, k)]
+        precision.append(sum(rel[r] for r in top) / k)
+        first = next((i for i, r in enumerate(top) if rel[r]), None)
+        rr.append(0.0 if first is None else 1.0 / (first + 1))
+    return {f"p@{k}": round(float(np.mean(precision)), 3), "mrr": round(float(np.mean(rr)), 3)}
+
+
+def run(n_jobs: int, iterations: int, dim: int = 512) -> Dict[str, Dict[str, Any]]:
+    cat = Catalog.from_jobs(generate_jobs(n_jobs))
+    t0 = time.perf_counter()
+    index = SemanticIndex.from_columns(cat.columns, dim=dim)
+    build = time.perf_counter() - t0
+    prefs = [pref for pref, _, _ in QUERIES]
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for mode, sem in (("exact", None), ("semantic", index)):
+        cat.columns.semantic = sem
+        r: Dict[str, Any] = quality(cat)
+        r.update(_time(lambda p: job_api._rank(cat, p, 10), prefs, iterations))
+        out[mode] = r
+    # First sight of a query text: vectorize it and scan every title/skill vector
+    fresh = [f"{p.role or ''} {i}" for i, p in enumerate(prefs * (iterations // len(prefs) + 1))][:iterations]
+    out["semantic"]["retrieval"] = _time(index.similar_titles, fresh, iterations)
+    out["semantic"]["index"] = {**index.stats(), "build_seconds": round(build, 3)}
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Exact vs. semantic matching: quality and latency")
+    ap.add_argument("--jobs", type=int, default=100_000)
+    ap.add_argument("--iterations", type=int, default=500)
+    ap.add_argument("--dim", type=int, default=512)
+    args = ap.parse_args(argv)
+    res = run(args.jobs, args.iterations, args.dim)
+    print(f"{'mode':<10}{'p@10':>8}{'mrr':>8}{'rank p50 us':>14}{'rank p99 us':>14}")
+    for mode in ("exact", "semantic"):
+        r = res[mode]
+        print(f"{mode:<10}{r['p@10']:>8.3f}{r['mrr']:>8.3f}{r['p50_us']:>14.1f}{r['p99_us']:>14.1f}")
+    ret, ix = res["semantic"]["retrieval"], res["semantic"]["index"]
+    print(f"uncached title retrieval: p50 {ret['p50_us']:.1f} us, p99 {ret['p99_us']:.1f} us")
+    print(f"index: {ix['titles']} titles, {ix['skills']} skills, dim {ix['dim']}, "
+          f"{ix['bytes'] / 2**20:.1f} MiB, built in {ix['build_seconds']} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# bench/serialization.py
+# Response serialization, old path (model_dump + jsonable_encoder) vs. pydantic-core bytes
+# and per-job fragments. Reports throughput and peak allocation per operation.
+#
+#   python -m bench.serialization --jobs 10000 --iterations 2000
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import httpx
+from fastapi import FastAPI, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+from app import catalog, fallback_parser, job_api
+from app.memory import ShardedSessionStore
+from app.render import JobFragments
+from app.schemas import ChatResponse, JobPreference, MatchItem
+
+from .suite import _time
+from .synth import generate_utterances, write_jobs
+
+
+def _legacy_json(content: Any) -> bytes:
+    """What FastAPI does with a returned dict/model: jsonable_encoder, then json.dumps."""
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def _legacy_item(job: dict, reasons: List[str], score: float) -> MatchItem:
+    sr = job.get("salary_min"), job.get("salary_max"), job.get("salary_unit", "year")
+    return MatchItem(
+        job_id=job["job_id"], title=job["title"], company=job["company"], location=job["location"],
+        salary_range=f"{sr[0]}–{sr[1]} / {sr[2]}" if sr[0] and sr[1] else None,
+        domain=job.get("domain"), reasons=reasons, score=score,
+    )
+
+
+def peak_bytes(fn: Callable[[Any], Any], inputs: List[Any], iterations: int) -> int:
+    """Mean peak of traced allocations during one call."""
+    tracemalloc.start()
+    try:
+        total = 0
+        for i in range(iterations):
+            x = inputs[i % len(inputs)]
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(x)
+            total += tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return total // iterations
+
+
+def _legacy_app() -> FastAPI:
+    legacy = FastAPI()
+
+    @legacy.post("/mock/jobs")
+    def mock_jobs(pref: JobPreference, limit: int = Query(10, ge=1, le=100), offset: int = Query(0, ge=0)):
+        items, _ = job_api.query_page(pref, limit=limit, offset=offset)
+        return [m.model_dump() for m in items]
+
+    return legacy
+
+
+async def _http(app: FastAPI, bodies: List[dict], n: int) -> float:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as c:
+        t0 = time.perf_counter()
+        for i in range(n):
+            r = await c.post("/mock/jobs?limit=20", json=bodies[i % len(bodies)])
+            r.raise_for_status()
+        return n / (time.perf_counter() - t0)
+
+
+def run(n_jobs: int, iterations: int) -> Dict[str, Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "jobs.jcat"
+        write_jobs(n_jobs, Path(tmp) / "jobs.ndjson", binary=path)
+        cat = catalog.reload(path)
+
+    prefs = [fallback_parser.parse(u) for u in generate_utterances(200)]
+    for p in prefs:
+        job_api.query_page(p, limit=20)
+        job_api.query_page_json(p, limit=20)
+    pages = [job_api.query_page(p, limit=20)[0] for p in prefs]
+    # (row, job, reasons, score): item construction only, the job lookup and reasons are shared
+    rows = [
+        (r, cat.jobs[r], job_api.reasons(p, cat.jobs[r]), sc)
+        for p in prefs[:50]
+        for sc, r in job_api._rank(cat, job_api.canonical_preference(p), 10)
+    ]
+    frags = JobFragments(cat.jobs)
+    store = ShardedSessionStore()
+    updates = [(f"s{i % 100}", p) for i, p in enumerate(prefs)]
+    chat_responses = [
+        ChatResponse(assistant_reply="Here are the top matches", parsed_preferences=p, top_matches=page[:10])
+        for p, page in zip(prefs, pages)
+    ]
+
+    cases: Dict[str, Dict[str, Callable[[Any], Any]]] = {
+        "mock_jobs_page": {
+            "legacy": lambda p: _legacy_json([m.model_dump() for m in job_api.query_page(p, limit=20)[0]]),
+            "lean": lambda p: job_api.query_page_json(p, limit=20)[0],
+        },
+        "chat_response": {
+            "legacy": _legacy_json,
+            "lean": to_json,
+        },
+        "match_item": {
+            "legacy": lambda x: _legacy_item(*x[1:]),
+            "lean": lambda x: frags.item(x[0], x[2], x[3]),
+        },
+        "match_item_json": {
+            "legacy": lambda x: _legacy_json(_legacy_item(*x[1:]).model_dump()),
+            "lean": lambda x: frags.item_json(x[0], x[2], x[3]),
+        },
+        "session_merge": {
+            "legacy": lambda u: store.update_preferences(u[0], u[1].model_dump()),
+            "lean": lambda u: store.update_preferences(*u),
+        },
+    }
+    inputs = {"mock_jobs_page": prefs, "chat_response": chat_responses, "match_item": rows, "match_item_json": rows,
+              "session_merge": updates}
+    # The legacy path must produce the same JSON
+    assert _legacy_json(chat_responses[0]) == to_json(chat_responses[0])
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for name, variants in cases.items():
+        for variant, fn in variants.items():
+            r = _time(fn, inputs[name], iterations)
+            r["peak_bytes"] = peak_bytes(fn, inputs[name], min(iterations, 500))
+            out[f"{name}/{variant}"] = r
+    bodies = [p.model_dump() for p in prefs]
+    from app.main import app
+
+    # End to end through FastAPI; interleaved rounds, best of each, since single runs are noisy
+    best = {"legacy": 0.0, "lean": 0.0}
+    for _ in range(3):
+        for variant, target in (("legacy", _legacy_app()), ("lean", app)):
+            best[variant] = max(best[variant], asyncio.run(_http(target, bodies, max(200, iterations // 4))))
+    for variant, rps in best.items():
+        out[f"http_mock_jobs/{variant}"] = {"ops_per_s": round(rps, 1)}
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Response serialization benchmarks")
+    ap.add_argument("--jobs", type=int, default=10_000)
+    ap.add_argument("--iterations", type=int, default=2_000)
+    args = ap.parse_args()
+    print(f"{'case':<26}{'ops/s':>12}{'p50 us':>10}{'p99 us':>10}{'peak KiB':>10}")
+    for name, r in run(args.jobs, args.iterations).items():
+        p50 = f"{r['p50_us']:.2f}" if "p50_us" in r else "-"
+        p99 = f"{r['p99_us']:.2f}" if "p99_us" in r else "-"
+        peak = f"{r['peak_bytes'] / 1024:.1f}" if "peak_bytes" in r else "-"
+        print(f"{name:<26}{r['ops_per_s']:>12,.0f}{p50:>10}{p99:>10}{peak:>10}")
+
+
+if __name__ == "__main__":
+    main()
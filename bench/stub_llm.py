@@ -0,0 +1,128 @@
+# bench/stub_llm.py
+# Local OpenAI-compatible chat-completions server with configurable latency.
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+DEFAULT_REPLY = {
+    "role": "Data Analyst",
+    "location": "bay area",
+    "salary_min": 30,
+    "salary_max": 45,
+    "salary_unit": "hour",
+    "employment_type": "intern",
+    "domain": "startup",
+    "seniority": "intern",
+    "remote": True,
+    "skills": ["sql", "python", "tableau"],
+    "notes": None,
+}
+
+
+def make_app(latency: float = 0.2, reply: dict = DEFAULT_REPLY, item_latency: float = 0.0) -> FastAPI:
+    """
+    `latency` per request plus `item_latency` per answered message (output tokens).
+    Batch prompts (a "Messages:" list, see llm._batch_prompt) get one keyed reply per message.
+    """
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.prompt_chars = 0
+
+    @app.post("/v1/chat/completions")
+    async def completions(body: dict):
+        prompt = body["messages"][-1]["content"]
+        app.state.calls += 1
+        app.state.prompt_chars += len(prompt)
+        if "Messages:\n" in prompt:
+            n = len(prompt.split("Messages:\n", 1)[1].splitlines())
+            content = json.dumps({str(i): reply for i in range(1, n + 1)})
+        else:
+            n, content = 1, json.dumps(reply)
+        await asyncio.sleep(latency + item_latency * n)
+        return {
+            "id": "stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    @app.get("/stats")
+    def stats():
+        return {"calls": app.state.calls, "prompt_chars": app.state.prompt_chars}
+
+    return app
+
+
+class StubLLMServer:
+    """
+    Run the stub in a child process (so it does not compete with the app under test
+    for the GIL); `base_url` is OpenAI-compatible.
+    """
+
+    def __init__(self, latency: float = 0.2, item_latency: float = 0.0):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self._cmd = [
+            sys.executable, "-m", "bench.stub_llm", "--port", str(self.port),
+            "--latency", str(latency), "--item-latency", str(item_latency),
+        ]
+        self._proc: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    @property
+    def calls(self) -> int:
+        return self.stats()["calls"]
+
+    def stats(self) -> dict:
+        return httpx.get(f"http://127.0.0.1:{self.port}/stats").json()
+
+    def __enter__(self) -> "StubLLMServer":
+        self._proc = subprocess.Popen(self._cmd)
+        deadline = time.time() + 15
+        while time.time() < deadline:
+            try:
+                httpx.get(f"http://127.0.0.1:{self.port}/stats")
+                return self
+            except httpx.TransportError:
+                time.sleep(0.05)
+        self.__exit__()
+        raise RuntimeError("stub LLM server did not start")
+
+    def __exit__(self, *exc) -> None:
+        if self._proc is not None:
+            self._proc.terminate()
+            self._proc.wait(timeout=5)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Stub OpenAI chat-completions server")
+    ap.add_argument("--port", type=int, default=8900)
+    ap.add_argument("--latency", type=float, default=0.2)
+    ap.add_argument("--item-latency", type=float, default=0.0)
+    args = ap.parse_args()
+    uvicorn.run(make_app(args.latency, item_latency=args.item_latency), host="127.0.0.1", port=args.port, log_level="warning", backlog=4096)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# bench/suite.py
+# Benchmark suite for the chat and matching hot paths (LLM stubbed out).
+#
+#   python -m bench.suite --jobs 10000                       # run and print
+#   python -m bench.suite --jobs 10000 --save                # write bench/baselines/10000.json
+#   python -m bench.suite --jobs 10000 --compare             # exit 1 on regressions vs. that baseline
+#
+# Each stage is timed per operation; the report has throughput, p50 and p99.
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app import catalog, fallback_parser, job_api, llm, orchestrator
+from app.match_cache import MatchCache, canonical_preference
+from app.memory import ShardedSessionStore
+from app.rerank import SessionRankCache
+from app.schemas import ChatTurn, JobPreference
+from app.utils import parse_salary_span
+
+from . import cold_start
+from .synth import generate_utterances, write_jobs
+
+BASELINES = Path(__file__).resolve().parent / "baselines"
+
+
+def _time(fn: Callable[[Any], Any], inputs: Sequence[Any], iterations: int) -> Dict[str, float]:
+    samples = np.empty(iterations, dtype=np.int64)
+    clock = time.perf_counter_ns
+    for i in range(iterations):
+        x = inputs[i % len(inputs)]
+        t0 = clock()
+        fn(x)
+        samples[i] = clock() - t0
+    total = samples.sum() / 1e9
+    return {
+        "n": iterations,
+        "ops_per_s": round(iterations / total, 1),
+        "p50_us": round(float(np.percentile(samples, 50)) / 1e3, 2),
+        "p99_us": round(float(np.percentile(samples, 99)) / 1e3, 2),
+    }
+
+
+def _time_after(
+    setup: Callable[[Any], Any], fn: Callable[[Any, Any], Any], inputs: Sequence[Any], iterations: int
+) -> Dict[str, float]:
+    """Like `_time`, with an untimed `setup(x)` before each call whose result is passed to `fn`."""
+    samples = np.empty(iterations, dtype=np.int64)
+    clock = time.perf_counter_ns
+    for i in range(iterations):
+        x = inputs[i % len(inputs)]
+        state = setup(x)
+        t0 = clock()
+        fn(state, x)
+        samples[i] = clock() - t0
+    total = samples.sum() / 1e9
+    return {
+        "n": iterations,
+        "ops_per_s": round(iterations / total, 1),
+        "p50_us": round(float(np.percentile(samples, 50)) / 1e3, 2),
+        "p99_us": round(float(np.percentile(samples, 99)) / 1e3, 2),
+    }
+
+
+def _clarified(prefs: Sequence[JobPreference]) -> List[Tuple[JobPreference, JobPreference]]:
+    """(partial, answered) pairs: the answer to a clarification adds the location."""
+    pairs = []
+    for p in prefs:
+        answered = canonical_preference(p.model_copy(update={"location": p.location or "bay area"}))
+        pairs.append((answered.model_copy(update={"location": None}), answered))
+    return pairs
+
+
+def run(n_jobs: int, iterations: int, seed: int = 7, cold_starts: int = 5) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "jobs.jcat"
+        write_jobs(n_jobs, Path(tmp) / "jobs.ndjson", seed, binary=path)
+        cat = catalog.reload(path)
+        # Fresh interpreters: import app.main, then warm up on this catalog
+        cold = cold_start.measure(cold_starts, {"JOB_CATALOG_PATH": str(path)}) if cold_starts > 0 else {}
+
+    utterances = generate_utterances(500, seed)
+    prefs: List[JobPreference] = [fallback_parser.parse(u) for u in utterances]
+    parsed = dict(zip(utterances, prefs))
+    sample_jobs = [cat.jobs[i] for i in range(0, len(cat), max(1, len(cat) // 1000))]
+    pairs = [(prefs[i % len(prefs)], job) for i, job in enumerate(sample_jobs)]
+    store = ShardedSessionStore()
+    updates = [(f"s{i % 200}", p.model_dump()) for i, p in enumerate(prefs)]
+    turns = [ChatTurn(session_id=f"chat{i % 200}", user_utterance=u) for i, u in enumerate(utterances)]
+    clarified = _clarified(prefs)
+
+    def answer(cache: SessionRankCache, pair: Tuple[JobPreference, JobPreference]) -> None:
+        job_api._top_k(*cache.scores("s", cat, pair[1]), 10)
+
+    def primed(pair: Tuple[JobPreference, JobPreference]) -> SessionRankCache:
+        cache = SessionRankCache()
+        cache.prime("s", cat, pair[0], max_rows=len(cat))
+        return cache
+
+    # Stub the LLM: every utterance "parses" instantly to a precomputed preference
+    llm.parse_intent = parsed.__getitem__
+    stages: Dict[str, Callable[[], Dict[str, float]]] = {
+        "parse_salary_span": lambda: _time(parse_salary_span, utterances, iterations),
+        "fallback_parse": lambda: _time(fallback_parser.parse, utterances, iterations),
+        "score_job": lambda: _time(lambda pj: job_api.score_job(*pj), pairs, iterations),
+        "query_top_n": lambda: _time(lambda p: job_api.query_top_n(p, n=10), prefs, max(50, iterations // 20)),
+        # Ranking the answer to a clarification, from scratch vs. after speculative ranking
+        "clarify_answer": lambda: _time_after(lambda _: SessionRankCache(), answer, clarified, max(50, iterations // 20)),
+        "clarify_answer_primed": lambda: _time_after(primed, answer, clarified, max(50, iterations // 20)),
+        "session_update": lambda: _time(lambda u: store.update_preferences(*u), updates, iterations),
+        "handle_chat": lambda: _time(orchestrator.handle_chat, turns, max(50, iterations // 20)),
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for name, stage in stages.items():
+        if name == "query_top_n":
+            # Ranking cost itself; the match cache gets its own stage below
+            job_api._match_cache = None
+            results[name] = stage()
+            job_api._match_cache = MatchCache()
+            job_api.query_top_n(prefs[0], n=10)
+            results["query_top_n_cached"] = _time(lambda p: job_api.query_top_n(p, n=10), prefs[:1], iterations)
+        else:
+            results[name] = stage()
+    results.update(cold)
+    return {
+        "meta": {"jobs": n_jobs, "iterations": iterations, "python": platform.python_version(), "numpy": np.__version__},
+        "stages": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Stages whose p50 or throughput got worse than `tolerance`, p99 than twice that."""
+    problems = []
+    for name, base in baseline["stages"].items():
+        cur = current["stages"].get(name)
+        if cur is None:
+            problems.append(f"{name}: missing from current run")
+            continue
+        if cur["p50_us"] > base["p50_us"] * (1 + tolerance):
+            problems.append(f"{name}: p50 {base['p50_us']} -> {cur['p50_us']} us")
+        if cur["p99_us"] > base["p99_us"] * (1 + 2 * tolerance):
+            problems.append(f"{name}: p99 {base['p99_us']} -> {cur['p99_us']} us")
+        if cur["ops_per_s"] < base["ops_per_s"] / (1 + tolerance):
+            problems.append(f"{name}: throughput {base['ops_per_s']} -> {cur['ops_per_s']} ops/s")
+    return problems
+
+
+def _print(report: Dict[str, Any], baseline: Dict[str, Any] = None) -> None:
+    print(f"jobs={report['meta']['jobs']} iterations={report['meta']['iterations']}")
+    print(f"{'stage':<20}{'ops/s':>12}{'p50 us':>10}{'p99 us':>10}{'vs base p50':>13}")
+    for name, r in report["stages"].items():
+        delta = ""
+        if baseline and name in baseline["stages"]:
+            delta = f"{r['p50_us'] / baseline['stages'][name]['p50_us'] - 1:+.0%}"
+        print(f"{name:<20}{r['ops_per_s']:>12,.0f}{r['p50_us']:>10.2f}{r['p99_us']:>10.2f}{delta:>13}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Chat/matching hot-path benchmarks")
+    ap.add_argument("--jobs", type=int, default=10_000)
+    ap.add_argument("--iterations", type=int, default=2_000)
+    ap.add_argument("--cold-starts", type=int, default=5, help="fresh-interpreter startups to time (0 skips)")
+    ap.add_argument("--save", action="store_true", help="write the baseline for this catalog size")
+    ap.add_argument("--compare", action="store_true", help="fail on regressions against the saved baseline")
+    ap.add_argument("--baseline", type=Path, help="baseline file (default: bench/baselines/<jobs>.json)")
+    # Run-to-run noise on a shared machine is ~20-30%, so only flag clear slowdowns
+    ap.add_argument("--tolerance", type=float, default=0.5)
+    args = ap.parse_args()
+
+    baseline_path = args.baseline or BASELINES / f"{args.jobs}.json"
+    report = run(args.jobs, args.iterations, cold_starts=args.cold_starts)
+    baseline = json.loads(baseline_path.read_text()) if args.compare else None
+    _print(report, baseline)
+
+    if args.save:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"saved {baseline_path}")
+    if baseline is not None:
+        problems = compare(report, baseline, args.tolerance)
+        for p in problems:
+            print(f"REGRESSION {p}")
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# bench/synth.py
+# Synthetic job catalogs (mock_jobs.json scaled to any size) and utterance corpora.
+#
+#   python -m bench.synth jobs 100000 /tmp/jobs.ndjson [--binary /tmp/jobs.jcat]
+#   python -m bench.synth utterances 1000 /tmp/utterances.txt
+#   python -m bench.synth trace 200 /tmp/trace.jsonl --duration 60
+#
+# Output is deterministic for a given --seed, so benchmark runs are comparable.
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.catalog import DEFAULT_PATH, CatalogBuilder
+
+SEED_JOBS: List[Dict[str, Any]] = json.loads(DEFAULT_PATH.read_text(encoding="utf-8"))
+
+TITLE_PREFIXES = ["", "", "", "Senior ", "Junior ", "Lead ", "Staff ", "Associate ", "Principal "]
+TITLE_SUFFIXES = ["", "", "", " Intern", " II", " (Remote)", " (Contract)", " - Platform", " - Growth"]
+LOCATIONS = [
+    "Bay Area", "San Francisco", "SF", "Los Angeles", "LA", "New York", "NYC", "Austin", "Seattle",
+    "Boston", "Chicago", "Denver", "Remote", "Silicon Valley", "San Diego", "Atlanta", "Toronto", "London",
+]
+COMPANY_WORDS = ["Nova", "Quant", "Blue", "Data", "Cloud", "Signal", "Vector", "Bright", "Pixel", "Orbit", "Atlas"]
+COMPANY_KINDS = ["Analytics", "Labs", "AI", "Systems", "Health", "Pay", "Works", "Cloud", "Robotics", "Media"]
+DOMAINS = sorted({j["domain"] for j in SEED_JOBS} | {"gaming", "biotech", "logistics", "insurance"})
+EXTRA_SKILLS = [
+    "spark", "kafka", "snowflake", "bigquery", "looker", "scala", "java", "go", "rust", "react",
+    "docker", "terraform", "gcp", "azure", "tensorflow", "keras", "jax", "numpy", "scikit-learn", "excel",
+]
+SKILLS = sorted({s for j in SEED_JOBS for s in j.get("skills", [])} | set(EXTRA_SKILLS))
+
+
+def generate_jobs(n: int, seed: int = 7) -> Iterator[Dict[str, Any]]:
+    """`n` jobs derived from the seed catalog: varied titles, places, companies, skills and pay."""
+    rng = random.Random(seed)
+    for i in range(n):
+        base = SEED_JOBS[i % len(SEED_JOBS)]
+        title = rng.choice(TITLE_PREFIXES) + base["title"] + rng.choice(TITLE_SUFFIXES)
+        skills = list(base.get("skills", []))
+        skills += rng.sample(SKILLS, rng.randint(0, 4))
+        job = dict(base)
+        job.update(
+            job_id=f"S{i:07d}",
+            title=title,
+            company=f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_KINDS)}",
+            location=rng.choice(LOCATIONS),
+            domain=rng.choice(DOMAINS),
+            remote=rng.random() < 0.35,
+            skills=sorted(set(skills)),
+        )
+        if base.get("salary_min") is not None:
+            scale = rng.uniform(0.75, 1.35)
+            job["salary_min"] = int(base["salary_min"] * scale)
+            job["salary_max"] = int((base.get("salary_max") or base["salary_min"]) * scale)
+        yield job
+
+
+UTTERANCE_TEMPLATES = [
+    "Looking for a {role} role in {loc}, {pay}",
+    "{role} jobs in {loc} with {sk1} and {sk2}",
+    "any {seniority} {role} openings? remote ok, {pay}",
+    "I want a {etype} {role} position at a {domain} company",
+    "{role} in {loc}",
+    "hi, can you help me find something with {sk1}?",
+    "{seniority} {role}, {domain}, {loc}, at least {pay}",
+    "change location to {loc}",
+]
+ROLES = ["Data Analyst", "AI Engineer", "Machine Learning Engineer", "Data Scientist", "NLP Engineer",
+         "Data Engineer", "LLM Engineer", "Analytics Engineer", "MLOps Engineer", "Product Analyst"]
+PAY = ["$120k-$160k per year", "30-45/hr", "$35/hour", "110000/yr", "150k+", "$50/hr"]
+
+
+def generate_utterances(n: int, seed: int = 11) -> List[str]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        sk1, sk2 = rng.sample(SKILLS, 2)
+        out.append(
+            rng.choice(UTTERANCE_TEMPLATES).format(
+                role=rng.choice(ROLES),
+                loc=rng.choice(LOCATIONS),
+                pay=rng.choice(PAY),
+                sk1=sk1,
+                sk2=sk2,
+                seniority=rng.choice(["senior", "junior", "mid-level", "intern", "staff"]),
+                etype=rng.choice(["full-time", "part-time", "contract", "internship"]),
+                domain=rng.choice(DOMAINS),
+            )
+        )
+    return out
+
+
+def generate_trace(
+    sessions: int, duration: float = 60.0, turns: int = 4, think_time: float = 8.0, seed: int = 13
+) -> List[Dict[str, Any]]:
+    """
+    Replay trace (see bench.replay): sessions start uniformly over `duration`
+    seconds, each with 1..`turns` turns separated by exponential think time.
+    Records are {"ts", "session_id", "user_utterance"}, sorted by ts.
+    """
+    rng = random.Random(seed)
+    utterances = generate_utterances(sessions * turns, seed)
+    out = []
+    for s in range(sessions):
+        ts = rng.uniform(0, duration)
+        for t in range(rng.randint(1, turns)):
+            out.append({"ts": round(ts, 3), "session_id": f"trace-{s:05d}", "user_utterance": utterances[s * turns + t]})
+            ts += rng.expovariate(1 / think_time)
+    out.sort(key=lambda r: r["ts"])
+    return out
+
+
+def write_jobs(n: int, path: Path, seed: int = 7, binary: Optional[Path] = None) -> None:
+    """NDJSON to `path` (streamed), and optionally a memory-mappable .jcat alongside."""
+    builder = CatalogBuilder() if binary is not None else None
+    with open(path, "w", encoding="utf-8") as f:
+        for job in generate_jobs(n, seed):
+            f.write(json.dumps(job) + "\n")
+            if builder is not None:
+                builder.add(job)
+    if builder is not None:
+        builder.write(binary)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Generate synthetic benchmark data")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    j = sub.add_parser("jobs")
+    j.add_argument("n", type=int)
+    j.add_argument("path", type=Path)
+    j.add_argument("--binary", type=Path)
+    j.add_argument("--seed", type=int, default=7)
+    u = sub.add_parser("utterances")
+    u.add_argument("n", type=int)
+    u.add_argument("path", type=Path)
+    u.add_argument("--seed", type=int, default=11)
+    t = sub.add_parser("trace")
+    t.add_argument("sessions", type=int)
+    t.add_argument("path", type=Path)
+    t.add_argument("--duration", type=float, default=60.0)
+    t.add_argument("--turns", type=int, default=4, help="max turns per session")
+    t.add_argument("--think-time", type=float, default=8.0, help="mean seconds between a session's turns")
+    t.add_argument("--seed", type=int, default=13)
+    args = ap.parse_args()
+
+    if args.cmd == "jobs":
+        write_jobs(args.n, args.path, args.seed, args.binary)
+    elif args.cmd == "trace":
+        records = generate_trace(args.sessions, args.duration, args.turns, args.think_time, args.seed)
+        args.path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    else:
+        args.path.write_text("\n".join(generate_utterances(args.n, args.seed)) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# tests/test_batch.py
+# Batched intent parsing: chunking, fan-out order, per-item fallback and the /chat/batch route.
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import llm, orchestrator
+from app.llm_guard import LLMGuard
+from app.parse_cache import MemoryParseCache
+from app.schemas import ChatTurn
+
+
+class FakeBatchLLM:
+    """
+    Answers batch prompts: role = the message text; "garbage" gets a malformed
+    item and "bad salary" an item that fails JobPreference validation.
+    """
+
+    def __init__(self, is_async: bool = False, fail: bool = False):
+        self.prompts = []
+        self.fail = fail
+        create = self._create_async if is_async else self._create
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+    def _create(self, messages, **_):
+        prompt = messages[0]["content"]
+        self.prompts.append(prompt)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        lines = prompt.split("Messages:\n", 1)[1].splitlines()
+        answer = {}
+        for line in lines:
+            num, text = line.split(": ", 1)
+            text = json.loads(text)
+            if text != "skip me":
+                answer[num] = "oops" if text == "garbage" else {"role": text, "skills": ["sql"], "notes": "from llm"}
+                if text == "bad salary":
+                    answer[num]["salary_min"] = "120k"
+        content = json.dumps(answer)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def _create_async(self, messages, **kw):
+        return self._create(messages, **kw)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    def install(is_async: bool = False, fail: bool = False) -> FakeBatchLLM:
+        f = FakeBatchLLM(is_async, fail)
+        monkeypatch.setattr(llm, "async_client" if is_async else "client", f)
+        monkeypatch.setattr(llm, "parse_cache", MemoryParseCache())
+        return f
+
+    return install
+
+
+def test_batch_prompt_keeps_instructions_and_numbers_messages():
+    prompt = llm._batch_prompt(llm._templates.get(), ['say "hi"', "data analyst"])
+    assert "STRICT JSON" in prompt and "{USER_UTTERANCE}" not in prompt
+    assert prompt.endswith('Messages:\n1: "say \\"hi\\""\n2: "data analyst"')
+
+
+def test_one_call_per_chunk_and_results_in_input_order(fake):
+    f = fake()
+    utts = [f"role {i}" for i in range(5)] + ["role 0"]
+    prefs = llm.parse_intents_batch(utts, batch_size=2)
+    assert [p.role for p in prefs] == utts
+    # Duplicate utterances are parsed once: 5 distinct -> 3 chunks of <= 2
+    assert len(f.prompts) == 3
+
+
+def test_malformed_or_missing_items_fall_back_individually(fake):
+    fake()
+    prefs = llm.parse_intents_batch(["data analyst", "garbage", "skip me"])
+    assert prefs[0].notes == "from llm"
+    assert prefs[1].notes == prefs[2].notes == "parsed by offline fallback"
+
+
+def test_invalid_item_falls_back_alone_and_keeps_the_breaker_closed(fake):
+    fake()
+    prefs = llm.parse_intents_batch(["data analyst", "bad salary", "ai engineer"])
+    assert [p.notes for p in prefs] == ["from llm", "parsed by offline fallback", "from llm"]
+    assert llm.batch_guard_stats()["failures"] == 0 and llm._batch_guard.breaker.state == "closed"
+
+
+def test_failed_batches_do_not_open_the_interactive_breaker(fake, monkeypatch):
+    monkeypatch.setattr(llm, "_batch_guard", LLMGuard(budget_seconds=5, hedge=False))
+    f = fake(fail=True)
+    for i in range(6):
+        llm.parse_intents_batch([f"role {i}"])
+    assert llm._batch_guard.breaker.state == "open"
+    assert llm._guard.breaker is not llm._batch_guard.breaker
+    assert llm._guard.breaker.state == "closed"
+    assert len(f.prompts) == 5
+
+
+def test_failed_call_falls_back_and_cache_is_reused(fake):
+    f = fake()
+    llm.parse_intents_batch(["ai engineer"])
+    assert llm.parse_intents_batch(["ai engineer", "data analyst"])[0].notes == "from llm"
+    # Cached item is not sent again
+    assert '"ai engineer"' not in f.prompts[-1]
+    f.fail = True
+    assert llm.parse_intents_batch(["ml engineer"])[0].notes == "parsed by offline fallback"
+
+
+def test_async_batch_runs_chunks_concurrently(fake):
+    f = fake(is_async=True)
+    utts = [f"role {i}" for i in range(7)]
+    prefs = asyncio.run(llm.parse_intents_batch_async(utts, batch_size=3, concurrency=2))
+    assert [p.role for p in prefs] == utts and len(f.prompts) == 3
+
+
+def test_chat_batch_applies_turns_in_order(fake):
+    fake(is_async=True)
+    turns = [
+        ChatTurn(session_id="b1", user_utterance="Data Analyst"),
+        ChatTurn(session_id="b2", user_utterance="garbage"),
+        ChatTurn(session_id="b1", user_utterance="skip me"),
+    ]
+    out = asyncio.run(orchestrator.handle_chat_batch_async(turns))
+    assert len(out) == 3
+    assert out[0].parsed_preferences.role == "Data Analyst"
+    # Later turn of the same session merges onto the earlier one
+    assert out[2].parsed_preferences.role == "Data Analyst"
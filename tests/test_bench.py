@@ -0,0 +1,74 @@
+# tests/test_bench.py
+# Benchmark tooling: deterministic synthetic data and regression detection.
+
+import asyncio
+import json
+from typing import Dict, List
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.catalog import Catalog
+from app.schemas import ChatTurn
+from bench.replay import TraceTurn, load_trace, replay, report
+from bench.suite import compare
+from bench.synth import generate_jobs, generate_trace, generate_utterances
+
+
+def test_synthetic_jobs_are_deterministic_and_loadable():
+    jobs = list(generate_jobs(300, seed=3))
+    assert jobs == list(generate_jobs(300, seed=3))
+    assert len({j["job_id"] for j in jobs}) == 300
+    assert len(Catalog.from_jobs(jobs)) == 300
+    assert generate_utterances(20, seed=1) == generate_utterances(20, seed=1)
+
+
+def test_compare_flags_only_real_regressions():
+    base = {"stages": {"a": {"ops_per_s": 1000, "p50_us": 10, "p99_us": 50}}}
+    same = {"stages": {"a": {"ops_per_s": 900, "p50_us": 11, "p99_us": 60}}}
+    slow = {"stages": {"a": {"ops_per_s": 400, "p50_us": 25, "p99_us": 200}}}
+    assert compare(same, base, 0.25) == []
+    assert len(compare(slow, base, 0.25)) == 3
+    assert compare({"stages": {}}, base, 0.25) == ["a: missing from current run"]
+
+
+def test_trace_round_trip_and_bad_lines(tmp_path):
+    records = generate_trace(30, duration=10, seed=2)
+    path = tmp_path / "trace.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    trace = load_trace(path)
+    assert len(trace) == len(records) and trace[0].at == 0
+    assert [t.at for t in trace] == sorted(t.at for t in trace)
+
+    bad = tmp_path / "bad.jsonl"
+    bad.write_text(json.dumps(records[0]) + "\n" + '{"request_id": "x", "title": "not a turn"}\n')
+    with pytest.raises(ValueError, match=":2:"):
+        load_trace(bad)
+
+
+def test_replay_keeps_session_order_and_reports():
+    seen: Dict[str, List[str]] = {}
+    app = FastAPI()
+
+    @app.post("/chat")
+    async def chat(turn: ChatTurn):
+        await asyncio.sleep(0.01)
+        if turn.user_utterance == "fail":
+            raise HTTPException(status_code=500)
+        seen.setdefault(turn.session_id, []).append(turn.user_utterance)
+        return {}
+
+    # s1's second turn is due before its first reply arrives and must still go second
+    trace = [TraceTurn(0.0, "s1", "a"), TraceTurn(0.001, "s1", "b"), TraceTurn(0.0, "s2", "c"),
+             TraceTurn(0.02, "s2", "fail")]
+
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as c:
+            return await replay(c, trace, speed=2.0)
+
+    results = asyncio.run(go())
+    assert seen == {"s1": ["a", "b"], "s2": ["c"]}
+    r = report(results)
+    assert r["requests"] == 4 and r["errors"] == 1 and r["error_rate"] == 0.25
+    assert r["latency_ms"]["p50"] >= 10 and r["throughput_rps"] > 0
@@ -0,0 +1,99 @@
+# tests/test_catalog.py
+# Binary catalog round trip, ranking parity, and atomic hot reload.
+
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import catalog, job_api, metrics
+from app.catalog import load_catalog, write_binary
+from app.main import app
+from app.schemas import JobPreference
+
+SOURCE = catalog.DEFAULT_PATH
+
+
+@pytest.fixture()
+def jobs():
+    return json.loads(SOURCE.read_text(encoding="utf-8"))
+
+
+@pytest.fixture()
+def isolated_catalog(monkeypatch: pytest.MonkeyPatch):
+    """Let a test swap the live catalog; the original is restored afterwards."""
+    monkeypatch.setattr(catalog, "_current", catalog.current())
+
+
+def test_binary_catalog_round_trips_every_job(tmp_path, jobs):
+    path = tmp_path / "jobs.jcat"
+    write_binary(jobs, path)
+    cat = load_catalog(path)
+    assert len(cat) == len(jobs)
+    assert list(cat.jobs) == jobs
+
+
+def test_binary_catalog_ranks_like_json(tmp_path, jobs):
+    path = tmp_path / "jobs.jcat"
+    write_binary(jobs, path)
+    binary, text = load_catalog(path), load_catalog(SOURCE)
+    pref = JobPreference(role="data analyst", location="bay area", skills=["sql", "python"], salary_min=100)
+    assert binary.index.candidates(pref).tolist() == text.index.candidates(pref).tolist()
+    assert binary.columns.score(pref).tolist() == text.columns.score(pref).tolist()
+    assert job_api._rank(binary, pref, 10) == job_api._rank(text, pref, 10)
+
+
+def test_reload_if_changed_swaps_snapshot(tmp_path, jobs, monkeypatch, isolated_catalog):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(jobs[:5]), encoding="utf-8")
+    monkeypatch.setenv("JOB_CATALOG_PATH", str(path))
+
+    assert catalog.reload_if_changed()
+    before = catalog.current()
+    assert len(before) == 5
+    assert not catalog.reload_if_changed()
+
+    write_binary(jobs[:3], path)  # atomic replace, new mtime
+    os.utime(path, (before.mtime + 10, before.mtime + 10))
+    assert catalog.reload_if_changed()
+    after = catalog.current()
+    assert len(after) == 3 and after.version > before.version
+    assert len(before) == 5 and before.jobs[4] == jobs[4]  # old snapshot still usable
+
+
+def test_watcher_logs_and_counts_a_bad_file_once(tmp_path, jobs, monkeypatch, isolated_catalog, caplog):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(jobs[:5]), encoding="utf-8")
+    monkeypatch.setenv("JOB_CATALOG_PATH", str(path))
+    assert catalog.reload_if_changed()
+    good = catalog.current()
+
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, (good.mtime + 10, good.mtime + 10))
+    before = metrics.catalog_reload_failures.value()
+    stop = catalog.start_watcher(interval=0.01)
+    try:
+        time.sleep(0.2)
+    finally:
+        stop.set()
+
+    assert metrics.catalog_reload_failures.value() == before + 1  # same bad mtime not retried
+    assert "catalog reload from" in caplog.text
+    assert catalog.current() is good
+
+
+def test_admin_reload_requires_configured_token(monkeypatch, isolated_catalog):
+    client = TestClient(app)
+    before = catalog.current().version
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert client.post("/admin/catalog/reload", headers={"X-Admin-Token": "x"}).status_code == 404
+
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    assert client.post("/admin/catalog/reload").status_code == 403
+    assert client.post("/admin/catalog/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert catalog.current().version == before
+
+    resp = client.post("/admin/catalog/reload", headers={"X-Admin-Token": "s3cret"})
+    assert resp.status_code == 200 and resp.json()["version"] > before
@@ -0,0 +1,59 @@
+# tests/test_fallback_parser.py
+# Offline fallback parser: phrase matching, aliases, and catalog-seeded vocabulary.
+
+from app import catalog, fallback_parser
+from app.fallback_parser import FallbackParser, PhraseMatcher, build_matcher, load_vocabulary
+
+
+def test_longest_match_wins_and_words_are_whole():
+    m = PhraseMatcher()
+    m.add("data analyst", "role", "Data Analyst")
+    m.add("data", "skill", "data")
+    m.add("la", "location", "los angeles")
+    assert list(m.scan("Senior DATA ANALYST in LA")) == [("role", "Data Analyst"), ("location", "los angeles")]
+    # "la" inside another word is not a location
+    assert list(m.scan("salary data")) == [("skill", "data")]
+
+
+def test_fallback_extracts_fields_and_aliases():
+    pref = fallback_parser.parse("Looking for a senior MLE in SF, full time, fintech, PyTorch + Kubernetes + Postgres, $150k-$180k/yr")
+    assert pref.role == "Machine Learning Engineer"
+    assert pref.location == "san francisco"
+    assert pref.employment_type == "full-time" and pref.seniority == "senior" and pref.domain == "fintech"
+    assert pref.skills == ["pytorch", "kubernetes", "postgresql"]
+    assert (pref.salary_min, pref.salary_max, pref.salary_unit) == (150000, 180000, "year")
+    assert pref.remote is None
+
+
+def test_remote_only_sets_location_when_no_city():
+    assert fallback_parser.parse("data analyst intern, remote ok").location == "remote"
+    pref = fallback_parser.parse("data analyst in new york or remote")
+    assert pref.location == "new york" and pref.remote is True
+
+
+def test_catalog_seeds_roles_and_skills():
+    parser = FallbackParser(build_matcher({}, catalog.current()))
+    pref = parser.parse("any mlops engineer roles with faiss and vector db?")
+    assert pref.role == "Mlops Engineer"
+    assert pref.skills == ["faiss", "vector db"]
+    # Seniority words and parentheticals are stripped from catalog titles
+    assert parser.parse("data scientist").role == "Data Scientist"
+
+
+def test_curated_spelling_beats_catalog_title():
+    parser = FallbackParser(build_matcher(load_vocabulary(), catalog.current()))
+    assert parser.parse("mlops engineer").role == "MLOps Engineer"
+
+
+def test_two_letter_aliases_need_context():
+    # Times, names and ordinary words are not roles or locations
+    assert fallback_parser.parse("call me at 3 pm").role is None
+    assert fallback_parser.parse("Call me at 3 PM").role is None
+    pref = fallback_parser.parse("this is maria de la cruz, any data analyst openings?")
+    assert pref.role == "Data Analyst" and pref.location is None
+    # Capitals or a cue word make the alias count
+    pref = fallback_parser.parse("Senior PM in LA")
+    assert (pref.role, pref.location) == ("Product Manager", "los angeles")
+    pref = fallback_parser.parse("looking for pm roles in la or dc")
+    assert (pref.role, pref.location) == ("Product Manager", "los angeles")
+    assert fallback_parser.parse("any de jobs?").role == "Data Engineer"
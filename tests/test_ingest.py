@@ -0,0 +1,61 @@
+# tests/test_ingest.py
+# Streaming feed readers and incremental catalog construction.
+
+import io
+import json
+
+import pytest
+
+from app.catalog import DEFAULT_PATH, load_catalog
+from app.ingest import iter_json_array, iter_jobs
+from app.render import JobFragments
+from app.schemas import MatchItem
+
+JOBS = json.loads(DEFAULT_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_json_array_reader_handles_any_chunk_boundary(chunk_size: int):
+    text = json.dumps(JOBS, indent=2, ensure_ascii=False)
+    assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == JOBS
+
+
+def test_json_array_reader_rejects_truncated_input():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(json.dumps(JOBS)[:-40]), chunk_size=16))
+
+
+def test_ndjson_and_array_feeds_build_the_same_catalog(tmp_path):
+    nd = tmp_path / "jobs.ndjson"
+    nd.write_text("\n".join(json.dumps(j) for j in JOBS) + "\n\n", encoding="utf-8")
+    seen = []
+    jobs = list(iter_jobs(nd, progress=seen.append, every=10))
+    assert jobs == JOBS
+    assert seen == [10, 20, len(JOBS)]
+
+    from_nd, from_array = load_catalog(nd), load_catalog(DEFAULT_PATH)
+    assert list(from_nd.jobs) == list(from_array.jobs) == JOBS
+    assert from_nd.columns.vocabs["location"] == from_array.columns.vocabs["location"]
+
+
+def test_locations_are_normalized_once_at_ingest(tmp_path):
+    feed = tmp_path / "jobs.ndjson"
+    feed.write_text(json.dumps({**JOBS[0], "location": "  SF "}), encoding="utf-8")
+    cat = load_catalog(feed)
+    assert list(cat.columns.vocabs["location"]) == ["san francisco"]
+    assert cat.jobs[0]["location"] == "  SF "  # display value untouched
+
+
+def test_display_fields_are_checked_once_at_ingest(tmp_path):
+    feed = tmp_path / "jobs.ndjson"
+    job = {**JOBS[0], "job_id": 123}
+    feed.write_text(json.dumps(job) + "\n", encoding="utf-8")
+    cat = load_catalog(feed)
+    assert cat.jobs[0]["job_id"] == "123"
+    frag = JobFragments(cat.jobs).item(0, [], 1.0)
+    assert frag == MatchItem(**frag.model_dump())
+
+    for bad in ({"location": {"city": "Austin"}}, {"salary_min": "120k"}, {"title": None}):
+        feed.write_text(json.dumps({**JOBS[0], **bad}) + "\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            load_catalog(feed)
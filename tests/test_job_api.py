@@ -0,0 +1,108 @@
+# tests/test_job_api.py
+# Ranking tests: indexed query_top_n must match a full linear scan.
+
+import pytest
+
+from app.schemas import JobPreference
+from app import catalog, job_api
+
+
+def _linear_top_n(pref: JobPreference, n: int = 10):
+    """Reference ranking: score every job in the catalog."""
+    scored = []
+    for job in catalog.current().jobs:
+        sc = job_api.score_job(pref, job)
+        if sc > 0:
+            scored.append((round(sc, 3), job["job_id"]))
+    return sorted(scored, key=lambda x: x[0], reverse=True)[:n]
+
+
+PREFS = [
+    JobPreference(),
+    JobPreference(role="Data Analyst"),
+    JobPreference(role="engineer", location="bay area"),
+    JobPreference(role="ta analy"),
+    JobPreference(role="Data Scientist (NLP)", skills=["NLP", "python"]),
+    JobPreference(location="Remote", remote=True),
+    JobPreference(domain="FinTech", seniority="senior"),
+    JobPreference(employment_type="intern", remote=False),
+    JobPreference(skills=["SQL", " tableau ", "dbt"]),
+    JobPreference(salary_min=120000),
+    JobPreference(salary_min=35, skills=["python"]),
+    JobPreference(
+        role="Data Analyst",
+        location="bay area",
+        salary_min=30,
+        employment_type="intern",
+        domain="startup",
+        seniority="intern",
+        remote=True,
+        skills=["sql", "python", "tableau"],
+    ),
+]
+
+
+@pytest.fixture
+def exact_matching(monkeypatch: pytest.MonkeyPatch):
+    """`score_job` is exact-match only; scalar and batch scores agree only with semantic matching off."""
+    monkeypatch.setattr(catalog.current().columns, "semantic", None)
+
+
+@pytest.mark.parametrize("pref", PREFS)
+def test_query_top_n_matches_linear_scan(pref: JobPreference, exact_matching):
+    got = [(m.score, m.job_id) for m in job_api.query_top_n(pref, n=10)]
+    assert got == _linear_top_n(pref, n=10)
+
+
+def test_index_candidates_skip_unrelated_jobs():
+    pref = JobPreference(domain="fintech")
+    cat = catalog.current()
+    rows = cat.index.candidates(pref).tolist()
+    assert rows and len(rows) < len(cat)
+    assert all(cat.jobs[r]["domain"] == "fintech" for r in rows)
+
+
+@pytest.mark.parametrize("pref", PREFS)
+def test_batch_scorer_matches_scalar_score_job(pref: JobPreference, exact_matching):
+    cat = catalog.current()
+    expected = [job_api.score_job(pref, job) for job in cat.jobs]
+    assert cat.columns.score(pref).tolist() == expected
+
+
+def test_query_top_n_offset_is_a_slice_of_the_full_ranking():
+    pref = JobPreference(skills=["python", "sql"], remote=True)
+    full = job_api.query_top_n(pref, n=20)
+    assert job_api.query_top_n(pref, n=5, offset=5) == full[5:10]
+
+
+def test_query_page_cursor_walks_the_full_ranking():
+    pref = JobPreference(skills=["python", "sql"], remote=True)
+    full = [m.job_id for m in job_api.query_top_n(pref, n=len(catalog.current()))]
+    seen, cursor = [], None
+    while True:
+        items, cursor = job_api.query_page(pref, limit=4, cursor=cursor)
+        seen += [m.job_id for m in items]
+        if cursor is None:
+            break
+    assert seen == full
+
+
+def test_query_page_rejects_malformed_cursor():
+    with pytest.raises(ValueError):
+        job_api.query_page(JobPreference(role="Data"), cursor="not-a-cursor")
+
+
+def test_query_page_rejects_cursor_from_another_query():
+    _, cursor = job_api.query_page(JobPreference(skills=["python", "sql"], remote=True), limit=2)
+    assert cursor is not None
+    with pytest.raises(ValueError, match="different query"):
+        job_api.query_page(JobPreference(role="Data"), limit=2, cursor=cursor)
+
+
+def test_query_page_rejects_cursor_after_catalog_reload():
+    pref = JobPreference(skills=["python", "sql"], remote=True)
+    _, cursor = job_api.query_page(pref, limit=2)
+    assert cursor is not None
+    catalog.reload()
+    with pytest.raises(ValueError, match="catalog version"):
+        job_api.query_page(pref, limit=2, cursor=cursor)
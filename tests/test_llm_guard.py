@@ -0,0 +1,162 @@
+# tests/test_llm_guard.py
+# Latency budget, hedging and circuit breaker, driven by a fake LLM with injected delays and errors.
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+import pytest
+
+from app import llm
+from app.llm_guard import CircuitBreaker, CircuitOpen, LLMGuard, LLMTimeout
+
+ANSWER = '{"role": "Data Analyst", "location": "bay area", "skills": ["sql"], "notes": "from llm"}'
+
+# One (delay seconds, error) per call, in call order; the last entry repeats
+Script = List[Tuple[float, Optional[Exception]]]
+
+
+class FakeLLM:
+    """Stands in for OpenAI / AsyncOpenAI: `chat.completions.create` follows a script."""
+
+    def __init__(self, script: Script, is_async: bool = False, answer: str = ANSWER):
+        self.script = script
+        self.answer = answer
+        self.calls = 0
+        self.cancelled = 0
+        create = self._create_async if is_async else self._create
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+    def _next(self) -> Tuple[float, Optional[Exception]]:
+        step = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        return step
+
+    def _response(self):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.answer))])
+
+    def _create(self, **_):
+        delay, error = self._next()
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return self._response()
+
+    async def _create_async(self, **_):
+        delay, error = self._next()
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if error is not None:
+            raise error
+        return self._response()
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    """Install a fake client and a fresh, fast guard; returns an installer."""
+
+    def install(script: Script, is_async: bool = False, answer: str = ANSWER, **guard_kw) -> FakeLLM:
+        fake_llm = FakeLLM(script, is_async, answer)
+        monkeypatch.setattr(llm, "async_client" if is_async else "client", fake_llm)
+        monkeypatch.setattr(llm, "parse_cache", None)
+        kw = dict(budget_seconds=0.3, initial_hedge_delay=0.05)
+        kw.update(guard_kw)
+        monkeypatch.setattr(llm, "_guard", LLMGuard(**kw))
+        return fake_llm
+
+    return install
+
+
+def test_slow_llm_falls_back_within_budget(fake):
+    fake([(2.0, None)], hedge=False)
+    t0 = time.perf_counter()
+    pref = llm.parse_intent("data analyst in bay area")
+    assert time.perf_counter() - t0 < 1.0
+    assert pref.notes == "parsed by offline fallback"
+    assert llm.guard_stats()["timeouts"] == 1
+
+
+def test_hedged_request_wins_over_slow_first_attempt(fake):
+    f = fake([(1.0, None), (0.0, None)])
+    t0 = time.perf_counter()
+    pref = llm.parse_intent("data analyst")
+    assert time.perf_counter() - t0 < 0.5
+    assert pref.notes == "from llm" and f.calls == 2
+    assert llm.guard_stats()["hedges"] == 1
+
+
+def test_async_hedge_cancels_the_loser(fake):
+    f = fake([(1.0, None), (0.0, None)], is_async=True)
+    pref = asyncio.run(llm.parse_intent_async("data analyst"))
+    assert pref.notes == "from llm"
+    assert f.calls == 2 and f.cancelled == 1
+
+
+def test_async_timeout_falls_back(fake):
+    f = fake([(2.0, None)], is_async=True, hedge=False)
+    pref = asyncio.run(llm.parse_intent_async("data analyst"))
+    assert pref.notes == "parsed by offline fallback" and f.cancelled == 1
+
+
+def test_breaker_opens_and_skips_the_llm(fake):
+    f = fake([(0.0, RuntimeError("upstream 500"))], breaker=CircuitBreaker(failure_threshold=3, cooldown_seconds=60))
+    for _ in range(5):
+        assert llm.parse_intent("data analyst").notes == "parsed by offline fallback"
+    assert f.calls == 3
+    stats = llm.guard_stats()
+    assert stats["breaker"] == "open" and stats["short_circuits"] == 2
+
+
+def test_invalid_answers_fall_back_without_tripping_the_breaker(fake):
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60)
+    f = fake([(0.0, None)], answer='{"remote": "sometimes"}', breaker=breaker)
+    for _ in range(4):
+        assert llm.parse_intent("data analyst").notes == "parsed by offline fallback"
+    f2 = fake([(0.0, None)], is_async=True, answer='{"salary_min": "120k"}', breaker=breaker)
+    assert asyncio.run(llm.parse_intent_async("data analyst")).notes == "parsed by offline fallback"
+    # Every answer reached the model and parser; none counted as an outage
+    assert f.calls == 4 and f2.calls == 1
+    assert breaker.state == "closed"
+    stats = llm.guard_stats()
+    assert stats["failures"] == 0 and stats["short_circuits"] == 0
+
+
+def test_breaker_half_open_probe():
+    now = [0.0]
+    guard = LLMGuard(budget_seconds=1, hedge=False, breaker=CircuitBreaker(2, 10, clock=lambda: now[0]))
+
+    def boom():
+        raise ValueError("bad")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            guard.call(boom)
+    with pytest.raises(CircuitOpen):
+        guard.call(lambda: "ok")
+    now[0] = 11
+    # One probe is let through; its failure re-opens for another cool-down
+    with pytest.raises(ValueError):
+        guard.call(boom)
+    with pytest.raises(CircuitOpen):
+        guard.call(lambda: "ok")
+    now[0] = 22
+    assert guard.call(lambda: "ok") == "ok"
+    assert guard.breaker.state == "closed"
+
+
+def test_hedge_delay_tracks_observed_p95():
+    guard = LLMGuard(budget_seconds=5, initial_hedge_delay=2.0, min_samples=20)
+    assert guard.hedge_delay() == 2.0
+    for i in range(100):
+        guard.latency.add(i / 100)
+    assert guard.hedge_delay() == pytest.approx(0.95)
+
+
+def test_timeout_is_raised_to_caller():
+    guard = LLMGuard(budget_seconds=0.05, hedge=False)
+    with pytest.raises(LLMTimeout):
+        guard.call(lambda: time.sleep(0.5))
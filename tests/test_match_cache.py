@@ -0,0 +1,78 @@
+# tests/test_match_cache.py
+# Match cache: canonical keys, parity with uncached ranking, invalidation and expiry.
+
+from app import catalog, job_api
+from app.match_cache import MatchCache, canonical_preference, preference_key
+from app.schemas import JobPreference
+
+
+def _key(pref: JobPreference) -> str:
+    return preference_key(canonical_preference(pref))
+
+
+def test_equivalent_preferences_share_a_key():
+    a = JobPreference(role="Data Analyst", location="Bay Area", employment_type="Internship", skills=["SQL", "python"])
+    b = JobPreference(role="Data Analyst", location="bay area", employment_type="intern", skills=["python", " sql ", "sql"])
+    assert _key(a) == _key(b)
+    assert _key(a) != _key(a.model_copy(update={"remote": True}))
+    # Fields that do not affect ranking do not split the cache
+    assert _key(a) == _key(a.model_copy(update={"notes": "anything", "salary_max": 10}))
+
+
+def test_cached_results_match_uncached(monkeypatch):
+    pref = JobPreference(role="analyst", skills=["sql", "python"])
+    cached = [job_api.query_top_n(pref, n=5, offset=o) for o in (0, 0, 5)]
+    page, nxt = job_api.query_page(pref, limit=3)
+    follow, _ = job_api.query_page(pref, limit=3, cursor=nxt) if nxt else ([], None)
+
+    monkeypatch.setattr(job_api, "_match_cache", None)
+    assert cached == [job_api.query_top_n(pref, n=5, offset=o) for o in (0, 0, 5)]
+    assert (page, follow) == (job_api.query_page(pref, limit=3)[0], job_api.query_page(pref, limit=3, cursor=nxt)[0] if nxt else [])
+
+
+def test_repeat_query_hits_cache(monkeypatch):
+    cache = MatchCache()
+    monkeypatch.setattr(job_api, "_match_cache", cache)
+    pref = JobPreference(role="engineer")
+    job_api.query_top_n(pref, n=3)
+    job_api.query_top_n(pref.model_copy(update={"notes": "again"}), n=3)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_new_catalog_version_invalidates():
+    cache = MatchCache()
+    cache.put(1, "k", [(1.0, 0)], complete=True)
+    assert cache.get(1, "k", 1) is not None
+    assert cache.get(2, "k", 1) is None
+    assert cache.stats()["size"] == 0 and cache.stats()["invalidations"] == 1
+    # A request still holding the old snapshot does not reset the cache
+    cache.put(2, "k", [(1.0, 0)], complete=True)
+    assert cache.get(1, "k", 1) is None
+    assert cache.get(2, "k", 1) is not None
+
+
+def test_reload_drops_cached_rankings(monkeypatch):
+    cache = MatchCache()
+    monkeypatch.setattr(job_api, "_match_cache", cache)
+    pref = JobPreference(role="analyst")
+    job_api.query_top_n(pref, n=3)
+    catalog.reload()
+    job_api.query_top_n(pref, n=3)
+    assert cache.stats()["hits"] == 0 and cache.stats()["invalidations"] == 1
+
+
+def test_ttl_and_lru_bounds():
+    now = [0.0]
+    cache = MatchCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    for k in ("a", "b", "c"):
+        cache.put(1, k, [(1.0, 0)], complete=True)
+    assert cache.get(1, "a", 1) is None and cache.get(1, "c", 1) is not None
+    now[0] = 11
+    assert cache.get(1, "c", 1) is None
+
+
+def test_shallow_entry_does_not_cover_deep_page():
+    cache = MatchCache()
+    cache.put(1, "k", [(2.0, 0), (1.0, 1)], complete=False)
+    assert cache.get(1, "k", 2) is not None
+    assert cache.get(1, "k", 3) is None
@@ -0,0 +1,129 @@
+# tests/test_memory.py
+# Session store: merging, TTL expiry, LRU cap, and thread safety.
+
+import threading
+
+from app.memory import RedisSessionStore, ShardedSessionStore, SQLiteSessionStore
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_update_merges_non_empty_values():
+    store = ShardedSessionStore()
+    store.update_preferences("s", {"role": "Data Analyst", "skills": ["sql"]})
+    pref = store.update_preferences("s", {"role": None, "location": "bay area", "skills": []})
+    assert pref.role == "Data Analyst" and pref.location == "bay area" and pref.skills == ["sql"]
+    assert store.get("s")["preferences"]["skills"] == ["sql"]
+
+
+def test_expired_sessions_are_reclaimed_without_revisiting_them():
+    clock = _Clock()
+    store = ShardedSessionStore(ttl_seconds=10, shards=4, clock=clock)
+    for i in range(20):
+        store.update_preferences(f"s{i}", {"role": "x"})
+    clock.now = 11
+    assert store.sweep() == 20
+    assert len(store) == 0
+    assert store.stats()["expired"] == 20
+
+
+def test_expired_session_starts_fresh():
+    clock = _Clock()
+    store = ShardedSessionStore(ttl_seconds=10, clock=clock)
+    store.update_preferences("s", {"role": "x"})
+    clock.now = 11
+    assert store.get_preferences("s").role is None
+
+
+def test_max_entries_evicts_least_recently_used():
+    store = ShardedSessionStore(max_entries=2, shards=1)
+    store.update_preferences("a", {"role": "a"})
+    store.update_preferences("b", {"role": "b"})
+    store.get("a")
+    store.update_preferences("c", {"role": "c"})
+    assert store.get_preferences("a").role == "a"
+    assert store.stats()["evicted"] >= 1
+    assert len(store) == 2
+
+
+def test_concurrent_updates_are_safe():
+    store = ShardedSessionStore()
+
+    def worker(i: int):
+        for j in range(50):
+            store.update_preferences(f"s{j % 5}", {"salary_min": i * 1000 + j})
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store) == 5
+    assert store.stats()["size"] == 5
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    worker_a, worker_b = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    worker_a.update_preferences("s", {"role": "Data Analyst", "remote": False})
+    pref = worker_b.update_preferences("s", {"skills": ["sql"], "role": ""})
+    assert pref.role == "Data Analyst" and pref.remote is False and pref.skills == ["sql"]
+    assert worker_a.get_preferences("s") == pref
+
+
+def test_sqlite_store_expires_sessions(tmp_path):
+    clock = _Clock()
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=10, clock=clock)
+    store.update_preferences("s", {"role": "x"})
+    clock.now = 11
+    assert store.get_preferences("s").role is None
+    assert store.sweep() == 1 and store.stats()["size"] == 0
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis"):
+        self._redis = redis
+        self._ops = []
+
+    def hset(self, key, mapping):
+        self._ops.append(lambda: self._redis.data.setdefault(key, {}).update(mapping))
+
+    def expire(self, key, ttl):
+        self._ops.append(lambda: True)
+
+    def hgetall(self, key):
+        self._ops.append(lambda: dict(self._redis.data.get(key, {})))
+
+    def execute(self):
+        self._redis.round_trips += 1
+        return [op() for op in self._ops]
+
+
+class _FakeRedis:
+    """Just enough of redis-py for RedisSessionStore; counts round trips."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def hgetall(self, key):
+        self.round_trips += 1
+        return dict(self.data.get(key, {}))
+
+
+def test_redis_store_merges_in_one_round_trip_per_turn():
+    fake = _FakeRedis()
+    store = RedisSessionStore(fake)
+    store.update_preferences("s", {"role": "Data Analyst", "skills": ["sql"], "location": None})
+    pref = store.update_preferences("s", {"location": "bay area", "skills": []})
+    assert pref.role == "Data Analyst" and pref.location == "bay area" and pref.skills == ["sql"]
+    assert fake.round_trips == 2
@@ -0,0 +1,131 @@
+# tests/test_metrics.py
+# Stage timers, parse/fallback counters, the /metrics exposition and the header-enabled profiler.
+
+import os
+
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test-dummy")  # avoid SDK complaints
+
+from fastapi.testclient import TestClient
+
+from app import llm, metrics
+from app import orchestrator as orch
+from app.llm_guard import CircuitBreaker, LLMGuard
+from app.main import app
+from app.metrics import Counter, Histogram, Registry, StatsGauge
+from app.parse_cache import MemoryParseCache
+from app.schemas import ChatTurn, JobPreference
+
+# Every clarified field set, so turns go through ranking
+FULL_PREF = JobPreference(
+    role="Data Analyst", location="bay area", salary_min=30, salary_unit="hour",
+    employment_type="intern", domain="startup", skills=["sql"],
+)
+
+
+def test_render_prometheus_text():
+    reg = Registry()
+    c = reg.register(Counter("t_total", "A counter", ("kind",)))
+    h = reg.register(Histogram("t_seconds", "A histogram", buckets=(0.1, 1)))
+    reg.register(StatsGauge("t_cache", "A gauge", lambda: {"hits": 3, "state": "open", "ok": True}))
+    c.inc(kind="a")
+    c.inc(2, kind="a")
+    h.observe(0.05)
+    h.observe(0.5)
+    h.observe(7)
+    text = reg.render()
+    assert "# TYPE t_total counter" in text
+    assert 't_total{kind="a"} 3' in text
+    assert 't_seconds_bucket{le="0.1"} 1' in text
+    assert 't_seconds_bucket{le="1"} 2' in text
+    assert 't_seconds_bucket{le="+Inf"} 3' in text
+    assert "t_seconds_count 3" in text
+    # Only numeric, non-boolean stats become samples
+    assert 't_cache{stat="hits"} 3' in text and "state" not in text and '"ok"' not in text
+
+
+def test_stage_times_and_counts_errors():
+    before = metrics.stage_seconds.count(stage="unit")
+    with pytest.raises(ValueError):
+        with metrics.stage("unit"):
+            raise ValueError("boom")
+    assert metrics.stage_seconds.count(stage="unit") == before + 1
+    assert metrics.stage_errors.value(stage="unit") >= 1
+
+
+def test_handle_chat_records_every_stage(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(orch.llm, "parse_intent", lambda _: FULL_PREF)
+    before = {s: metrics.stage_seconds.count(stage=s) for s in ("parse", "merge", "clarify", "query", "compose")}
+    turns = metrics.chat_turn_seconds.count()
+    orch.handle_chat(ChatTurn(session_id="metrics-1", user_utterance="data analyst in bay area with sql"))
+    for s, n in before.items():
+        assert metrics.stage_seconds.count(stage=s) == n + 1, s
+    assert metrics.chat_turn_seconds.count() == turns + 1
+
+
+def test_fallbacks_are_counted_by_reason(monkeypatch: pytest.MonkeyPatch):
+    class Failing:
+        class chat:
+            class completions:
+                @staticmethod
+                def create(**_):
+                    raise RuntimeError("upstream 500")
+
+    monkeypatch.setattr(llm, "client", Failing)
+    monkeypatch.setattr(llm, "parse_cache", None)
+    monkeypatch.setattr(llm, "_guard", LLMGuard(budget_seconds=1, hedge=False, breaker=CircuitBreaker(1, 60)))
+    errors, opened = metrics.llm_fallbacks.value(reason="error"), metrics.llm_fallbacks.value(reason="circuit_open")
+    calls = metrics.llm_calls.value(kind="single")
+    llm.parse_intent("data analyst")
+    llm.parse_intent("data analyst")
+    assert metrics.llm_fallbacks.value(reason="error") == errors + 1
+    assert metrics.llm_fallbacks.value(reason="circuit_open") == opened + 1
+    assert metrics.llm_calls.value(kind="single") == calls + 1
+
+
+def test_metrics_endpoint_exports_stages_and_gauges(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(orch.llm, "parse_intent", lambda _: FULL_PREF)
+    orch.handle_chat(ChatTurn(session_id="metrics-2", user_utterance="data analyst"))
+    resp = TestClient(app).get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'jobnova_chat_stage_seconds_bucket{stage="query",le="+Inf"}' in body
+    assert "jobnova_candidates_scored_count" in body
+    assert 'jobnova_session_store{stat=' in body
+    assert 'jobnova_catalog{stat="jobs"}' in body
+    assert 'jobnova_llm_flight{stat="async_coalesced"}' in body
+
+
+def test_metrics_endpoint_exports_parse_cache_counters(monkeypatch: pytest.MonkeyPatch):
+    cache = MemoryParseCache()
+    cache.get("missing")
+    monkeypatch.setattr(llm, "parse_cache", cache)
+    body = TestClient(app).get("/metrics").text
+    assert 'jobnova_parse_cache{stat="misses"} 1' in body
+    assert 'jobnova_parse_cache{stat="hits"} 0' in body
+
+
+def test_profile_header_is_ignored_unless_enabled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("PROFILING_ENABLED", raising=False)
+    resp = TestClient(app).get("/health", headers={"X-Profile": "1"})
+    assert "x-profile-id" not in resp.headers
+
+
+def test_profile_header_captures_cprofile_report(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("PROFILING_ENABLED", "1")
+    monkeypatch.setattr(orch.llm, "parse_intent_async", _async_pref)
+    client = TestClient(app)
+    resp = client.post(
+        "/chat", json={"session_id": "metrics-3", "user_utterance": "data analyst"}, headers={"X-Profile": "1"}
+    )
+    assert resp.status_code == 200
+    pid = resp.headers["x-profile-id"]
+    report = client.get(f"/debug/profile/{pid}")
+    assert report.status_code == 200 and "function calls" in report.text
+    assert client.get("/debug/profile/nope").status_code == 404
+
+
+async def _async_pref(_: str) -> JobPreference:
+    return JobPreference(role="Data Analyst")
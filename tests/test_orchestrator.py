@@ -1,12 +1,16 @@
 # tests/test_orchestrator.py
 # Smoke tests for the orchestrator with an LLM stub (no external calls).
 
+import asyncio
 import os
+import threading
+import time
 from typing import Dict, Any
 import pytest
 
 os.environ.setdefault("OPENAI_API_KEY", "sk-test-dummy")  # avoid SDK complaints
 
+from app.memory import SQLiteSessionStore
 from app.schemas import ChatTurn, JobPreference
 from app import orchestrator as orch  # import module to allow monkeypatching symbols
 
@@ -65,3 +69,84 @@ def test_handle_chat_requests_clarification(monkeypatch: pytest.MonkeyPatch):
     assert resp.top_matches == []
     assert resp.asked_clarifications  # should not be empty
     assert "clarify" in resp.assistant_reply.lower()
+
+
+def test_handle_chat_async_with_stubbed_llm(monkeypatch: pytest.MonkeyPatch):
+    async def _stub_async(utterance: str) -> JobPreference:
+        return _stub_parse_intent(utterance)
+
+    monkeypatch.setattr("app.llm.parse_intent_async", _stub_async)
+
+    turn = ChatTurn(session_id="t3", user_utterance="Data Analyst in the Bay Area")
+    resp = asyncio.run(orch.handle_chat_async(turn))
+
+    assert resp.parsed_preferences.role == "Data Analyst"
+    assert resp.asked_clarifications == []
+    assert resp.top_matches and resp.top_matches[0].title.startswith("Data Analyst")
+
+
+def test_stream_chat_emits_stages_in_order(monkeypatch: pytest.MonkeyPatch):
+    async def _stub_async(utterance: str) -> JobPreference:
+        return _stub_parse_intent(utterance)
+
+    monkeypatch.setattr("app.llm.parse_intent_async", _stub_async)
+
+    async def _collect():
+        return [e async for e in orch.stream_chat_async(ChatTurn(session_id="t4", user_utterance="x"))]
+
+    events = asyncio.run(_collect())
+    kinds = [k for k, _ in events]
+    assert kinds[0] == "preferences" and kinds[-1] == "reply"
+    assert set(kinds[1:-1]) == {"match"}
+    # The final event is the same ChatResponse the non-streaming route returns
+    final = events[-1][1]
+    assert [p for k, p in events if k == "match"] == final.top_matches
+    assert final == asyncio.run(orch.handle_chat_async(ChatTurn(session_id="t4b", user_utterance="x")))
+
+
+def test_chat_stream_sends_bytes_before_parse_finishes(monkeypatch: pytest.MonkeyPatch):
+    from app.main import _sse
+
+    async def _slow(utterance: str) -> JobPreference:
+        await asyncio.sleep(0.3)
+        return JobPreference()
+
+    monkeypatch.setattr("app.llm.parse_intent_async", _slow)
+
+    async def _run():
+        gen = _sse(ChatTurn(session_id="t5", user_utterance="hi"))
+        t0 = time.perf_counter()
+        first = await gen.__anext__()
+        ttfb = time.perf_counter() - t0
+        rest = [chunk async for chunk in gen]
+        return first, ttfb, rest
+
+    first, ttfb, rest = asyncio.run(_run())
+    assert first.startswith(":") and ttfb < 0.1
+    assert rest[0].startswith("event: preferences\n")
+    assert any(c.startswith("event: clarification\n") for c in rest)
+    assert rest[-1].startswith("event: reply\ndata: {")
+
+
+def test_async_chat_merges_on_threadpool_for_blocking_stores(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    async def _stub_async(utterance: str) -> JobPreference:
+        return _stub_parse_intent(utterance)
+
+    threads = []
+
+    class _Recording(SQLiteSessionStore):
+        def update_preferences(self, session_id, updates):
+            threads.append(threading.get_ident())
+            return super().update_preferences(session_id, updates)
+
+    monkeypatch.setattr("app.llm.parse_intent_async", _stub_async)
+    monkeypatch.setattr(orch, "_mem", _Recording(str(tmp_path / "s.db")))
+    monkeypatch.setattr(orch, "_blocking_store", True)
+
+    async def _run():
+        resp = await orch.handle_chat_async(ChatTurn(session_id="t6", user_utterance="x"))
+        return resp, threading.get_ident()
+
+    resp, loop_thread = asyncio.run(_run())
+    assert resp.parsed_preferences.role == "Data Analyst" and resp.top_matches
+    assert threads and loop_thread not in threads
@@ -0,0 +1,83 @@
+# tests/test_parse_cache.py
+# Parse cache: LRU/TTL bounds, SQLite persistence, and parse_intent integration.
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import llm
+from app.parse_cache import MemoryParseCache, SQLiteParseCache, make_cache_key
+from app.schemas import JobPreference
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeClient:
+    """Counts completions calls and returns a fixed JSON body."""
+
+    def __init__(self, body: dict):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self._body = json.dumps(body)
+
+    def _create(self, **_):
+        self.calls += 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self._body))])
+
+
+def test_cache_key_normalizes_utterance_and_tracks_prompt_and_model():
+    k = make_cache_key("Remote  Data Analyst ", "tmpl", "m")
+    assert k == make_cache_key("remote data analyst", "tmpl", "m")
+    assert k != make_cache_key("remote data analyst", "tmpl2", "m")
+    assert k != make_cache_key("remote data analyst", "tmpl", "m2")
+
+
+def test_memory_cache_lru_and_ttl():
+    clock = _Clock()
+    cache = MemoryParseCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.set("a", JobPreference(role="A"))
+    cache.set("b", JobPreference(role="B"))
+    assert cache.get("a").role == "A"  # touch "a" so "b" is least recent
+    cache.set("c", JobPreference(role="C"))
+    assert cache.get("b") is None
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+
+def test_sqlite_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "parse.db")
+    SQLiteParseCache(path).set("k", JobPreference(role="Data Analyst", skills=["sql"]))
+    reopened = SQLiteParseCache(path)
+    got = reopened.get("k")
+    assert got == JobPreference(role="Data Analyst", skills=["sql"])
+    assert reopened.stats()["hits"] == 1
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    clock = _Clock()
+    cache = SQLiteParseCache(str(tmp_path / "parse.db"), max_entries=2, clock=clock)
+    for k in "abc":
+        clock.now += 1
+        cache.set(k, JobPreference(role=k))
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 2
+
+
+def test_parse_intent_calls_llm_once_per_normalized_utterance(monkeypatch: pytest.MonkeyPatch):
+    fake = _FakeClient({"role": "Data Analyst", "remote": True, "skills": ["sql"]})
+    monkeypatch.setattr(llm, "client", fake)
+    monkeypatch.setattr(llm, "parse_cache", MemoryParseCache())
+
+    first = llm.parse_intent("remote data analyst roles")
+    second = llm.parse_intent("Remote   data analyst roles")
+
+    assert fake.calls == 1
+    assert first == second and first.role == "Data Analyst"
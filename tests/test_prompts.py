@@ -0,0 +1,81 @@
+# tests/test_prompts.py
+# Prompt template caching/reload, utterance token budget and token accounting.
+
+import os
+from types import SimpleNamespace
+
+from app import llm, prompts
+from app.prompts import INLINE_PARSE_PROMPT, PromptTemplate, TemplateStore, TokenCounter, _approx_encoding
+
+
+def test_template_renders_like_replace():
+    text = 'Parse this.\nUser: "{USER_UTTERANCE}"\nThanks'
+    t = PromptTemplate(text)
+    assert t.render("hi") == text.replace("{USER_UTTERANCE}", "hi")
+    assert t.head == "Parse this.\nThanks"
+    assert PromptTemplate("no placeholder").render("hi") == "no placeholder"
+
+
+def test_store_reads_once_and_reloads_on_change(tmp_path):
+    path = tmp_path / "p.md"
+    path.write_text("v1 {USER_UTTERANCE}", encoding="utf-8")
+    now = [0.0]
+    store = TemplateStore(path, INLINE_PARSE_PROMPT, check_interval=1.0, clock=lambda: now[0])
+    for _ in range(5):
+        assert store.get().text == "v1 {USER_UTTERANCE}"
+    assert store.loads == 1
+
+    path.write_text("v2 {USER_UTTERANCE}", encoding="utf-8")
+    os.utime(path, (1, 1))
+    assert store.get().text.startswith("v1")  # within the check interval
+    now[0] = 2.0
+    assert store.get().text.startswith("v2") and store.loads == 2
+
+
+def test_missing_file_uses_inline_prompt(tmp_path):
+    store = TemplateStore(tmp_path / "missing.md", INLINE_PARSE_PROMPT)
+    assert store.get().text == INLINE_PARSE_PROMPT
+
+
+def test_truncate_keeps_head_and_tail():
+    counter = TokenCounter("gpt-4o-mini", encoding=_approx_encoding())
+    text = "data analyst " + "blah " * 500 + "in austin"
+    cut, n = counter.truncate(text, 30)
+    assert n == 30 and cut.startswith("data analyst") and cut.endswith("in austin")
+    assert counter.truncate("short", 30) == ("short", 2)
+    assert counter.truncated == 1
+
+
+def test_stats_do_not_load_the_encoding(monkeypatch):
+    def load(model):
+        raise AssertionError("encoding loaded")
+
+    monkeypatch.setattr(prompts, "_load_encoding", load)
+    counter = TokenCounter("gpt-4o-mini")
+    assert counter.stats()["encoding"] is None
+    assert TokenCounter("gpt-4o-mini", encoding=_approx_encoding()).stats()["encoding"] == "approx-4-chars"
+
+
+def test_parse_intent_applies_budget_and_counts_tokens(monkeypatch):
+    sent = []
+
+    def create(messages, max_tokens, **_):
+        sent.append((messages[0]["content"], max_tokens))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"role": "Data Analyst"}'))])
+
+    counter = TokenCounter(llm.MODEL, encoding=_approx_encoding())
+    monkeypatch.setattr(llm, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    monkeypatch.setattr(llm, "parse_cache", None)
+    monkeypatch.setattr(llm, "_tokens", counter)
+    monkeypatch.setattr(llm, "MAX_UTTERANCE_TOKENS", 20)
+
+    utterance = "data analyst " + "x" * 4000 + " remote"
+    assert llm.parse_intent(utterance).role == "Data Analyst"
+    prompt, max_tokens = sent[0]
+    assert utterance not in prompt and " … " in prompt and "remote" in prompt
+    assert max_tokens == llm.MAX_COMPLETION_TOKENS
+    stats = llm.token_stats()
+    assert stats["calls"] == 1 and stats["truncated_utterances"] == 1
+    # Template tokens are counted once, separately from the utterance: boundaries may shift a token or two
+    assert abs(stats["prompt_tokens"] - counter.count(prompt)) <= 3
+    assert stats["completion_tokens"] == counter.count('{"role": "Data Analyst"}')
@@ -0,0 +1,106 @@
+# tests/test_render.py
+# Lean serialization must produce exactly what the validated models would.
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app import catalog, job_api
+from app.main import app
+from app.memory import ShardedSessionStore
+from app.render import JobFragments, salary_range
+from app.schemas import JobPreference, MatchItem, trusted
+
+PREFS = [
+    JobPreference(role="Data Analyst"),
+    JobPreference(role="engineer", location="bay area", skills=["python"]),
+    JobPreference(salary_min=35, skills=["sql"], remote=True),
+]
+
+
+def test_trusted_matches_validated_model():
+    values = {"role": "Data Analyst", "skills": ["sql"], **{f: None for f in ("location", "salary_min", "salary_max",
+              "salary_unit", "employment_type", "domain", "seniority", "remote", "notes")}}
+    pref = trusted(JobPreference, dict(values))
+    assert pref == JobPreference(**values)
+    assert pref.model_dump_json() == JobPreference(**values).model_dump_json()
+    assert pref.model_copy(update={"role": "x"}).role == "x"
+    with pytest.raises(KeyError):
+        trusted(JobPreference, {"role": "Data Analyst"})
+
+
+@pytest.mark.parametrize("model, values", [
+    (JobPreference, JobPreference(role="Data Analyst", skills=["sql"], remote=True).model_dump()),
+    (MatchItem, MatchItem(job_id="j1", title="Analyst", company="Acme", location="Austin, TX",
+                          salary_range="$30-40/hr", domain=None, reasons=["role match"], score=1.5).model_dump()),
+])
+def test_trusted_agrees_with_pydantic(model, values):
+    # Fails loudly if a pydantic upgrade changes the instance state trusted() fills in by hand
+    obj = trusted(model, dict(values))
+    constructed = model.model_construct(**values)
+    for slot in BaseModel.__slots__:
+        assert getattr(obj, slot) == getattr(constructed, slot), slot
+    assert model.model_validate(obj.model_dump()) == obj
+    assert model.model_validate_json(obj.model_dump_json()) == obj
+
+
+def test_fragments_build_the_same_match_items():
+    cat = catalog.current()
+    frags = JobFragments(cat.jobs)
+    for row in range(len(cat)):
+        job = cat.jobs[row]
+        reasons = job_api.reasons(PREFS[0], job)
+        expected = MatchItem(
+            job_id=job["job_id"], title=job["title"], company=job["company"], location=job["location"],
+            salary_range=salary_range(job), domain=job.get("domain"), reasons=reasons, score=1.5,
+        )
+        assert frags.item(row, reasons, 1.5) == expected
+        assert frags.item_json(row, reasons, 1.5) == to_json(expected)
+
+
+@pytest.mark.parametrize("pref", PREFS)
+def test_page_json_matches_page_models(pref):
+    cursor = None
+    for _ in range(3):
+        items, nxt = job_api.query_page(pref, limit=2, cursor=cursor)
+        body, nxt_json = job_api.query_page_json(pref, limit=2, cursor=cursor)
+        assert body == to_json(items) and nxt == nxt_json
+        if nxt is None:
+            break
+        cursor = nxt
+
+
+def test_mock_jobs_endpoint_body_and_cursor():
+    pref = PREFS[0]
+    items, nxt = job_api.query_page(pref, limit=2)
+    resp = TestClient(app).post("/mock/jobs?limit=2", json=pref.model_dump())
+    assert resp.status_code == 200 and resp.headers["content-type"] == "application/json"
+    assert resp.json() == [m.model_dump() for m in items]
+    assert resp.headers.get("x-next-cursor") == nxt
+
+
+def test_session_merge_of_a_model_equals_dict_merge():
+    a, b = ShardedSessionStore(), ShardedSessionStore()
+    for pref in PREFS:
+        assert a.update_preferences("s", pref) == b.update_preferences("s", pref.model_dump())
+    assert a.get_preferences("s") == b.get_preferences("s")
+
+
+def test_mock_jobs_endpoint_rejects_cursor_for_another_query():
+    _, nxt = job_api.query_page(PREFS[0], limit=2)
+    assert nxt is not None
+    other = JobPreference(role="Nurse")
+    resp = TestClient(app).post(f"/mock/jobs?limit=2&cursor={nxt}", json=other.model_dump())
+    assert resp.status_code == 400
+
+
+def test_fragments_keep_only_recently_used_rows():
+    cat = catalog.current()
+    frags = JobFragments(cat.jobs, max_rows=3)
+    for row in (0, 1, 2, 0, 3):
+        frags.get(row)
+    assert len(frags) == 3
+    # Row 1 was least recently used; an evicted row is rebuilt identically
+    assert 1 not in frags._data and 0 in frags._data
+    assert frags.item_json(1, [], 1.0) == JobFragments(cat.jobs).item_json(1, [], 1.0)
@@ -0,0 +1,40 @@
+# tests/test_rerank.py
+# Incremental session re-ranking must equal a from-scratch ranking every turn.
+
+from app import catalog, job_api
+from app.rerank import SessionRankCache, SessionRanking
+from app.schemas import JobPreference
+
+TURNS = [
+    JobPreference(role="Data Analyst"),
+    JobPreference(role="Data Analyst", location="bay area"),
+    JobPreference(role="Data Analyst", location="bay area", skills=["sql"]),
+    JobPreference(role="Data Analyst", location="bay area", skills=["sql", "python"]),
+    JobPreference(role="Data Analyst", location="bay area", skills=["sql", "python"], salary_min=100000),
+    JobPreference(role="Data Analyst", location="bay area", skills=["sql", "python"], salary_min=30),
+    JobPreference(role="AI Engineer", location="bay area", skills=["sql", "python"], salary_min=30, remote=True),
+    JobPreference(role="AI Engineer", location="remote", skills=["llm"], salary_min=30, remote=False, domain="saas"),
+]
+
+
+def test_incremental_scores_match_full_scoring_each_turn():
+    cat = catalog.current()
+    state = SessionRanking(cat, TURNS[0])
+    for pref in TURNS[1:]:
+        state.update(cat, pref)
+        assert state.scores().tolist() == cat.columns.score(pref, state.rows).tolist()
+        assert set(cat.index.candidates(pref).tolist()) <= set(state.rows.tolist())
+
+
+def test_session_ranking_equals_query_top_n():
+    for pref in TURNS:
+        got = job_api.query_top_n_for_session("rerank-1", pref, n=10)
+        assert got == job_api.query_top_n(pref, n=10)
+
+
+def test_one_field_change_recomputes_one_field():
+    cache = SessionRankCache()
+    cat = catalog.current()
+    cache.scores("s", cat, TURNS[2])
+    cache.scores("s", cat, TURNS[3])
+    assert cache.stats() == {"sessions": 1, "full": 1, "incremental": 1, "fields_recomputed": 1, "primed": 0}
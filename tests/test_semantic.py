@@ -0,0 +1,93 @@
+# tests/test_semantic.py
+# Similar-title / related-skill index and its use in ranking.
+
+import numpy as np
+import pytest
+
+from app import catalog, job_api
+from app.catalog import Catalog
+from app.rerank import SessionRanking
+from app.schemas import JobPreference
+from app.semantic import SemanticIndex, TermExpander, make_semantic_index_from_env
+
+
+@pytest.fixture(scope="module")
+def cat():
+    c = Catalog.from_jobs(catalog.current().jobs)
+    c.columns.semantic = SemanticIndex.from_columns(c.columns)
+    return c
+
+
+def test_expander_spells_out_abbreviations_and_concepts():
+    e = TermExpander.load()
+    assert e.expand("ML Engineer")[:4] == ["ml", "machine", "learning", "engineer"]
+    assert {"deep", "learning"} <= set(e.expand("pytorch"))
+    assert e.expand("excel") == ["excel"]
+
+
+def test_similar_titles_and_related_skills(cat):
+    ix = cat.columns.semantic
+    codes, weights = ix.similar_titles("ML Engineer")
+    titles = [ix.titles[c] for c in codes]
+    assert ix.titles[int(np.argmax(weights))] == "machine learning engineer"
+    assert "data analyst" not in titles
+    assert ix.title_weight("ML Engineer", "Machine Learning Engineer") > 0.9
+
+    sids, w = ix.related_skills("deep learning")
+    assert "pytorch" in {ix.skills[s] for s in sids}
+    sids, w = ix.related_skills("sql")
+    assert w[[ix.skills[s] for s in sids].index("sql")] == 1.0
+    assert ix.related_skill_matches(["deep learning"], ["PyTorch", "sql"]) == ["pytorch"]
+
+
+def test_semantic_ranking_finds_paraphrases(cat):
+    pref = JobPreference(role="ML Engineer")
+    top = job_api._rank(cat, pref, 3)
+    assert cat.jobs[top[0][1]]["title"] == "Machine Learning Engineer"
+    assert job_api.reasons(pref, cat.jobs[top[0][1]], cat.columns.semantic) == ["Title similar to desired role"]
+    sem, cat.columns.semantic = cat.columns.semantic, None
+    try:
+        assert job_api._rank(cat, pref, 3) == []
+    finally:
+        cat.columns.semantic = sem
+
+
+def test_exact_matches_keep_full_weight(cat):
+    pref = JobPreference(role="Data Analyst", skills=["sql", "python"])
+    rows = np.arange(len(cat))
+    plain = Catalog.from_jobs(catalog.current().jobs).columns
+    exact_role = plain.contribution("role", pref, rows) == 2.0
+    assert (cat.columns.contribution("role", pref, rows)[exact_role] == 2.0).all()
+    assert (cat.columns.contribution("skills", pref, rows) >= plain.contribution("skills", pref, rows)).all()
+
+
+def test_candidates_cover_every_positive_score_and_rerank_agrees(cat):
+    turns = [
+        JobPreference(role="NLP Data Scientist"),
+        JobPreference(role="NLP Data Scientist", skills=["deep learning"]),
+        JobPreference(role="GenAI Engineer", skills=["deep learning", "cloud"], remote=True),
+    ]
+    state = SessionRanking(cat, turns[0])
+    for pref in turns:
+        full = cat.columns.score(pref)
+        assert set(np.flatnonzero(full > 0).tolist()) <= set(cat.index.candidates(pref).tolist())
+        state.update(cat, pref)
+        assert state.scores().tolist() == cat.columns.score(pref, state.rows).tolist()
+
+
+def test_index_is_opt_in(monkeypatch, cat):
+    monkeypatch.delenv("SEMANTIC_MATCH", raising=False)
+    assert make_semantic_index_from_env(cat.columns) is None
+    monkeypatch.setenv("SEMANTIC_MATCH", "1")
+    monkeypatch.setenv("SEMANTIC_DIM", "256")
+    ix = make_semantic_index_from_env(cat.columns)
+    assert ix is not None and ix.title_vectors.shape == (len(ix.titles), 256)
+    assert ix.title_vectors.dtype == np.float32
+
+
+def test_scalar_score_job_stays_exact_match_only(cat):
+    pref = JobPreference(role="ML Engineer", skills=["deep learning", "sql"])
+    batch = cat.columns.score(pref)
+    scalar = np.array([job_api.score_job(pref, job) for job in cat.jobs])
+    # Semantic credit only adds to the exact-match score
+    assert (batch >= scalar - 1e-9).all() and (batch > scalar).any()
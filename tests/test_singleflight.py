@@ -0,0 +1,86 @@
+# tests/test_singleflight.py
+# Coalescing of concurrent identical calls in the sync and async paths.
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app import llm
+from app.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_sync_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "done"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    while flight.stats()["coalesced"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert results == ["done"] * 5
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_sync_error_propagates_and_releases_key():
+    flight = SingleFlight()
+
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", boom)
+    assert flight.do("k", lambda: 1) == 1  # key is released after failure
+
+
+def test_async_callers_share_one_call():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run():
+        return await asyncio.gather(*[flight.do("k", slow) for _ in range(5)])
+
+    assert asyncio.run(run()) == ["done"] * 5
+    assert calls == [1]
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_parse_intent_async_coalesces_identical_utterances(monkeypatch: pytest.MonkeyPatch):
+    calls = []
+
+    async def fake_complete(prompt: str, prompt_tokens: int) -> str:
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return '{"role": "Data Analyst"}'
+
+    monkeypatch.setattr(llm, "async_client", object())
+    monkeypatch.setattr(llm, "parse_cache", None)
+    monkeypatch.setattr(llm, "_async_flight", AsyncSingleFlight())
+    monkeypatch.setattr(llm, "_complete_async", fake_complete)
+
+    async def run():
+        return await asyncio.gather(*[llm.parse_intent_async("remote data analyst") for _ in range(3)])
+
+    prefs = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(p.role == "Data Analyst" for p in prefs)
+    assert llm.flight_stats()["async_coalesced"] == 2
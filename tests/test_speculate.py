@@ -0,0 +1,155 @@
+# tests/test_speculate.py
+# Background ranking of partial preferences while a clarification is pending.
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+
+import pytest
+
+from app import catalog, job_api
+from app import orchestrator as orch
+from app.rerank import SessionRankCache
+from app.schemas import ChatTurn, JobPreference
+from app.speculate import Speculator
+
+PARTIAL = JobPreference(role="Data Analyst", skills=["sql"])
+FULL = JobPreference(
+    role="Data Analyst", location="bay area", salary_min=30, salary_unit="hour",
+    employment_type="intern", domain="startup", skills=["sql"],
+)
+
+
+def _blocking(calls: List[str], release: threading.Event, started: threading.Event):
+    def fn(session_id: str, _: JobPreference) -> bool:
+        started.set()
+        release.wait(5)
+        calls.append(session_id)
+        return True
+    return fn
+
+
+def test_claim_cancels_queued_and_waits_for_running():
+    calls: List[str] = []
+    release, started = threading.Event(), threading.Event()
+    spec = Speculator(_blocking(calls, release, started), workers=1, wait=5)
+    spec.submit("a", PARTIAL)
+    started.wait(5)
+    spec.submit("b", PARTIAL)
+    spec.claim("b")
+    release.set()
+    spec.claim("a")
+    assert calls == ["a"]
+    stats = spec.stats()
+    assert stats["cancelled"] == 1 and stats["done"] == 1 and stats["pending"] == 0
+    spec.shutdown()
+
+
+def test_async_claim_waits_without_blocking_the_loop():
+    calls: List[str] = []
+    release, started = threading.Event(), threading.Event()
+    spec = Speculator(_blocking(calls, release, started), workers=1, wait=0.2)
+    spec.submit("a", PARTIAL)
+    started.wait(5)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        t = asyncio.ensure_future(ticker())
+        t0 = time.perf_counter()
+        await spec.claim_async("a")
+        waited = time.perf_counter() - t0
+        t.cancel()
+        return ticks, waited
+
+    ticks, waited = asyncio.run(run())
+    release.set()
+    assert waited >= 0.15 and ticks >= 5
+    assert spec.stats()["late"] == 1
+    spec.shutdown()
+
+
+def test_claim_tolerates_a_job_cancelled_by_shutdown():
+    spec = Speculator(lambda sid, pref: True, workers=1)
+    for claim in (spec.claim, lambda sid: asyncio.run(spec.claim_async(sid))):
+        fut: Future = Future()
+        Future.cancel(fut)  # shutdown() cancelled it...
+        fut.cancel = lambda: False  # ...after claim() found it running
+        spec._jobs["s"] = fut
+        claim("s")
+    assert spec.stats()["cancelled"] == 2
+
+
+def test_pending_limit_and_expiry():
+    calls: List[str] = []
+    release, started = threading.Event(), threading.Event()
+    now = [0.0]
+    spec = Speculator(_blocking(calls, release, started), workers=1, max_pending=2, max_age=10, clock=lambda: now[0])
+    assert spec.submit("a", PARTIAL)
+    started.wait(5)
+    assert spec.submit("b", PARTIAL)
+    assert not spec.submit("c", PARTIAL)
+    now[0] = 60.0
+    release.set()
+    spec.claim("a")
+    spec.shutdown()
+    assert spec.stats()["dropped"] == 1 and calls == ["a"]
+
+
+def test_prime_respects_max_rows():
+    cache = SessionRankCache()
+    cat = catalog.current()
+    assert not cache.prime("s", cat, PARTIAL, max_rows=0)
+    assert cache.prime("s", cat, PARTIAL, max_rows=len(cat))
+    cache.scores("s", cat, FULL)
+    assert cache.stats()["primed"] == 1 and cache.stats()["incremental"] == 1
+
+
+def test_answer_after_clarification_refines_the_speculative_ranking(monkeypatch: pytest.MonkeyPatch):
+    spec = Speculator(lambda sid, pref: job_api.prime_session_ranking(sid, pref, max_rows=10**6), workers=1)
+    monkeypatch.setattr(orch, "_speculator", spec)
+    monkeypatch.setattr(job_api, "_match_cache", None)
+    monkeypatch.setattr(orch.llm, "parse_intent", lambda _: PARTIAL)
+    before = job_api._session_scores.stats()
+    first = orch.handle_chat(ChatTurn(session_id="spec-1", user_utterance="data analyst with sql"))
+    assert first.asked_clarifications and first.top_matches == []
+
+    monkeypatch.setattr(orch.llm, "parse_intent", lambda _: FULL)
+    second = orch.handle_chat(ChatTurn(session_id="spec-1", user_utterance="bay area intern at a startup"))
+    after = job_api._session_scores.stats()
+    # Either the partial ranking was built and the answer only refined it, or the
+    # job had not started yet and the answer ranked from scratch: one full ranking
+    assert spec.stats()["done"] + spec.stats()["cancelled"] == 1
+    assert after["full"] == before["full"] + 1
+    assert after["incremental"] == before["incremental"] + spec.stats()["done"]
+    assert second.top_matches == job_api.query_top_n(second.parsed_preferences, n=10)
+    spec.shutdown()
+
+
+def test_async_turns_use_the_non_blocking_claim(monkeypatch: pytest.MonkeyPatch):
+    claimed: List[str] = []
+
+    class Spy(Speculator):
+        def claim(self, session_id: str) -> None:
+            raise AssertionError("blocking claim on the event loop")
+
+        async def claim_async(self, session_id: str) -> None:
+            claimed.append(session_id)
+
+    async def parse(_: str) -> JobPreference:
+        return FULL
+
+    spec = Spy(lambda sid, pref: True, workers=1)
+    monkeypatch.setattr(orch, "_speculator", spec)
+    monkeypatch.setattr(orch.llm, "parse_intent_async", parse)
+    resp = asyncio.run(orch.handle_chat_async(ChatTurn(session_id="spec-2", user_utterance="x")))
+    assert resp.top_matches and claimed == ["spec-2"]
+    spec.shutdown()
@@ -0,0 +1,130 @@
+# tests/test_startup.py
+# Cold start: no openai import with app.main, lazy LLM clients, lifespan warm-up and /ready.
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import catalog, fallback_parser, llm, orchestrator, startup
+from app.main import app
+from app.schemas import ChatTurn
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_importing_the_app_does_not_import_openai():
+    code = "import sys, app.main; print('openai' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_llm_client_is_created_on_first_use(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(llm, "client", llm._UNSET)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    assert not llm.llm_configured()
+    assert llm.get_client() is None
+
+    monkeypatch.setattr(llm, "client", llm._UNSET)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-dummy")
+    assert llm.llm_configured() and llm.client is llm._UNSET
+    c = llm.get_client()
+    assert type(c).__name__ == "OpenAI" and llm.get_client() is c
+
+
+@pytest.fixture
+def fresh_warm_up(monkeypatch: pytest.MonkeyPatch) -> startup.WarmUp:
+    w = startup.WarmUp()
+    monkeypatch.setattr(startup, "warm_up", w)
+    return w
+
+
+def test_ready_after_blocking_warm_up(fresh_warm_up, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("CATALOG_BACKGROUND_LOAD", raising=False)
+    with TestClient(app) as c:
+        resp = c.get("/ready")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["warmup"] == "done" and body["catalog"]["jobs"] > 0
+
+
+def test_background_warm_up_serves_health_before_ready(fresh_warm_up, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("CATALOG_BACKGROUND_LOAD", "1")
+    release = threading.Event()
+    real = fallback_parser.get_parser
+    monkeypatch.setattr(fallback_parser, "get_parser", lambda: (release.wait(5), real())[1])
+    with TestClient(app) as c:
+        assert c.get("/health").status_code == 200
+        resp = c.get("/ready")
+        assert resp.status_code == 503 and resp.json()["warmup"] == "running"
+        release.set()
+        deadline = time.time() + 5
+        while c.get("/ready").status_code != 200:
+            assert time.time() < deadline
+            time.sleep(0.01)
+
+
+def test_failed_warm_up_is_not_ready(fresh_warm_up, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(catalog, "_current", None)
+    monkeypatch.setenv("JOB_CATALOG_PATH", os.devnull + "-missing.json")
+    fresh_warm_up.run()
+    status = fresh_warm_up.status()
+    assert fresh_warm_up.state == "failed" and not status["ready"] and status["error"]
+
+
+def test_concurrent_first_access_builds_the_catalog_once(monkeypatch: pytest.MonkeyPatch):
+    real_load, loads = catalog.load_catalog, []
+
+    def slow_load(path):
+        loads.append(path)
+        time.sleep(0.05)
+        return real_load(path)
+
+    monkeypatch.setattr(catalog, "_current", None)
+    monkeypatch.setattr(catalog, "load_catalog", slow_load)
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(catalog.current())) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loads) == 1
+    assert len(got) == 5 and all(c is got[0] for c in got)
+
+
+def test_async_turn_builds_a_cold_catalog_off_the_event_loop(monkeypatch: pytest.MonkeyPatch):
+    real_load = catalog.load_catalog
+
+    def slow_load(path):
+        time.sleep(0.3)
+        return real_load(path)
+
+    monkeypatch.setattr(catalog, "_current", None)
+    monkeypatch.setattr(catalog, "load_catalog", slow_load)
+    monkeypatch.setattr(fallback_parser, "_parser", None)
+    monkeypatch.setattr(llm, "async_client", None)  # fallback parse needs the catalog too
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        resp = await orchestrator.handle_chat_async(ChatTurn(session_id="cold-1", user_utterance="data analyst"))
+        task.cancel()
+        return resp, ticks
+
+    resp, ticks = asyncio.run(run())
+    assert resp.parsed_preferences.role  # a real answer, not the error reply
+    assert ticks >= 10  # the loop kept running during the 0.3 s load
+    assert fallback_parser.ready()